@@ -1,7 +1,12 @@
 import os
 
+from src.log import parse_sample_rates
+from src.rate_limit import parse_limit, parse_route_limits
+
 DB_CONFIG = {
-    "type": "postgres",
+    # async_postgres: asyncpg 기반 비동기 구현, postgres: 동기 구현(스레드풀에서 실행)
+    # memory: 프로세스 메모리 구현 (부하 테스트, 단일 프로세스 실행용. 재시작하면 데이터가 사라진다)
+    "type": os.getenv("DB_TYPE", "async_postgres"),
     "connection_string": (
         f"postgresql://"
         f"{os.getenv('DB_USER')}:"
@@ -9,5 +14,90 @@ DB_CONFIG = {
         f"{os.getenv('DB_HOST')}:"
         f"{os.getenv('DB_PORT')}/"
         f"{os.getenv('DB_NAME')}"
-    )
+    ),
+    # 커넥션 풀. 풀(pool_size + max_overflow)이 모두 사용 중이면 pool_timeout초까지만 기다리고 503을 반환한다
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+    "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "3")),
+    # DB 재시작 등으로 끊긴 연결을 쓰기 전에 확인하고, 오래된 연결은 다시 맺는다
+    "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "1") == "1",
+    "pool_recycle": float(os.getenv("DB_POOL_RECYCLE", "1800")),
+    # 쿼리 최대 실행 시간(초). 0이면 제한하지 않는다
+    "statement_timeout": float(os.getenv("DB_STATEMENT_TIMEOUT", "30")),
+    # 읽기 복제본 접속 문자열 (쉼표로 구분). 지연이 replica_max_lag초를 넘는 복제본은 쓰지 않는다
+    "replica_connection_strings": [url for url in os.getenv("DB_REPLICA_URLS", "").split(",") if url],
+    "replica_max_lag": float(os.getenv("DB_REPLICA_MAX_LAG", "1")),
+    "replica_check_interval": float(os.getenv("DB_REPLICA_CHECK_INTERVAL", "1")),
+    # DB 동시 호출 한도. 지연 시간이 db_limit_latency_target초를 넘으면 줄이고 아래면 늘린다 (0이면 사용하지 않음)
+    # 한도가 차면 쓰기 > 단건 읽기 > 목록 조회 순으로 실행하고, db_limit_queue_timeout초 안에 실행하지 못하면 503
+    "adaptive_limit": os.getenv("DB_ADAPTIVE_LIMIT", "1") == "1",
+    "limit_latency_target": float(os.getenv("DB_LIMIT_LATENCY_TARGET", "0.25")),
+    "limit_min": float(os.getenv("DB_LIMIT_MIN", "2")),
+    "limit_queue_timeout": float(os.getenv("DB_LIMIT_QUEUE_TIMEOUT", "1")),
+    "limit_max_queue": int(os.getenv("DB_LIMIT_MAX_QUEUE", "100")),
+    # API 키 인증 캐시 (TTL을 0으로 두면 비활성화)
+    "auth_cache_size": int(os.getenv("AUTH_CACHE_SIZE", "10000")),
+    "auth_cache_ttl": float(os.getenv("AUTH_CACHE_TTL", "60")),
+    # memory 구현의 WAL/스냅샷 디렉터리 (비워 두면 영속화하지 않는다)
+    "memory_data_dir": os.getenv("MEMORY_DB_DIR", ""),
+    "memory_fsync": os.getenv("MEMORY_DB_FSYNC", "1") == "1",
+    "memory_snapshot_every": int(os.getenv("MEMORY_DB_SNAPSHOT_EVERY", "100000")),
+}
+
+LOGGING_CONFIG = {
+    "level": os.getenv("LOG_LEVEL", "INFO"),
+    # 레벨별 샘플링 비율. 예) "DEBUG=0.01,INFO=0.1" (지정하지 않은 레벨은 모두 기록)
+    "sample_rates": parse_sample_rates(os.getenv("LOG_SAMPLE_RATES", "")),
+    # 백그라운드 writer가 밀리면 이 개수를 넘는 레코드는 버린다
+    "queue_size": int(os.getenv("LOG_QUEUE_SIZE", "10000")),
+}
+
+EMAIL_OUTBOX_CONFIG = {
+    # 동시에 열어 두는 SMTP 연결 수 (= 동시 발송 수)
+    "smtp_pool_size": int(os.getenv("EMAIL_SMTP_POOL_SIZE", "4")),
+    # 초당 최대 발송 수 (0이면 제한 없음)
+    "rate_per_second": float(os.getenv("EMAIL_RATE_PER_SECOND", "5")),
+    "batch_size": int(os.getenv("EMAIL_BATCH_SIZE", "50")),
+    "max_attempts": int(os.getenv("EMAIL_MAX_ATTEMPTS", "8")),
+    # 재시도 간격은 backoff초부터 두 배씩 늘어나 max_backoff초에서 멈춘다
+    "backoff": float(os.getenv("EMAIL_BACKOFF", "30")),
+    "max_backoff": float(os.getenv("EMAIL_MAX_BACKOFF", "3600")),
+    "poll_interval": float(os.getenv("EMAIL_POLL_INTERVAL", "1")),
+    # 발송 워커의 Prometheus 메트릭 포트 (0이면 띄우지 않는다)
+    "metrics_port": int(os.getenv("EMAIL_WORKER_METRICS_PORT", "9101")),
+}
+
+EVENTS_CONFIG = {
+    # GET /events 이벤트를 워커 사이에 전달하는 방법. postgres: LISTEN/NOTIFY, local: 프로세스 안에서만
+    "broker": os.getenv(
+        "EVENT_BROKER", "postgres" if DB_CONFIG["type"] in ("postgres", "async_postgres") else "local"
+    ),
+    "channel": os.getenv("EVENT_CHANNEL", "schedulia_events"),
+    # 연결마다 쌓아 두는 최대 이벤트 수. 넘치면 버리고 resync 이벤트를 보낸다
+    "queue_size": int(os.getenv("EVENT_QUEUE_SIZE", "100")),
+    # 이벤트가 없을 때 keepalive를 보내는 간격(초)
+    "heartbeat": float(os.getenv("EVENT_HEARTBEAT", "15")),
+}
+
+IDEMPOTENCY_CONFIG = {
+    # Idempotency-Key로 저장한 응답을 돌려주는 기간(초)
+    "ttl": float(os.getenv("IDEMPOTENCY_TTL", "86400")),
+    # 처리 중인 요청의 예약 유지 시간(초). 처리하던 워커가 죽어도 이 시간이 지나면 같은 키로 다시 시도할 수 있다
+    "lease": float(os.getenv("IDEMPOTENCY_LEASE", "60")),
+    # 만료된 키를 지우는 간격(초)
+    "purge_interval": float(os.getenv("IDEMPOTENCY_PURGE_INTERVAL", "600")),
+}
+
+RATE_LIMIT_CONFIG = {
+    # 버킷 저장소. local: 워커마다 따로 센다, postgres: 모든 워커가 rate_limit_buckets 테이블을 함께 쓴다
+    "store": os.getenv("RATE_LIMIT_STORE", "local"),
+    # API 키별 제한 "초당 요청 수:버스트". 0이면 제한하지 않는다
+    "default": parse_limit(os.getenv("RATE_LIMIT_DEFAULT", "20:40")),
+    # 라우트별 제한 (라우트마다 따로 센다). 예) "GET /requests/=5:20,POST /requests/bulk=0.5:2"
+    "routes": parse_route_limits(os.getenv(
+        "RATE_LIMIT_ROUTES",
+        "GET /schedules/=5:20,GET /requests/=5:20,POST /requests/=2:10,POST /requests/bulk=0.5:2"
+    )),
+    # local 저장소가 기억하는 최대 버킷 수
+    "max_keys": int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000")),
 }
@@ -1,24 +1,45 @@
+import asyncio
+import contextlib
+import math
 import os
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Cookie, Response
+import logging
+from fastapi import FastAPI, HTTPException, Cookie, Request, Response, Query
 from typing import List, Optional, Annotated
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
+from contextlib import asynccontextmanager
 import jwt
 
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, TypeAdapter
 import uvicorn
 from fastapi import Header, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 
 
 from src.models import User, Time, MeetingSchedule, MeetingRequest, RequestStatus, APIKey
-from src.email_service import email_service
+from src.db.base import DatabaseOverloadedError, ScheduleConflictError
 from src.db.factory import DatabaseFactory
-from config import DB_CONFIG
+from src.db.instrumentation import QueryStatsMiddleware, QUERY_STATS_HEADERS
+from src.db.postgres_db import MEETING_REQUEST_EMAIL
+from src.metrics import PrometheusMiddleware, EMAILS_QUEUED, render_metrics
+from src.db.pagination import schedule_cursor, request_cursor
+from src.availability import AvailabilityIndex, to_naive_utc
+from src.cache import TTLCache
+from src.etag import LISTING_CACHE_HEADERS, etag_matches, listing_etag
+from src.events import REQUEST_CREATED, REQUEST_UPDATED, create_event_hub, request_event
+from src.idempotency import IDEMPOTENT_REPLAYED_HEADER, IdempotencyMiddleware, purge_expired_keys
+from src.rate_limit import create_rate_limiter
+from src.slot_finder import find_common_slots
+from src.log import RequestIdMiddleware, REQUEST_ID_HEADER, configure_logging
+from config import DB_CONFIG, EVENTS_CONFIG, IDEMPOTENCY_CONFIG, LOGGING_CONFIG, RATE_LIMIT_CONFIG
 
 
 # CORS 설정을 환경에 따라 다르게 적용
 ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
+# DEBUG=1이면 요청마다 실행된 SQL 문 수와 DB 시간을 응답 헤더(X-DB-Statements, X-DB-Time-Ms)로 내려준다
+DEBUG = os.getenv("DEBUG", "0") == "1"
 ALLOWED_ORIGINS = {
     "development": [
         "http://localhost:3000",
@@ -34,13 +55,48 @@ ALLOWED_ORIGINS = {
     ]
 }
 
+configure_logging(**LOGGING_CONFIG)
+logger = logging.getLogger("schedulia.api")
+
+db = DatabaseFactory.create_async_database(DB_CONFIG)
+# 받은 요청이 생기거나 요청 상태가 바뀌면 GET /events 구독자에게 알린다
+events = create_event_hub(EVENTS_CONFIG, DB_CONFIG["connection_string"])
+# API 키별 요청 수 제한. get_current_user에서 인증한 뒤 확인한다
+rate_limiter = create_rate_limiter(RATE_LIMIT_CONFIG, DB_CONFIG["connection_string"])
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await db.connect()
+    await events.start()
+    await rate_limiter.start()
+    purger = asyncio.create_task(purge_expired_keys(lambda: db, IDEMPOTENCY_CONFIG["purge_interval"]))
+    yield
+    purger.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await purger
+    await rate_limiter.stop()
+    await events.stop()
+    await db.close()
+
+
 app = FastAPI(
     title="Meeting Scheduler API",
+    lifespan=lifespan,
     root_path="",
     docs_url="/docs",
     redoc_url="/redoc"
 )
 
+# 재시도해도 요청·초대 이메일이 한 번만 만들어지도록 Idempotency-Key를 받는 쓰기 API.
+# CORS보다 안쪽에 두어 저장한 응답을 돌려줄 때도 CORS 헤더가 붙게 한다
+app.add_middleware(
+    IdempotencyMiddleware,
+    get_db=lambda: db,
+    paths=["/users/", "/requests/", "/requests/bulk"],
+    ttl=IDEMPOTENCY_CONFIG["ttl"],
+    lease=IDEMPOTENCY_CONFIG["lease"],
+)
 # CORS 설정
 app.add_middleware(
     CORSMiddleware,
@@ -48,11 +104,34 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", IDEMPOTENT_REPLAYED_HEADER, REQUEST_ID_HEADER, *(QUERY_STATS_HEADERS if DEBUG else [])],
 )
+app.add_middleware(PrometheusMiddleware)
+app.add_middleware(RequestIdMiddleware)
+if DEBUG:
+    app.add_middleware(QueryStatsMiddleware)
+JWT_SECRET = os.getenv('NEXTAUTH_SECRET', '')
 
-db = DatabaseFactory.create_database(DB_CONFIG)
 
-JWT_SECRET = os.getenv('NEXTAUTH_SECRET', '')
+@app.exception_handler(PoolTimeoutError)
+@app.exception_handler(DatabaseOverloadedError)
+async def database_busy(request, exc: Exception):
+    # 커넥션 풀이 pool_timeout 안에 연결을 내주지 못하거나 DB 동시 호출 한도가 차서 대기열에서도 버려지면
+    # 요청을 더 쌓지 않고 바로 거절한다
+    logger.warning("Database is busy", extra={"path": request.url.path, "reason": type(exc).__name__})
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Database is busy, please retry"},
+        headers={"Retry-After": "1"}
+    )
+
+availability = AvailabilityIndex(ttl=float(os.getenv("AVAILABILITY_TTL", "300")))
+# 목록 응답(직렬화된 본문) 캐시. 키에 data_version이 들어 있어 쓰기가 있으면 새 키가 된다 (0이면 사용하지 않음)
+LISTING_CACHE_SIZE = int(os.getenv("LISTING_CACHE_SIZE", "0"))
+listing_cache = (
+    TTLCache(max_size=LISTING_CACHE_SIZE, ttl=float(os.getenv("LISTING_CACHE_TTL", "300")))
+    if LISTING_CACHE_SIZE > 0 else None
+)
 
 
 class CreateUserRequest(BaseModel):
@@ -78,52 +157,63 @@ class CreateMeetingRequest(BaseModel):
     title: str
     description: str | None = None
 
+class BulkMeetingRequestItem(BaseModel):
+    receiver_emails: List[str]
+    available_times: List[Time]
+    title: str
+    description: str | None = None
+
+class BulkCreateMeetingRequest(BaseModel):
+    # 항목마다 같은 초대를 여러 수신자에게 보낸다
+    requests: List[BulkMeetingRequestItem]
+
 class RespondToMeetingRequest(BaseModel):
     accept: bool
     selected_time: Time | None = None
 
+class SlotSearchRequest(BaseModel):
+    participant_emails: List[str]
+    start: datetime
+    end: datetime
+    duration_minutes: int = Field(gt=0)
+    granularity_minutes: int = Field(15, gt=0)
+    top_k: int = Field(5, ge=1, le=50)
+    min_available: int | None = Field(None, ge=1)  # 미지정 시 전원 참석 가능한 시간만
+
+class SlotCandidateResponse(BaseModel):
+    start_time: datetime
+    end_time: datetime
+    available: int
+    unavailable_emails: List[str]
+
+class AvailabilityResponse(BaseModel):
+    email: str
+    start: datetime
+    end: datetime
+    free: List[Time]
+    busy: List[Time]
+
 
 @app.get("/users/find", response_model=UserResponse)
 async def find_user(email: str):
-    print(f"Finding user with email: {email}")
-    user = db.get_user_by_email(email)
-    if not user:
-        print(f"User not found with email: {email}")
+    # 사용자 조회와 활성 키 조회(없으면 발급)를 한 트랜잭션에서 처리한다
+    found = await db.get_or_create_user_api_key(email)
+    if not found:
+        logger.debug("User not found", extra={"email": email})
         raise HTTPException(status_code=404, detail="User not found")
-    
 
-    api_key = db.get_active_api_key(user.id)
-    print(f"Found user: {user}, API key: {api_key}")
-    
-    if not api_key:
-        api_key = db.create_api_key(user.id)
-        print(f"Created new API key: {api_key}")
-    
+    user, api_key = found
     return UserResponse(
         id=user.id,
         name=user.name,
         email=user.email,
-        api_key=api_key.key if api_key else None
+        api_key=api_key.key
     )
 
 @app.post("/users/", response_model=CreateUserResponse)
 async def create_user(request: CreateUserRequest):
-
-    existing_user = db.get_user_by_email(request.email)
-    if existing_user:
-        api_key = db.get_active_api_key(existing_user.id)
-        if not api_key:
-            api_key = db.create_api_key(existing_user.id)
-        return CreateUserResponse(
-            id=existing_user.id,
-            name=existing_user.name,
-            email=existing_user.email,
-            api_key=api_key.key
-        )
-
-    user = db.create_user(name=request.name, email=request.email)
-    api_key = db.create_api_key(user.id)
-    
+    # 이미 가입한 이메일이면 기존 사용자와 활성 키를 돌려준다 (동시에 가입해도 한 명만 생긴다)
+    user, api_key = await db.get_or_create_user_api_key(request.email, name=request.name)
     return CreateUserResponse(
         id=user.id,
         name=user.name,
@@ -131,22 +221,40 @@ async def create_user(request: CreateUserRequest):
         api_key=api_key.key
     )
 
-async def get_current_user(x_api_key: Annotated[str | None, Header()] = None) -> User:
-    print(f"API key in request header: {x_api_key}")
-    
+_route_names: dict = {}
+
+
+def _route_name(request: Request) -> str:
+    """요청이 매칭된 라우트 ("GET /requests/"). 엔드포인트별로 한 번만 찾는다"""
+    endpoint = request.scope["endpoint"]
+    name = _route_names.get((request.method, endpoint))
+    if name is None:
+        path = next(route.path for route in request.app.routes if getattr(route, "endpoint", None) is endpoint)
+        name = _route_names[(request.method, endpoint)] = f"{request.method} {path}"
+    return name
+
+
+async def get_current_user(request: Request, x_api_key: Annotated[str | None, Header()] = None) -> User:
     if not x_api_key:
-        print("API key is not provided - 401 Unauthorized response")
+        logger.debug("API key is not provided")
         raise HTTPException(
             status_code=401,
             detail={"error": "Authentication failed", "reason": "API key is not provided"}
         )
 
-    user = db.get_user_by_api_key(x_api_key)
+    user = await db.get_user_by_api_key(x_api_key)
     if user:
-        print(f"Found user with API key: {user.email}")
+        # 인증된 키만 센다 (잘못된 키로 다른 사용자의 버킷을 비울 수 없다)
+        retry_after = await rate_limiter.check(x_api_key, _route_name(request))
+        if retry_after:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests",
+                headers={"Retry-After": str(math.ceil(retry_after))}
+            )
         return user
     
-    print(f"User not found with API key: {x_api_key} - 401 Unauthorized response")
+    logger.info("Invalid API key", extra={"api_key": x_api_key})
     raise HTTPException(
         status_code=401,
         detail={"error": "Authentication failed", "reason": "Invalid API key"}
@@ -158,19 +266,19 @@ async def get_current_user(x_api_key: Annotated[str | None, Header()] = None) ->
 @app.post("/users/{user_id}/api-keys", response_model=APIKey)
 async def create_api_key(user_id: int):
     try:
-        return db.create_api_key(user_id)
+        return await db.create_api_key(user_id)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 @app.delete("/api-keys/{api_key}")
 async def deactivate_api_key(api_key: str):
-    if not db.deactivate_api_key(api_key):
+    if not await db.deactivate_api_key(api_key):
         raise HTTPException(status_code=404, detail="API key not found")
     return {"message": "API key deactivated"}
 
 @app.get("/users/me", response_model=UserResponse)
 async def get_current_user_info(current_user: User = Depends(get_current_user)):
-    api_key = db.get_active_api_key(current_user.id)
+    api_key = await db.get_active_api_key(current_user.id)
     
     return UserResponse(
         id=current_user.id,
@@ -179,37 +287,187 @@ async def get_current_user_info(current_user: User = Depends(get_current_user)):
         api_key=api_key.key if api_key else None
     )
 
+MAX_PAGE_SIZE = 500
+
+
+# 목록은 DB 계층이 만든 모델을 response_model로 다시 검증하지 않고 pydantic-core 직렬화기로 바로 JSON을 만든다
+SCHEDULE_LIST = TypeAdapter(List[MeetingSchedule])
+REQUEST_LIST = TypeAdapter(List[MeetingRequest])
+
+
+def _page(items: list, limit: int | None, cursor_of) -> tuple:
+    """limit + 1개를 조회한 결과를 (이번 페이지, 다음 페이지 커서)로 나눈다"""
+    if limit is not None and len(items) > limit:
+        items = items[:limit]
+        return items, cursor_of(items[-1])
+    return items, None
+
+
+async def _conditional_listing(request: Request, user: User, adapter: TypeAdapter, load) -> Response:
+    """data_version으로 만든 ETag가 If-None-Match와 같으면 목록을 조회하지 않고 304를 반환한다.
+
+    load()는 (항목, 다음 페이지 커서)를 반환한다. 버전을 목록보다 먼저 읽으므로 그 사이에 쓰기가
+    있어도 이전 목록이 새 ETag로 나가지 않는다 (다음 요청에서 다시 받는다).
+    """
+    version = await db.get_data_version(user.id)
+    etag = listing_etag(user.id, version, request.url.path, request.query_params.multi_items())
+    headers = {"ETag": etag, **LISTING_CACHE_HEADERS}
+    if etag_matches(request.headers.get("If-None-Match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    cached = listing_cache.get((user.id, etag)) if listing_cache is not None else None
+    if cached is None:
+        items, next_cursor = await load()
+        cached = (adapter.dump_json(items), next_cursor)
+        if listing_cache is not None:
+            listing_cache.set((user.id, etag), cached)
+
+    body, next_cursor = cached
+    if next_cursor is not None:
+        headers["X-Next-Cursor"] = next_cursor
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @app.get("/schedules/", response_model=List[MeetingSchedule])
 async def view_meeting_schedules(
+    request: Request,
     date: date | None = None,
+    from_: datetime | None = Query(None, alias="from"),
+    to: datetime | None = None,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
     current_user: User = Depends(get_current_user)
 ):
-    schedules = db.get_user_schedules(current_user.id)
+    # date의 경계(타임존 없는 UTC)와 비교할 수 있도록 from/to를 DB와 같은 기준으로 맞춘다
+    start = to_naive_utc(from_) if from_ else None
+    end = to_naive_utc(to) if to else None
     if date:
-        schedules = [
-            schedule for schedule in schedules
-            if schedule.time.start_time.date() == date
-        ]
-    return schedules
+        # 해당 날짜에 시작하는 스케줄 (from/to가 함께 주어지면 범위를 더 좁힌다)
+        day_start = datetime.combine(date, datetime.min.time())
+        day_end = day_start + timedelta(days=1)
+        start = max(start, day_start) if start else day_start
+        end = min(end, day_end) if end else day_end
+
+    async def load():
+        try:
+            schedules = await db.get_user_schedules(
+                current_user.id,
+                start=start,
+                end=end,
+                limit=limit + 1 if limit is not None else None,
+                cursor=cursor
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return _page(schedules, limit, schedule_cursor)
+
+    return await _conditional_listing(request, current_user, SCHEDULE_LIST, load)
 
 @app.get("/requests/", response_model=List[MeetingRequest])
-async def view_meeting_requests(current_user: User = Depends(get_current_user)):
+async def view_meeting_requests(
+    request: Request,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    current_user: User = Depends(get_current_user)
+):
+    async def load():
+        requests = await db.get_user_received_requests(
+            current_user.email,
+            limit=limit + 1 if limit is not None else None,
+            cursor=cursor
+        )
+        return _page(requests, limit, request_cursor)
+
     try:
-        print(f"Viewing meeting requests for user: {current_user.email}")
-        requests = db.get_user_received_requests(current_user.email)
-        print(f"Found {len(requests)} meeting requests")
-        return requests
+        return await _conditional_listing(request, current_user, REQUEST_LIST, load)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except (PoolTimeoutError, DatabaseOverloadedError, HTTPException):
+        raise
     except Exception as e:
-        print(f"Error occurred while viewing meeting requests: {e}")
+        logger.exception("Error occurred while viewing meeting requests", extra={"user_id": current_user.id})
         raise HTTPException(
             status_code=500,
             detail={"error": "Server error", "reason": str(e)}
         )
 
+MAX_AVAILABILITY_WINDOW = timedelta(days=366)
+
+
+@app.get("/availability", response_model=AvailabilityResponse)
+async def view_availability(
+    start: datetime,
+    end: datetime,
+    min_duration: int = Query(0, ge=0, description="최소 빈 시간(분)"),
+    email: str | None = None,
+    current_user: User = Depends(get_current_user)
+):
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+    if end - start > MAX_AVAILABILITY_WINDOW:
+        raise HTTPException(status_code=400, detail="The requested window is too large")
+
+    user = current_user
+    if email and email != current_user.email:
+        user = await db.get_user_by_email(email)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+
+    free, busy = await availability.free_slots(
+        db, user.id, start, end, timedelta(minutes=min_duration)
+    )
+    return AvailabilityResponse(email=user.email, start=start, end=end, free=free, busy=busy)
+
+MAX_SLOT_SEARCH_PARTICIPANTS = 200
+MAX_SLOT_SEARCH_SLOTS = 20000
+
+
+@app.post("/slots/search", response_model=List[SlotCandidateResponse])
+async def search_common_slots(
+    request: SlotSearchRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """참가자 전원(요청자 포함)이 비어 있는 시간을 찾는다"""
+    start, end = to_naive_utc(request.start), to_naive_utc(request.end)
+    granularity = timedelta(minutes=request.granularity_minutes)
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+    if (end - start) // granularity > MAX_SLOT_SEARCH_SLOTS:
+        raise HTTPException(status_code=400, detail="The requested window is too large for this granularity")
+
+    emails = list(dict.fromkeys([current_user.email, *request.participant_emails]))
+    if len(emails) > MAX_SLOT_SEARCH_PARTICIPANTS:
+        raise HTTPException(status_code=400, detail="Too many participants")
+
+    users = {user.email: user for user in await db.get_users_by_emails(emails)}
+    missing = [email for email in emails if email not in users]
+    if missing:
+        raise HTTPException(status_code=404, detail={"error": "User not found", "emails": missing})
+
+    user_ids = [users[email].id for email in emails]
+    intervals = await availability.get_many(db, user_ids, start, end)
+    slots = find_common_slots(
+        [intervals[user_id].overlapping(start, end) for user_id in user_ids],
+        start,
+        end,
+        timedelta(minutes=request.duration_minutes),
+        granularity,
+        request.top_k,
+        request.min_available
+    )
+    return [
+        SlotCandidateResponse(
+            start_time=slot.start_time,
+            end_time=slot.end_time,
+            available=slot.available,
+            unavailable_emails=[emails[i] for i in slot.unavailable]
+        )
+        for slot in slots
+    ]
+
 @app.post("/requests/", response_model=MeetingRequest)
 async def send_meeting_request(
     request: CreateMeetingRequest,
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user)
 ):
     meeting_request = MeetingRequest(
@@ -221,11 +479,40 @@ async def send_meeting_request(
         description=request.description
     )
 
-    created_request = db.create_request(meeting_request)
-    
-    await email_service.send_meeting_request_email(created_request, background_tasks)
-    
-    return created_request
+    # 초대 이메일은 같은 트랜잭션에서 email_outbox에 기록되고 src/email_worker.py가 발송한다
+    created = await db.create_request(meeting_request)
+    EMAILS_QUEUED.labels(MEETING_REQUEST_EMAIL).inc()
+    await events.publish([([created.receiver_email], request_event(REQUEST_CREATED, created))])
+    return created
+
+MAX_BULK_REQUESTS = 500
+
+
+@app.post("/requests/bulk", response_model=List[MeetingRequest])
+async def send_meeting_requests(
+    request: BulkCreateMeetingRequest,
+    current_user: User = Depends(get_current_user)
+):
+    meeting_requests = [
+        MeetingRequest(
+            request_id=0,  # will be set by database
+            sender=current_user,
+            receiver_email=receiver_email,
+            available_times=item.available_times,
+            title=item.title,
+            description=item.description
+        )
+        for item in request.requests
+        for receiver_email in item.receiver_emails
+    ]
+    if len(meeting_requests) > MAX_BULK_REQUESTS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_REQUESTS} requests can be sent at once")
+
+    # 요청과 초대 이메일(email_outbox)을 한 트랜잭션에서 다건 insert 한다
+    created = await db.create_requests(meeting_requests)
+    EMAILS_QUEUED.labels(MEETING_REQUEST_EMAIL).inc(len(created))
+    await events.publish([([r.receiver_email], request_event(REQUEST_CREATED, r)) for r in created])
+    return created
 
 @app.post("/requests/{request_id}/respond", response_model=MeetingRequest)
 async def respond_to_meeting_request(
@@ -233,7 +520,7 @@ async def respond_to_meeting_request(
     response: RespondToMeetingRequest,
     current_user: User = Depends(get_current_user)
 ):
-    meeting_request: MeetingRequest = db.get_request(request_id)
+    meeting_request: MeetingRequest = await db.get_request(request_id)
     if not meeting_request:
         raise HTTPException(status_code=404, detail="Request not found")
     
@@ -256,34 +543,61 @@ async def respond_to_meeting_request(
                 detail="The selected time is not valid. The detailed adjustment feature is not implemented yet."
             )
         
-        meeting_request.status = RequestStatus.ACCEPTED
-        meeting_request.selected_time = response.selected_time
-
         schedule = MeetingSchedule(
             id=0,  # will be set by database
             host=meeting_request.sender,
             participants=[meeting_request.sender, current_user],
-            time=meeting_request.selected_time,
+            time=response.selected_time,
             title=meeting_request.title,
             description=meeting_request.description
         )
-        db.create_schedule(schedule)
+        try:
+            created_schedule = await db.create_schedule(schedule)
+        except ScheduleConflictError:
+            raise HTTPException(status_code=409, detail="A participant already has a schedule at the selected time")
+        availability.add_schedule(created_schedule)
+
+        updated = await db.update_request_status(request_id, RequestStatus.ACCEPTED, response.selected_time)
     else:
-        meeting_request.status = RequestStatus.DECLINED
-    
-    return meeting_request
+        updated = await db.update_request_status(request_id, RequestStatus.DECLINED)
+
+    # 보낸 사람에게는 응답을, 받은 사람의 다른 연결에는 목록 변경을 알린다
+    await events.publish([
+        ([meeting_request.sender.email, current_user.email], request_event(REQUEST_UPDATED, updated))
+    ])
+    return updated
 
 @app.post("/meetings/{meeting_id}/confirm", response_model = MeetingSchedule)
 async def confirm_meeting(meeting_id: int, current_user: User = Depends(get_current_user)):
 
     # 현재 사용자가 호스트인지 확인
     # 참석자들이 전부 응답했는지 확인
-    
+    raise HTTPException(status_code=501, detail="Meeting confirmation is not implemented yet")
+
+
+@app.get("/events")
+async def stream_events(current_user: User = Depends(get_current_user)):
+    """받은 요청이 생기거나 보낸·받은 요청의 상태가 바뀌면 Server-Sent Events로 알린다.
+
+    연결 직후 ready 이벤트를 보내므로 클라이언트는 그때 목록을 한 번 다시 조회하고, 이후에는 이벤트를 받을 때만 조회한다.
+    """
+    return StreamingResponse(
+        events.stream(current_user.email),
+        media_type="text/event-stream",
+        # 프록시(nginx)가 버퍼링하면 이벤트가 바로 전달되지 않는다
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
 
 
 @app.get("/health-check")
 async def health_check():
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+    return {"status": "healthy", "timestamp": datetime.now().isoformat(), "db_pool": db.pool_status()}
 
 
 if __name__ == "__main__":
@@ -0,0 +1,64 @@
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+from sqlalchemy.engine import make_url
+
+from config import DB_CONFIG
+from src.db.db_model import Base
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+# 마이그레이션에서만 관리하는 Postgres 전용 객체 (0003_time_ranges, 0007_rate_limit_buckets).
+# autogenerate 비교에서 제외한다.
+DATABASE_ONLY_OBJECTS = {"period", "ix_times_period", "rate_limit_buckets"}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    return not (reflected and compare_to is None and name in DATABASE_ONLY_OBJECTS)
+
+
+def get_url() -> str:
+    # alembic -x url=... 로 덮어쓸 수 있다. 마이그레이션은 항상 동기 드라이버로 실행한다.
+    url = make_url(context.get_x_argument(as_dictionary=True).get("url", DB_CONFIG["connection_string"]))
+    if url.drivername == "postgresql+asyncpg":
+        url = url.set(drivername="postgresql")
+    return url.render_as_string(hide_password=False)
+
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=get_url(),
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connectable = create_engine(get_url(), poolclass=pool.NullPool)
+
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
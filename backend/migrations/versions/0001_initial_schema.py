@@ -0,0 +1,96 @@
+"""initial schema
+
+Revision ID: 0001
+Revises: 
+Create Date: 2025-05-01 00:00:00
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 마이그레이션 도입 전에는 앱 시작 시 create_all로 테이블을 만들었다.
+    # 이미 그렇게 만들어진 DB라면 현재 스키마를 그대로 기준점으로 삼는다.
+    if not context.is_offline_mode() and sa.inspect(op.get_bind()).has_table('users'):
+        return
+
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('email'),
+    )
+    op.create_table(
+        'api_keys',
+        sa.Column('key', sa.String(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('key'),
+    )
+    op.create_table(
+        'meeting_requests',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('sender_id', sa.Integer(), nullable=True),
+        sa.Column('receiver_email', sa.String(), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('selected_time_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['sender_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_table(
+        'times',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('start_time', sa.DateTime(), nullable=False),
+        sa.Column('end_time', sa.DateTime(), nullable=False),
+        sa.Column('meeting_request_id', sa.Integer(), nullable=True),
+        sa.Column('is_selected', sa.Boolean(), nullable=True),
+        sa.ForeignKeyConstraint(['meeting_request_id'], ['meeting_requests.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    # meeting_requests <-> times 는 서로를 참조하므로 FK를 나중에 추가한다
+    with op.batch_alter_table('meeting_requests') as batch_op:
+        batch_op.create_foreign_key(
+            'meeting_requests_selected_time_id_fkey', 'times', ['selected_time_id'], ['id']
+        )
+    op.create_table(
+        'meeting_schedules',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('host_id', sa.Integer(), nullable=True),
+        sa.Column('time_id', sa.Integer(), nullable=True),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(['host_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['time_id'], ['times.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_table(
+        'meeting_participants',
+        sa.Column('meeting_id', sa.Integer(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['meeting_id'], ['meeting_schedules.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('meeting_participants')
+    op.drop_table('meeting_schedules')
+    with op.batch_alter_table('meeting_requests') as batch_op:
+        batch_op.drop_constraint('meeting_requests_selected_time_id_fkey', type_='foreignkey')
+    op.drop_table('times')
+    op.drop_table('meeting_requests')
+    op.drop_table('api_keys')
+    op.drop_table('users')
@@ -0,0 +1,42 @@
+"""add indexes for hot lookup columns
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-05-01 00:00:01
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_api_keys_user_id_is_active', 'api_keys', ['user_id', 'is_active'])
+    op.create_index('ix_meeting_participants_user_id_meeting_id', 'meeting_participants', ['user_id', 'meeting_id'])
+    op.create_index('ix_meeting_participants_meeting_id', 'meeting_participants', ['meeting_id'])
+    op.create_index('ix_meeting_schedules_host_id', 'meeting_schedules', ['host_id'])
+    op.create_index('ix_meeting_schedules_time_id', 'meeting_schedules', ['time_id'])
+    op.create_index('ix_meeting_requests_receiver_email_id', 'meeting_requests', ['receiver_email', 'id'])
+    op.create_index('ix_meeting_requests_sender_id', 'meeting_requests', ['sender_id'])
+    op.create_index('ix_times_start_time', 'times', ['start_time'])
+    op.create_index(
+        'ix_times_meeting_request_id', 'times', ['meeting_request_id'],
+        postgresql_where=sa.text('meeting_request_id IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_times_meeting_request_id', table_name='times')
+    op.drop_index('ix_times_start_time', table_name='times')
+    op.drop_index('ix_meeting_requests_sender_id', table_name='meeting_requests')
+    op.drop_index('ix_meeting_requests_receiver_email_id', table_name='meeting_requests')
+    op.drop_index('ix_meeting_schedules_time_id', table_name='meeting_schedules')
+    op.drop_index('ix_meeting_schedules_host_id', table_name='meeting_schedules')
+    op.drop_index('ix_meeting_participants_meeting_id', table_name='meeting_participants')
+    op.drop_index('ix_meeting_participants_user_id_meeting_id', table_name='meeting_participants')
+    op.drop_index('ix_api_keys_user_id_is_active', table_name='api_keys')
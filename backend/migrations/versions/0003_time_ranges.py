@@ -0,0 +1,92 @@
+"""store time slots as ranges and reject double-booking
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-05-08 00:00:00
+
+times.period 는 start_time/end_time 으로부터 계산되는 tsrange 컬럼이고,
+meeting_participants.period 는 트리거가 채우는 스케줄 시간의 사본이다.
+(user_id, period) 배타 제약으로 같은 사용자의 겹치는 스케줄을 커밋 시점에 거부한다.
+컬럼이 타임존 없는 DateTime이므로 tstzrange가 아니라 tsrange를 사용한다.
+Postgres 전용 객체라 모델에는 선언하지 않는다 (migrations/env.py 의 DATABASE_ONLY_OBJECTS).
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+
+    op.execute("""
+        ALTER TABLE times
+        ADD COLUMN period tsrange
+        GENERATED ALWAYS AS (tsrange(start_time, end_time, '[)')) STORED
+    """)
+    op.execute('CREATE INDEX ix_times_period ON times USING gist (period)')
+
+    op.execute('ALTER TABLE meeting_participants ADD COLUMN period tsrange')
+    op.execute("""
+        CREATE FUNCTION meeting_participants_set_period() RETURNS trigger AS $$
+        BEGIN
+            SELECT t.period INTO NEW.period
+            FROM meeting_schedules s JOIN times t ON t.id = s.time_id
+            WHERE s.id = NEW.meeting_id;
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER meeting_participants_set_period
+        BEFORE INSERT OR UPDATE OF meeting_id ON meeting_participants
+        FOR EACH ROW EXECUTE FUNCTION meeting_participants_set_period()
+    """)
+    op.execute("""
+        ALTER TABLE meeting_participants
+        ADD CONSTRAINT meeting_participants_no_double_booking
+        EXCLUDE USING gist (user_id WITH =, period WITH &&)
+    """)
+
+    # 기존 행 채우기. 이미 겹쳐 있던 과거 스케줄은 period를 NULL로 남겨 제약 대상에서 제외한다.
+    op.execute("""
+        DO $$
+        DECLARE
+            r record;
+        BEGIN
+            FOR r IN
+                SELECT mp.ctid AS row_id, t.period
+                FROM meeting_participants mp
+                JOIN meeting_schedules s ON s.id = mp.meeting_id
+                JOIN times t ON t.id = s.time_id
+                ORDER BY mp.meeting_id
+            LOOP
+                BEGIN
+                    UPDATE meeting_participants SET period = r.period WHERE ctid = r.row_id;
+                EXCEPTION WHEN exclusion_violation THEN
+                    NULL;
+                END;
+            END LOOP;
+        END
+        $$
+    """)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('ALTER TABLE meeting_participants DROP CONSTRAINT meeting_participants_no_double_booking')
+    op.execute('DROP TRIGGER meeting_participants_set_period ON meeting_participants')
+    op.execute('DROP FUNCTION meeting_participants_set_period()')
+    op.execute('ALTER TABLE meeting_participants DROP COLUMN period')
+    op.execute('DROP INDEX ix_times_period')
+    op.execute('ALTER TABLE times DROP COLUMN period')
@@ -0,0 +1,29 @@
+"""add users.data_version for conditional listing requests
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2025-05-20 00:00:00
+
+스케줄·요청 목록이 바뀌는 쓰기와 같은 트랜잭션에서 올라가는 사용자별 버전.
+GET /schedules/, /requests/ 의 ETag가 이 값으로 만들어진다.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'users',
+        sa.Column('data_version', sa.BigInteger(), nullable=False, server_default=sa.text('0')),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'data_version')
@@ -0,0 +1,39 @@
+"""add rate_limit_buckets shared by API workers
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2025-06-05 00:00:00
+
+RATE_LIMIT_STORE=postgres 일 때 모든 API 워커가 함께 쓰는 API 키별 토큰 버킷 (src/rate_limit.py).
+요청마다 갱신되고 잃어도 되는 값이므로 WAL을 남기지 않는 UNLOGGED 테이블로 만든다 (복제본에는 복제되지 않는다).
+Postgres 전용 객체라 모델에는 선언하지 않는다 (migrations/env.py 의 DATABASE_ONLY_OBJECTS).
+
+"""
+from alembic import op
+
+
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("""
+        CREATE UNLOGGED TABLE rate_limit_buckets (
+            key text PRIMARY KEY,
+            tokens double precision NOT NULL,
+            allowed boolean NOT NULL,
+            updated_at timestamptz NOT NULL
+        )
+    """)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('DROP TABLE rate_limit_buckets')
@@ -0,0 +1,151 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Tuple
+
+from src.cache import TTLCache
+from src.models import MeetingSchedule, Time
+
+
+def to_naive_utc(value: datetime) -> datetime:
+    """DB에는 타임존 없는 UTC 시각이 저장되므로 비교 전에 맞춰준다"""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class BusyIntervals:
+    """한 사용자의 바쁜 구간을 병합된(서로 겹치지 않는) 상태로 시작 시간 순 정렬해 보관한다.
+
+    병합되어 있으므로 starts와 ends가 모두 정렬되어 있고,
+    구간 조회는 이분 탐색 + 겹치는 구간 수(k)만큼의 순회로 끝난다.
+    """
+
+    __slots__ = ("starts", "ends")
+
+    def __init__(self, intervals: Iterable[Tuple[datetime, datetime]] = ()):
+        self.starts: List[datetime] = []
+        self.ends: List[datetime] = []
+        for start, end in sorted(intervals):
+            self._append_sorted(start, end)
+
+    def _append_sorted(self, start: datetime, end: datetime) -> None:
+        if self.ends and start <= self.ends[-1]:
+            self.ends[-1] = max(self.ends[-1], end)
+        else:
+            self.starts.append(start)
+            self.ends.append(end)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def add(self, start: datetime, end: datetime) -> None:
+        """구간을 추가하면서 맞닿거나 겹치는 이웃 구간과 병합한다"""
+        if end <= start:
+            return
+        # start 이상에서 끝나는 첫 구간부터 end 이하에서 시작하는 마지막 구간까지가 병합 대상
+        lo = bisect_left(self.ends, start)
+        hi = bisect_right(self.starts, end)
+        if lo < hi:
+            start = min(start, self.starts[lo])
+            end = max(end, self.ends[hi - 1])
+        self.starts[lo:hi] = [start]
+        self.ends[lo:hi] = [end]
+
+    def overlapping(self, start: datetime, end: datetime) -> List[Tuple[datetime, datetime]]:
+        """[start, end)와 겹치는 구간을 창 경계로 잘라서 반환한다"""
+        result = []
+        i = bisect_right(self.ends, start)
+        while i < len(self.starts) and self.starts[i] < end:
+            result.append((max(self.starts[i], start), min(self.ends[i], end)))
+            i += 1
+        return result
+
+    def free_slots(self, start: datetime, end: datetime, min_duration: timedelta = timedelta(0)) -> List[Tuple[datetime, datetime]]:
+        """[start, end) 안에서 바쁜 구간 사이의 빈 시간 중 min_duration 이상인 것을 반환한다"""
+        result = []
+        cursor = start
+        for busy_start, busy_end in self.overlapping(start, end):
+            if busy_start - cursor >= min_duration and busy_start > cursor:
+                result.append((cursor, busy_start))
+            cursor = max(cursor, busy_end)
+        if end - cursor >= min_duration and end > cursor:
+            result.append((cursor, end))
+        return result
+
+
+class AvailabilityIndex:
+    """사용자별로 읽어 둔 창과 그 안의 BusyIntervals를 캐시하고 스케줄 생성 시 점진적으로 갱신한다.
+
+    캐시한 창 안을 조회할 때는 DB를 읽지 않고, 창을 벗어나면 요청한 창과 겹치는 스케줄만 다시 읽는다.
+    이후에는 create_schedule 결과를 반영하기만 한다. 다른 워커에서 생긴 스케줄은 ttl이 지나 다시 읽을 때 반영된다.
+    """
+
+    def __init__(self, max_users: int = 10000, ttl: float = 300.0):
+        # user_id -> (창 시작, 창 끝, 창과 겹치는 바쁜 구간)
+        self._cache = TTLCache(max_size=max_users, ttl=ttl)
+        # 로딩 중에 추가된 스케줄은 로딩이 끝난 뒤 반영한다
+        self._pending: Dict[int, List[Tuple[datetime, datetime]]] = {}
+
+    async def get(self, db, user_id: int, start: datetime, end: datetime) -> BusyIntervals:
+        return (await self.get_many(db, [user_id], start, end))[user_id]
+
+    async def get_many(self, db, user_ids: List[int], start: datetime, end: datetime) -> Dict[int, BusyIntervals]:
+        """[start, end)를 덮는 캐시가 없는 사용자들은 한 번의 DB 조회로 그 창만 함께 읽는다"""
+        start, end = to_naive_utc(start), to_naive_utc(end)
+        result: Dict[int, BusyIntervals] = {}
+        missing = []
+        for user_id in dict.fromkeys(user_ids):
+            cached = self._cache.get(user_id)
+            if cached is not None and cached[0] <= start and end <= cached[1]:
+                result[user_id] = cached[2]
+            else:
+                missing.append(user_id)
+        if not missing:
+            return result
+
+        pending = {user_id: self._pending.setdefault(user_id, []) for user_id in missing}
+        try:
+            busy_times = await db.get_busy_times(missing, start, end)
+        finally:
+            for user_id in missing:
+                self._pending.pop(user_id, None)
+
+        for user_id in missing:
+            intervals = BusyIntervals(
+                (to_naive_utc(t.start_time), to_naive_utc(t.end_time))
+                for t in busy_times.get(user_id, [])
+            )
+            for pending_start, pending_end in pending[user_id]:
+                intervals.add(pending_start, pending_end)
+            self._cache.set(user_id, (start, end, intervals))
+            result[user_id] = intervals
+        return result
+
+    def add_schedule(self, schedule: MeetingSchedule) -> None:
+        start = to_naive_utc(schedule.time.start_time)
+        end = to_naive_utc(schedule.time.end_time)
+        user_ids = {schedule.host.id} | {p.id for p in schedule.participants}
+        for user_id in user_ids:
+            if user_id in self._pending:
+                self._pending[user_id].append((start, end))
+            cached = self._cache.get(user_id)
+            if cached is not None:
+                cached[2].add(start, end)
+
+    async def free_slots(
+        self,
+        db,
+        user_id: int,
+        start: datetime,
+        end: datetime,
+        min_duration: timedelta = timedelta(0)
+    ) -> Tuple[List[Time], List[Time]]:
+        """(빈 시간, 바쁜 시간) 목록을 반환한다"""
+        start, end = to_naive_utc(start), to_naive_utc(end)
+        intervals = await self.get(db, user_id, start, end)
+        free = intervals.free_slots(start, end, min_duration)
+        busy = intervals.overlapping(start, end)
+        return (
+            [Time(start_time=s, end_time=e) for s, e in free],
+            [Time(start_time=s, end_time=e) for s, e in busy],
+        )
@@ -0,0 +1,372 @@
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from src.db.base import AsyncDatabaseInterface, ScheduleConflictError
+from src.db.db_model import (
+    UserModel, APIKeyModel, TimeModel,
+    MeetingScheduleModel, MeetingRequestModel, EmailOutboxModel
+)
+from src.db.instrumentation import describe_pool, instrument_engine
+from src.db.postgres_db import (
+    ModelConverterMixin, engine_options, generate_api_key, is_schedule_conflict, user_schedules_query,
+    busy_times_query, group_busy_times, received_requests_query,
+    insert_requests_statement, request_rows, available_time_rows, created_requests,
+    outbox_rows, claim_outbox_statement, claimed_outbox_messages, outbox_sent_statement, outbox_failed_statement,
+    count_outbox_statement, bump_data_versions_statement, api_key_audience, data_version_query,
+    user_with_active_key_query, active_key_query, lock_user_statement, insert_user_statement, issue_api_key_statement,
+    reserve_idempotency_key_statement, idempotency_record_query, idempotency_record,
+    complete_idempotency_key_statement, release_idempotency_key_statement, purge_idempotency_keys_statement,
+    REPLICATION_LAG_QUERY,
+    USER_LOAD_OPTIONS, SCHEDULE_LOAD_OPTIONS, REQUEST_LOAD_OPTIONS
+)
+from src.models import (
+    User, APIKey, Time, MeetingSchedule, MeetingRequest, OutboxMessage, OutboxStatus, IdempotencyRecord
+)
+
+
+class AsyncPostgresDatabase(ModelConverterMixin, AsyncDatabaseInterface):
+    """AsyncSession 기반 구현. 쿼리 대기 중에도 이벤트 루프가 다른 요청을 처리한다.
+
+    비동기 세션에서는 lazy load가 불가능하므로 변환에 필요한 관계는 모두 eager load 한다.
+    """
+
+    def __init__(self, connection_string: str, **options):
+        """options는 engine_options()의 인자 (pool_size, pool_timeout, statement_timeout 등)"""
+        self.engine = create_async_engine(connection_string, **engine_options(connection_string, **options))
+        instrument_engine(self.engine)
+        self.Session = async_sessionmaker(bind=self.engine, expire_on_commit=False)
+
+    async def close(self) -> None:
+        await self.engine.dispose()
+
+    def pool_status(self) -> Optional[dict]:
+        return describe_pool(self.engine.pool)
+
+    async def replication_lag(self) -> float:
+        if self.engine.dialect.name != "postgresql":
+            return 0.0
+        async with self.engine.connect() as conn:
+            return float(await conn.scalar(REPLICATION_LAG_QUERY))
+
+    async def _load_user(self, session, user_id: int) -> Optional[UserModel]:
+        return await session.get(UserModel, user_id, options=USER_LOAD_OPTIONS)
+
+    async def _load_schedule(self, session, schedule_id: int) -> Optional[MeetingScheduleModel]:
+        return await session.get(MeetingScheduleModel, schedule_id, options=SCHEDULE_LOAD_OPTIONS)
+
+    async def _load_request(self, session, request_id: int) -> Optional[MeetingRequestModel]:
+        return await session.get(MeetingRequestModel, request_id, options=REQUEST_LOAD_OPTIONS)
+
+    async def get_user_by_email(self, email: str) -> Optional[User]:
+        async with self.Session() as session:
+            user = await session.scalar(select(UserModel).where(UserModel.email == email))
+            if user:
+                return User.model_construct(id=user.id, name=user.name, email=user.email)
+            return None
+
+    async def get_users_by_emails(self, emails: List[str]) -> List[User]:
+        async with self.Session() as session:
+            user_models = (await session.scalars(
+                select(UserModel).where(UserModel.email.in_(emails))
+            )).all()
+            return [User.model_construct(id=u.id, name=u.name, email=u.email) for u in user_models]
+
+    async def create_user(self, name: str, email: str) -> User:
+        async with self.Session() as session:
+            user_model = UserModel(name=name, email=email)
+            session.add(user_model)
+            await session.commit()
+            return User.model_construct(id=user_model.id, name=user_model.name, email=user_model.email)
+
+    async def get_user(self, user_id: int) -> Optional[User]:
+        async with self.Session() as session:
+            user_model = await self._load_user(session, user_id)
+            return self._convert_user_model(user_model) if user_model else None
+
+    async def create_schedule(self, schedule: MeetingSchedule) -> MeetingSchedule:
+        async with self.Session() as session:
+            time_model = TimeModel(
+                start_time=schedule.time.start_time,
+                end_time=schedule.time.end_time
+            )
+
+            schedule_model = MeetingScheduleModel(
+                host_id=schedule.host.id,
+                title=schedule.title,
+                description=schedule.description,
+                time=time_model
+            )
+
+            # 참가자 추가 (한 번의 쿼리로 조회)
+            participant_ids = [p.id for p in schedule.participants]
+            participant_models = (await session.scalars(
+                select(UserModel).where(UserModel.id.in_(participant_ids))
+            )).all()
+            schedule_model.participants = list(participant_models)
+
+            session.add(schedule_model)
+            try:
+                await session.flush()
+                await session.execute(bump_data_versions_statement(
+                    UserModel.id.in_([schedule.host.id, *participant_ids])
+                ))
+                await session.commit()
+            except IntegrityError as e:
+                if is_schedule_conflict(e):
+                    raise ScheduleConflictError("A participant already has a schedule at this time") from e
+                raise
+
+            session.expunge_all()
+            return self._convert_schedule_model(await self._load_schedule(session, schedule_model.id))
+
+    async def get_schedule(self, schedule_id: int) -> Optional[MeetingSchedule]:
+        async with self.Session() as session:
+            schedule_model = await self._load_schedule(session, schedule_id)
+            if not schedule_model:
+                return None
+            return self._convert_schedule_model(schedule_model)
+
+    async def get_user_schedules(
+        self,
+        user_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> List[MeetingSchedule]:
+        async with self.Session() as session:
+            schedule_models = (await session.scalars(
+                user_schedules_query(user_id, start, end, limit, cursor)
+            )).unique().all()
+            return [self._convert_schedule_model(sm) for sm in schedule_models]
+
+    async def get_busy_times(self, user_ids: List[int], start: datetime, end: datetime) -> Dict[int, List[Time]]:
+        async with self.Session() as session:
+            rows = (await session.execute(
+                busy_times_query(self.engine.dialect.name, user_ids, start, end)
+            )).all()
+            return group_busy_times(user_ids, rows)
+
+    async def create_request(self, request: MeetingRequest) -> MeetingRequest:
+        async with self.Session() as session:
+            time_models = [
+                TimeModel(start_time=t.start_time, end_time=t.end_time)
+                for t in request.available_times
+            ]
+
+            request_model = MeetingRequestModel(
+                sender_id=request.sender.id,
+                receiver_email=request.receiver_email,
+                title=request.title,
+                description=request.description,
+                status=request.status,
+                available_times=time_models
+            )
+
+            session.add(request_model)
+            await session.flush()
+            # 초대 이메일은 요청과 같은 트랜잭션에 기록하고 워커가 발송한다
+            await session.execute(insert(EmailOutboxModel), outbox_rows([request_model.id], [request]))
+            await session.execute(bump_data_versions_statement(UserModel.email == request.receiver_email))
+            await session.commit()
+
+            session.expunge_all()
+            return self._convert_request_model(await self._load_request(session, request_model.id))
+
+    async def create_requests(self, requests: List[MeetingRequest]) -> List[MeetingRequest]:
+        if not requests:
+            return []
+        async with self.Session() as session:
+            request_ids = (await session.scalars(insert_requests_statement(), request_rows(requests))).all()
+            time_rows = available_time_rows(request_ids, requests)
+            if time_rows:
+                await session.execute(insert(TimeModel), time_rows)
+            await session.execute(insert(EmailOutboxModel), outbox_rows(request_ids, requests))
+            await session.execute(bump_data_versions_statement(
+                UserModel.email.in_({r.receiver_email for r in requests})
+            ))
+            await session.commit()
+        return created_requests(request_ids, requests)
+
+    async def get_request(self, request_id: int) -> Optional[MeetingRequest]:
+        async with self.Session() as session:
+            request_model = await self._load_request(session, request_id)
+            if not request_model:
+                return None
+            return self._convert_request_model(request_model)
+
+    async def get_user_received_requests(
+        self,
+        user_email: str,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> List[MeetingRequest]:
+        async with self.Session() as session:
+            request_models = (await session.scalars(
+                received_requests_query(user_email, limit, cursor)
+            )).unique().all()
+            return [self._convert_request_model(rm) for rm in request_models]
+
+    async def create_api_key(self, user_id: int) -> APIKey:
+        async with self.Session() as session:
+            user_model = await session.get(UserModel, user_id)
+            if not user_model:
+                raise ValueError(f"User with id {user_id} not found")
+
+            api_key = APIKeyModel(
+                key=generate_api_key(),
+                user_id=user_id
+            )
+
+            session.add(api_key)
+            await session.execute(bump_data_versions_statement(api_key_audience(user_id)))
+            await session.commit()
+            return self._convert_api_key_model(api_key)
+
+    async def get_user_by_api_key(self, api_key: str) -> Optional[User]:
+        async with self.Session() as session:
+            user_model = await session.scalar(
+                select(UserModel)
+                .join(APIKeyModel, APIKeyModel.user_id == UserModel.id)
+                .where(APIKeyModel.key == api_key, APIKeyModel.is_active == True)
+                .options(*USER_LOAD_OPTIONS)
+            )
+            return self._convert_user_model(user_model) if user_model else None
+
+    async def deactivate_api_key(self, api_key: str) -> bool:
+        async with self.Session() as session:
+            api_key_model = await session.get(APIKeyModel, api_key)
+            if not api_key_model:
+                return False
+
+            api_key_model.is_active = False
+            await session.execute(bump_data_versions_statement(api_key_audience(api_key_model.user_id)))
+            await session.commit()
+            return True
+
+    async def update_request_status(self, request_id: int, status: str, selected_time: Optional[Time] = None) -> MeetingRequest:
+        async with self.Session() as session:
+            request_model = await self._load_request(session, request_id)
+            if not request_model:
+                raise ValueError(f"Request with id {request_id} not found")
+
+            request_model.status = status
+            if selected_time:
+                # 선택된 시간이 가능한 시간 중 하나인지 확인
+                matching_time = next(
+                    (t for t in request_model.available_times
+                     if t.start_time == selected_time.start_time and t.end_time == selected_time.end_time),
+                    None
+                )
+
+                if not matching_time:
+                    raise ValueError("Selected time is not in available times")
+
+                request_model.selected_time = matching_time
+
+            await session.execute(bump_data_versions_statement(UserModel.email == request_model.receiver_email))
+            await session.commit()
+            return self._convert_request_model(request_model)
+
+    async def get_data_version(self, user_id: int) -> int:
+        async with self.Session() as session:
+            return await session.scalar(data_version_query(user_id)) or 0
+
+    async def get_or_create_user_api_key(self, email: str, name: Optional[str] = None) -> Optional[Tuple[User, APIKey]]:
+        async with self.Session() as session:
+            # 가입된 사용자가 활성 키를 가지고 있으면(대부분의 로그인) 이 조회 한 번으로 끝난다
+            row = (await session.execute(user_with_active_key_query(email))).first()
+            created = False
+            if row is None:
+                if name is None:
+                    return None
+                user_id = await session.scalar(insert_user_statement(self.engine.dialect.name, name, email))
+                created = user_id is not None
+                # 동시에 가입한 다른 요청이 먼저 넣었으면 그 사용자를 쓴다
+                if created:
+                    row = (user_id, name, email, None)
+                else:
+                    row = (await session.execute(user_with_active_key_query(email))).one()
+
+            user_id, user_name, user_email, api_key_model = row
+            user = User.model_construct(id=user_id, name=user_name, email=user_email)
+            if api_key_model is not None:
+                return user, self._convert_api_key_model(api_key_model)
+            if not created:
+                # 활성 키가 없는 사용자가 동시에 로그인해도 키를 하나만 발급하도록 사용자 행을 잠그고,
+                # 기다리는 동안 다른 요청이 발급해 커밋했으면 그 키를 쓴다
+                await session.execute(lock_user_statement(user_id))
+                api_key_model = await session.scalar(active_key_query(user_id))
+                if api_key_model is not None:
+                    return user, self._convert_api_key_model(api_key_model)
+
+            statement, api_key = issue_api_key_statement(user_id)
+            await session.execute(statement)
+            if not created:
+                await session.execute(bump_data_versions_statement(api_key_audience(user_id)))
+            await session.commit()
+            return user, api_key
+
+    async def get_active_api_key(self, user_id: int) -> Optional[APIKey]:
+        """사용자의 활성화된 API 키를 반환합니다."""
+        async with self.Session() as session:
+            api_key_model = await session.scalar(active_key_query(user_id))
+            if not api_key_model:
+                return None
+            return self._convert_api_key_model(api_key_model)
+
+    async def claim_outbox_messages(self, now: datetime, limit: int, lease: timedelta) -> List[OutboxMessage]:
+        async with self.Session() as session:
+            rows = (await session.execute(claim_outbox_statement(now, limit, lease))).all()
+            await session.commit()
+            return claimed_outbox_messages(rows)
+
+    async def mark_outbox_sent(self, message_ids: List[int]) -> None:
+        async with self.Session() as session:
+            await session.execute(outbox_sent_statement(message_ids))
+            await session.commit()
+
+    async def mark_outbox_failed(self, message_id: int, error: str, retry_at: Optional[datetime]) -> None:
+        async with self.Session() as session:
+            await session.execute(outbox_failed_statement(message_id, error, retry_at))
+            await session.commit()
+
+    async def count_outbox_messages(self, status: OutboxStatus) -> int:
+        async with self.Session() as session:
+            return await session.scalar(count_outbox_statement(status))
+
+    async def reserve_idempotency_key(
+        self, scope: str, key: str, fingerprint: str, now: datetime, lease: timedelta
+    ) -> Optional[IdempotencyRecord]:
+        async with self.Session() as session:
+            reserved = await session.scalar(reserve_idempotency_key_statement(
+                self.engine.dialect.name, scope, key, fingerprint, now, lease
+            ))
+            if reserved is not None:
+                await session.commit()
+                return None
+            row = (await session.execute(idempotency_record_query(scope, key))).first()
+            return idempotency_record(row, fingerprint)
+
+    async def complete_idempotency_key(
+        self, scope: str, key: str, status_code: int, content_type: Optional[str], body: bytes, expires_at: datetime
+    ) -> None:
+        async with self.Session() as session:
+            await session.execute(
+                complete_idempotency_key_statement(scope, key, status_code, content_type, body, expires_at)
+            )
+            await session.commit()
+
+    async def release_idempotency_key(self, scope: str, key: str) -> None:
+        async with self.Session() as session:
+            await session.execute(release_idempotency_key_statement(scope, key))
+            await session.commit()
+
+    async def purge_idempotency_keys(self, now: datetime) -> int:
+        async with self.Session() as session:
+            deleted = (await session.execute(purge_idempotency_keys_statement(now))).rowcount
+            await session.commit()
+            return deleted
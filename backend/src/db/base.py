@@ -1,14 +1,38 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
-from datetime import datetime
-from src.models import User, MeetingSchedule, MeetingRequest, APIKey, Time
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+from src.models import (
+    User, MeetingSchedule, MeetingRequest, APIKey, Time, OutboxMessage, OutboxStatus, IdempotencyRecord
+)
+
+
+class ScheduleConflictError(ValueError):
+    """참가자가 이미 같은 시간대의 다른 스케줄에 참여하고 있을 때 create_schedule이 던지는 예외"""
+
+
+class DatabaseOverloadedError(RuntimeError):
+    """DB 동시 실행 한도가 차 있고 대기열에서도 기다릴 수 없어 호출을 거절할 때 던지는 예외 (src/db/limiter.py)"""
+
 
 class DatabaseInterface(ABC):
+    def pool_status(self) -> Optional[dict]:
+        """커넥션 풀 상태 (풀을 쓰지 않는 구현은 None)"""
+        return None
+
+    def replication_lag(self) -> float:
+        """읽기 복제본이면 primary보다 뒤처진 시간(초). 복제본이 아니면 0"""
+        return 0.0
+
     @abstractmethod
     def get_user_by_email(self, email: str) -> Optional[User]:
         """이메일로 사용자 조회"""
         pass
     
+    @abstractmethod
+    def get_users_by_emails(self, emails: List[str]) -> List[User]:
+        """여러 이메일의 사용자를 한 번에 조회 (없는 이메일은 결과에서 빠진다)"""
+        pass
+    
     @abstractmethod
     def create_user(self, name: str, email: str) -> User:
         """새로운 사용자 생성"""
@@ -30,8 +54,20 @@ class DatabaseInterface(ABC):
         pass
     
     @abstractmethod
-    def get_user_schedules(self, user_id: int) -> List[MeetingSchedule]:
-        """사용자의 모든 미팅 스케줄 조회"""
+    def get_user_schedules(
+        self,
+        user_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> List[MeetingSchedule]:
+        """사용자의 미팅 스케줄을 시작 시간 순으로 조회 (start <= 시작 시간 < end, cursor 이후 limit개)"""
+        pass
+    
+    @abstractmethod
+    def get_busy_times(self, user_ids: List[int], start: datetime, end: datetime) -> Dict[int, List[Time]]:
+        """사용자별로 참여하는 스케줄 중 [start, end)와 겹치는 것의 시간을 시작 시간 순으로 조회"""
         pass
     
     @abstractmethod
@@ -39,14 +75,24 @@ class DatabaseInterface(ABC):
         """새로운 미팅 요청 생성"""
         pass
     
+    @abstractmethod
+    def create_requests(self, requests: List[MeetingRequest]) -> List[MeetingRequest]:
+        """여러 미팅 요청을 한 트랜잭션에서 생성 (입력 순서대로 반환)"""
+        pass
+    
     @abstractmethod
     def get_request(self, request_id: int) -> Optional[MeetingRequest]:
         """ID로 미팅 요청 조회"""
         pass
     
     @abstractmethod
-    def get_user_received_requests(self, user_email: str) -> List[MeetingRequest]:
-        """사용자가 받은 모든 미팅 요청 조회"""
+    def get_user_received_requests(
+        self,
+        user_email: str,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> List[MeetingRequest]:
+        """사용자가 받은 미팅 요청을 id 순으로 조회 (cursor 이후 limit개)"""
         pass
     
     @abstractmethod
@@ -69,7 +115,244 @@ class DatabaseInterface(ABC):
         """미팅 요청 상태 업데이트"""
         pass
 
+    @abstractmethod
+    def get_data_version(self, user_id: int) -> int:
+        """사용자의 스케줄·받은 요청 목록이 바뀔 때마다 올라가는 버전 (목록 응답의 ETag용)"""
+        pass
+
+    @abstractmethod
+    def get_or_create_user_api_key(self, email: str, name: Optional[str] = None) -> Optional[Tuple[User, APIKey]]:
+        """사용자와 활성 API 키를 한 트랜잭션에서 가져온다. 활성 키가 없으면 발급한다.
+
+        name이 있으면 사용자가 없을 때 만들고(동시에 가입해도 한 명만 생긴다), 없으면 None을 반환한다.
+        """
+        pass
+
     @abstractmethod
     def get_active_api_key(self, user_id: int) -> Optional[APIKey]:
         """사용자의 활성화된 API 키를 반환합니다."""
         pass
+
+    @abstractmethod
+    def claim_outbox_messages(self, now: datetime, limit: int, lease: timedelta) -> List[OutboxMessage]:
+        """발송할 때가 된 이메일을 가져가고 시도 횟수를 올린다. lease 동안은 다른 워커가 가져가지 못한다"""
+        pass
+    
+    @abstractmethod
+    def mark_outbox_sent(self, message_ids: List[int]) -> None:
+        """이메일 발송 완료 기록"""
+        pass
+    
+    @abstractmethod
+    def mark_outbox_failed(self, message_id: int, error: str, retry_at: Optional[datetime]) -> None:
+        """이메일 발송 실패 기록. retry_at이 없으면 더 이상 재시도하지 않는다"""
+        pass
+
+    @abstractmethod
+    def count_outbox_messages(self, status: OutboxStatus) -> int:
+        """status 상태인 이메일 수 (발송 대기열 길이 확인용)"""
+        pass
+
+    @abstractmethod
+    def reserve_idempotency_key(
+        self, scope: str, key: str, fingerprint: str, now: datetime, lease: timedelta
+    ) -> Optional[IdempotencyRecord]:
+        """키를 처리 중으로 예약한다. 예약했으면 None, 만료되지 않은 기록이 이미 있으면 그 기록을 반환한다.
+
+        처리 중인 예약은 lease가 지나면 만료되어 다른 요청이 다시 예약할 수 있다 (처리하던 프로세스가 죽은 경우).
+        """
+        pass
+
+    @abstractmethod
+    def complete_idempotency_key(
+        self, scope: str, key: str, status_code: int, content_type: Optional[str], body: bytes, expires_at: datetime
+    ) -> None:
+        """예약한 키에 응답을 저장한다. expires_at까지 재시도에 이 응답을 돌려준다"""
+        pass
+
+    @abstractmethod
+    def release_idempotency_key(self, scope: str, key: str) -> None:
+        """처리에 실패한 예약을 지워 같은 키로 다시 시도할 수 있게 한다"""
+        pass
+
+    @abstractmethod
+    def purge_idempotency_keys(self, now: datetime) -> int:
+        """만료된 키를 지우고 지운 수를 반환한다"""
+        pass
+
+
+class AsyncDatabaseInterface(ABC):
+    """DatabaseInterface의 비동기 버전. API 핸들러는 이 인터페이스를 await 한다."""
+
+    async def connect(self) -> None:
+        """앱 시작 시 호출되는 초기화 훅"""
+        pass
+
+    async def close(self) -> None:
+        """앱 종료 시 호출되는 정리 훅"""
+        pass
+
+    def pool_status(self) -> Optional[dict]:
+        """커넥션 풀 상태 (풀을 쓰지 않는 구현은 None). I/O 없이 바로 반환한다"""
+        return None
+
+    async def replication_lag(self) -> float:
+        """읽기 복제본이면 primary보다 뒤처진 시간(초). 복제본이 아니면 0"""
+        return 0.0
+
+    @abstractmethod
+    async def get_user_by_email(self, email: str) -> Optional[User]:
+        """이메일로 사용자 조회"""
+        pass
+
+    @abstractmethod
+    async def get_users_by_emails(self, emails: List[str]) -> List[User]:
+        """여러 이메일의 사용자를 한 번에 조회 (없는 이메일은 결과에서 빠진다)"""
+        pass
+
+    @abstractmethod
+    async def create_user(self, name: str, email: str) -> User:
+        """새로운 사용자 생성"""
+        pass
+
+    @abstractmethod
+    async def get_user(self, user_id: int) -> Optional[User]:
+        """ID로 사용자 조회"""
+        pass
+
+    @abstractmethod
+    async def create_schedule(self, schedule: MeetingSchedule) -> MeetingSchedule:
+        """새로운 미팅 스케줄 생성"""
+        pass
+
+    @abstractmethod
+    async def get_schedule(self, schedule_id: int) -> Optional[MeetingSchedule]:
+        """ID로 미팅 스케줄 조회"""
+        pass
+
+    @abstractmethod
+    async def get_user_schedules(
+        self,
+        user_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> List[MeetingSchedule]:
+        """사용자의 미팅 스케줄을 시작 시간 순으로 조회 (start <= 시작 시간 < end, cursor 이후 limit개)"""
+        pass
+
+    @abstractmethod
+    async def get_busy_times(self, user_ids: List[int], start: datetime, end: datetime) -> Dict[int, List[Time]]:
+        """사용자별로 참여하는 스케줄 중 [start, end)와 겹치는 것의 시간을 시작 시간 순으로 조회"""
+        pass
+
+    @abstractmethod
+    async def create_request(self, request: MeetingRequest) -> MeetingRequest:
+        """새로운 미팅 요청 생성"""
+        pass
+
+    @abstractmethod
+    async def create_requests(self, requests: List[MeetingRequest]) -> List[MeetingRequest]:
+        """여러 미팅 요청을 한 트랜잭션에서 생성 (입력 순서대로 반환)"""
+        pass
+
+    @abstractmethod
+    async def get_request(self, request_id: int) -> Optional[MeetingRequest]:
+        """ID로 미팅 요청 조회"""
+        pass
+
+    @abstractmethod
+    async def get_user_received_requests(
+        self,
+        user_email: str,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> List[MeetingRequest]:
+        """사용자가 받은 미팅 요청을 id 순으로 조회 (cursor 이후 limit개)"""
+        pass
+
+    @abstractmethod
+    async def create_api_key(self, user_id: int) -> APIKey:
+        """새로운 API 키 생성"""
+        pass
+
+    @abstractmethod
+    async def get_user_by_api_key(self, api_key: str) -> Optional[User]:
+        """API 키로 사용자 조회"""
+        pass
+
+    @abstractmethod
+    async def deactivate_api_key(self, api_key: str) -> bool:
+        """API 키 비활성화"""
+        pass
+
+    @abstractmethod
+    async def update_request_status(self, request_id: int, status: str, selected_time: Optional[Time] = None) -> MeetingRequest:
+        """미팅 요청 상태 업데이트"""
+        pass
+
+    @abstractmethod
+    async def get_data_version(self, user_id: int) -> int:
+        """사용자의 스케줄·받은 요청 목록이 바뀔 때마다 올라가는 버전 (목록 응답의 ETag용)"""
+        pass
+
+    @abstractmethod
+    async def get_or_create_user_api_key(self, email: str, name: Optional[str] = None) -> Optional[Tuple[User, APIKey]]:
+        """사용자와 활성 API 키를 한 트랜잭션에서 가져온다. 활성 키가 없으면 발급한다.
+
+        name이 있으면 사용자가 없을 때 만들고(동시에 가입해도 한 명만 생긴다), 없으면 None을 반환한다.
+        """
+        pass
+
+    @abstractmethod
+    async def get_active_api_key(self, user_id: int) -> Optional[APIKey]:
+        """사용자의 활성화된 API 키를 반환합니다."""
+        pass
+
+    @abstractmethod
+    async def claim_outbox_messages(self, now: datetime, limit: int, lease: timedelta) -> List[OutboxMessage]:
+        """발송할 때가 된 이메일을 가져가고 시도 횟수를 올린다. lease 동안은 다른 워커가 가져가지 못한다"""
+        pass
+
+    @abstractmethod
+    async def mark_outbox_sent(self, message_ids: List[int]) -> None:
+        """이메일 발송 완료 기록"""
+        pass
+
+    @abstractmethod
+    async def mark_outbox_failed(self, message_id: int, error: str, retry_at: Optional[datetime]) -> None:
+        """이메일 발송 실패 기록. retry_at이 없으면 더 이상 재시도하지 않는다"""
+        pass
+
+    @abstractmethod
+    async def count_outbox_messages(self, status: OutboxStatus) -> int:
+        """status 상태인 이메일 수 (발송 대기열 길이 확인용)"""
+        pass
+
+    @abstractmethod
+    async def reserve_idempotency_key(
+        self, scope: str, key: str, fingerprint: str, now: datetime, lease: timedelta
+    ) -> Optional[IdempotencyRecord]:
+        """키를 처리 중으로 예약한다. 예약했으면 None, 만료되지 않은 기록이 이미 있으면 그 기록을 반환한다.
+
+        처리 중인 예약은 lease가 지나면 만료되어 다른 요청이 다시 예약할 수 있다 (처리하던 프로세스가 죽은 경우).
+        """
+        pass
+
+    @abstractmethod
+    async def complete_idempotency_key(
+        self, scope: str, key: str, status_code: int, content_type: Optional[str], body: bytes, expires_at: datetime
+    ) -> None:
+        """예약한 키에 응답을 저장한다. expires_at까지 재시도에 이 응답을 돌려준다"""
+        pass
+
+    @abstractmethod
+    async def release_idempotency_key(self, scope: str, key: str) -> None:
+        """처리에 실패한 예약을 지워 같은 키로 다시 시도할 수 있게 한다"""
+        pass
+
+    @abstractmethod
+    async def purge_idempotency_keys(self, now: datetime) -> int:
+        """만료된 키를 지우고 지운 수를 반환한다"""
+        pass
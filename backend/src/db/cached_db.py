@@ -0,0 +1,53 @@
+from typing import Optional
+
+from src.cache import TTLCache
+from src.db.base import AsyncDatabaseInterface
+from src.db.proxy import DatabaseProxy
+from src.models import User, APIKey
+
+
+class AuthCachingDatabase(DatabaseProxy):
+    """API 키 인증 결과를 캐시해서 반복 인증 시 DB 왕복을 없앤다.
+
+    키 생성/비활성화 시 해당 사용자의 캐시 항목을 즉시 무효화한다.
+    캐시는 프로세스 단위이므로 다른 워커에서 일어난 변경은 TTL 이내에 반영된다.
+    """
+
+    def __init__(self, db: AsyncDatabaseInterface, max_size: int = 10000, ttl: float = 60.0):
+        super().__init__(db)
+        self.auth_cache = TTLCache(max_size=max_size, ttl=ttl)
+        self._generation = 0
+
+    def _invalidate(self, predicate) -> None:
+        self.auth_cache.discard_if(predicate)
+        # 무효화 이전에 시작된 조회가 오래된 결과를 다시 캐시하지 않도록 세대를 올린다
+        self._generation += 1
+
+    async def get_user_by_api_key(self, api_key: str) -> Optional[User]:
+        user = self.auth_cache.get(api_key)
+        if user is not None:
+            return user
+
+        generation = self._generation
+        user = await self._call("get_user_by_api_key", api_key)
+        # 잘못된 키는 캐시하지 않는다 (새로 발급된 키가 음성 캐시에 막히지 않도록)
+        if user is not None and generation == self._generation:
+            self.auth_cache.set(api_key, user)
+        return user
+
+    # get_or_create_user_api_key는 활성 키가 없는 사용자에게만 키를 발급한다.
+    # 그런 사용자는 캐시된 항목이 없으므로(비활성화할 때 지운다) 무효화하지 않는다.
+
+    async def create_api_key(self, user_id: int) -> APIKey:
+        api_key = await self._call("create_api_key", user_id)
+        # 캐시된 User의 api_keys 목록이 오래된 상태가 된다
+        self._invalidate(lambda _, user: user.id == user_id)
+        return api_key
+
+    async def deactivate_api_key(self, api_key: str) -> bool:
+        deactivated = await self._call("deactivate_api_key", api_key)
+        # 해당 키 항목과, 같은 사용자의 다른 키로 캐시된 항목(api_keys 목록 포함)을 제거
+        self._invalidate(
+            lambda key, user: key == api_key or any(k.key == api_key for k in user.api_keys)
+        )
+        return deactivated
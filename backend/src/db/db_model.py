@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Table, JSON
+from sqlalchemy import (
+    BigInteger, Column, Integer, String, DateTime, Boolean, ForeignKey, Table, JSON, Index, LargeBinary, text
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
@@ -10,7 +12,10 @@ meeting_participants = Table(
     'meeting_participants',
     Base.metadata,
     Column('meeting_id', Integer, ForeignKey('meeting_schedules.id')),
-    Column('user_id', Integer, ForeignKey('users.id'))
+    Column('user_id', Integer, ForeignKey('users.id')),
+    # 사용자별 스케줄 조회(participants.any)와 참가자 로드(meeting_id IN ...)용
+    Index('ix_meeting_participants_user_id_meeting_id', 'user_id', 'meeting_id'),
+    Index('ix_meeting_participants_meeting_id', 'meeting_id'),
 )
 
 class UserModel(Base):
@@ -19,6 +24,8 @@ class UserModel(Base):
     id = Column(Integer, primary_key=True)
     name = Column(String, nullable=False)
     email = Column(String, unique=True, nullable=False)
+    # 이 사용자의 스케줄·받은 요청 목록이 바뀔 때마다 1씩 올린다 (목록 응답의 ETag)
+    data_version = Column(BigInteger, nullable=False, default=0, server_default=text('0'))
     api_keys = relationship("APIKeyModel", back_populates="user")
     hosted_meetings = relationship("MeetingScheduleModel", back_populates="host")
     participated_meetings = relationship("MeetingScheduleModel", secondary=meeting_participants)
@@ -33,6 +40,11 @@ class APIKeyModel(Base):
     is_active = Column(Boolean, default=True)
     user = relationship("UserModel", back_populates="api_keys")
 
+    __table_args__ = (
+        # 활성 키 조회와 사용자별 키 목록 로드(user_id IN ...)를 함께 처리
+        Index('ix_api_keys_user_id_is_active', 'user_id', 'is_active'),
+    )
+
 class TimeModel(Base):
     __tablename__ = 'times'
     
@@ -44,6 +56,15 @@ class TimeModel(Base):
     meeting_schedule = relationship("MeetingScheduleModel", back_populates="time", uselist=False)
     meeting_request = relationship("MeetingRequestModel", back_populates="available_times", foreign_keys=[meeting_request_id])
 
+    __table_args__ = (
+        Index('ix_times_start_time', 'start_time'),
+        # 스케줄용 시간은 meeting_request_id가 NULL이므로 요청에 속한 행만 인덱싱
+        Index(
+            'ix_times_meeting_request_id', 'meeting_request_id',
+            postgresql_where=text('meeting_request_id IS NOT NULL')
+        ),
+    )
+
 class MeetingScheduleModel(Base):
     __tablename__ = 'meeting_schedules'
     
@@ -54,9 +75,14 @@ class MeetingScheduleModel(Base):
     description = Column(String)
     
     host = relationship("UserModel", back_populates="hosted_meetings")
-    participants = relationship("UserModel", secondary=meeting_participants)
+    participants = relationship("UserModel", secondary=meeting_participants, overlaps="participated_meetings")
     time = relationship("TimeModel", back_populates="meeting_schedule", foreign_keys=[time_id])
 
+    __table_args__ = (
+        Index('ix_meeting_schedules_host_id', 'host_id'),
+        Index('ix_meeting_schedules_time_id', 'time_id'),
+    )
+
 class MeetingRequestModel(Base):
     __tablename__ = 'meeting_requests'
     
@@ -69,6 +95,51 @@ class MeetingRequestModel(Base):
     
     sender = relationship("UserModel", back_populates="sent_requests")
     available_times = relationship("TimeModel", back_populates="meeting_request", foreign_keys=[TimeModel.meeting_request_id])
-    selected_time_id = Column(Integer, ForeignKey('times.id'), nullable=True)
+    selected_time_id = Column(Integer, ForeignKey('times.id', use_alter=True, name='meeting_requests_selected_time_id_fkey'), nullable=True)
     selected_time = relationship("TimeModel", foreign_keys=[selected_time_id], overlaps="available_times")
 
+    __table_args__ = (
+        # 받은 요청 목록의 keyset 페이지네이션 (receiver_email = ? AND id > ? ORDER BY id)
+        Index('ix_meeting_requests_receiver_email_id', 'receiver_email', 'id'),
+        Index('ix_meeting_requests_sender_id', 'sender_id'),
+    )
+
+
+class EmailOutboxModel(Base):
+    """보내야 할 이메일. 원본 데이터와 같은 트랜잭션에서 기록되고 발송은 src/email_worker.py가 맡는다"""
+    __tablename__ = 'email_outbox'
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String, nullable=False)  # 본문을 만들 데이터 종류 (예: meeting_request)
+    reference_id = Column(Integer, nullable=False)
+    recipient = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="PENDING")
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_error = Column(String)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    sent_at = Column(DateTime)
+
+    __table_args__ = (
+        # 워커의 발송 대상 조회 (status = 'PENDING' AND next_attempt_at <= now ORDER BY next_attempt_at)
+        Index('ix_email_outbox_status_next_attempt_at', 'status', 'next_attempt_at'),
+    )
+
+
+class IdempotencyKeyModel(Base):
+    """Idempotency-Key를 보낸 POST 요청의 응답. 재시도하면 처리하지 않고 저장한 응답을 돌려준다 (src/idempotency.py)"""
+    __tablename__ = 'idempotency_keys'
+
+    scope = Column(String, primary_key=True)  # 경로와 API 키의 해시. 다른 클라이언트의 키와 섞이지 않는다
+    key = Column(String, primary_key=True)
+    fingerprint = Column(String, nullable=False)
+    status_code = Column(Integer)  # NULL이면 처리 중
+    content_type = Column(String)
+    body = Column(LargeBinary)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    # 처리 중이면 lease, 응답을 저장한 뒤에는 보관 기간이 끝나는 시각. 지나면 같은 키를 다시 쓸 수 있다
+    expires_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index('ix_idempotency_keys_expires_at', 'expires_at'),
+    )
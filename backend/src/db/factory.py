@@ -1,8 +1,18 @@
 # src/db/factory.py
 from typing import Dict, Any
-from src.db.base import DatabaseInterface
-from src.db.memory_db import MemoryDatabase
+from sqlalchemy.engine import make_url
+from src.db.base import DatabaseInterface, AsyncDatabaseInterface
+from src.db.memory_db import MemoryDatabase, DurableMemoryDatabase
 from src.db.postgres_db import PostgresDatabase
+from src.db.async_postgres_db import AsyncPostgresDatabase
+from src.db.proxy import ThreadPoolDatabase
+from src.db.cached_db import AuthCachingDatabase
+from src.db.replicated_db import ReplicatedDatabase
+from src.db.limiter import AIMDLimit, ConcurrencyLimitedDatabase, Priority
+
+# DB_CONFIG에서 engine_options()로 넘기는 키
+ENGINE_OPTION_KEYS = ("pool_size", "max_overflow", "pool_timeout", "pool_recycle", "pool_pre_ping", "statement_timeout")
+
 
 class DatabaseFactory:
     @staticmethod
@@ -10,11 +20,102 @@ class DatabaseFactory:
         db_type = config.get("type", "memory")
         
         if db_type == "memory":
+            # data_dir이 있으면 WAL과 스냅샷으로 재시작 후에도 데이터를 유지한다
+            data_dir = config.get("memory_data_dir")
+            if data_dir:
+                return DurableMemoryDatabase(
+                    data_dir,
+                    fsync=config.get("memory_fsync", True),
+                    snapshot_every=config.get("memory_snapshot_every", 100000)
+                )
             return MemoryDatabase()
         elif db_type == "postgres":
             connection_string = config.get("connection_string")
             if not connection_string:
                 raise ValueError("PostgreSQL connection string is required")
-            return PostgresDatabase(connection_string)
+            return PostgresDatabase(connection_string, **DatabaseFactory._engine_options(config))
+        else:
+            raise ValueError(f"Unsupported database type: {db_type}")
+
+    @staticmethod
+    def create_async_database(config: Dict[str, Any]) -> AsyncDatabaseInterface:
+        """API 핸들러가 await 할 수 있는 DB를 생성한다.
+
+        `async_postgres`는 네이티브 비동기 드라이버(asyncpg)를 사용하고,
+        나머지 동기 구현은 스레드풀에서 실행되도록 감싼다.
+        `replica_connection_strings`가 있으면 읽기를 복제본으로 나눠 보낸다.
+        `adaptive_limit`이면 동시 DB 호출 수를 지연 시간에 따라 조절하고 넘치는 호출은 우선순위대로 기다리게 한다.
+        `auth_cache_ttl`이 0보다 크면 API 키 인증 캐시를 앞에 둔다 (캐시 적중은 한도를 쓰지 않는다).
+        """
+        db_type = config.get("type", "memory")
+        replica_urls = config.get("replica_connection_strings") or []
+
+        if db_type == "async_postgres":
+            connection_string = config.get("connection_string")
+            if not connection_string:
+                raise ValueError("PostgreSQL connection string is required")
+            db = DatabaseFactory._async_postgres(connection_string, config)
+            replicas = [DatabaseFactory._async_postgres(url, config) for url in replica_urls]
         else:
-            raise ValueError(f"Unsupported database type: {db_type}")
\ No newline at end of file
+            db = ThreadPoolDatabase(DatabaseFactory.create_database(config))
+            if replica_urls and db_type != "postgres":
+                raise ValueError(f"Read replicas are not supported for database type: {db_type}")
+            replicas = [
+                ThreadPoolDatabase(DatabaseFactory.create_database({**config, "connection_string": url}))
+                for url in replica_urls
+            ]
+
+        if replicas:
+            db = ReplicatedDatabase(
+                db,
+                replicas,
+                max_lag=config.get("replica_max_lag", 1.0),
+                check_interval=config.get("replica_check_interval", 1.0)
+            )
+
+        if config.get("adaptive_limit", False):
+            db = DatabaseFactory._concurrency_limited(db, config, databases=1 + len(replicas))
+
+        auth_cache_ttl = config.get("auth_cache_ttl", 0)
+        if auth_cache_ttl > 0:
+            db = AuthCachingDatabase(
+                db,
+                max_size=config.get("auth_cache_size", 10000),
+                ttl=auth_cache_ttl
+            )
+        return db
+
+    @staticmethod
+    def _async_postgres(connection_string: str, config: Dict[str, Any]) -> AsyncPostgresDatabase:
+        return AsyncPostgresDatabase(
+            DatabaseFactory._async_url(connection_string), **DatabaseFactory._engine_options(config)
+        )
+
+    @staticmethod
+    def _concurrency_limited(db: AsyncDatabaseInterface, config: Dict[str, Any], databases: int):
+        # 처음에는 연결 수만큼 실행하고, 그보다 늘리지 않는다 (넘는 호출은 풀이 아니라 우선순위 대기열에서 기다린다)
+        connections = (config.get("pool_size", 5) + config.get("max_overflow", 10)) * databases
+        timeout = config.get("limit_queue_timeout", 1.0)
+        return ConcurrencyLimitedDatabase(
+            db,
+            AIMDLimit(
+                initial=connections,
+                min_limit=min(config.get("limit_min", 2), connections),
+                max_limit=connections,
+                latency_target=config.get("limit_latency_target", 0.25)
+            ),
+            queue_timeouts={Priority.WRITE: timeout, Priority.READ: timeout / 2, Priority.POLL: timeout / 10},
+            max_queue=config.get("limit_max_queue", 100)
+        )
+
+    @staticmethod
+    def _engine_options(config: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: config[key] for key in ENGINE_OPTION_KEYS if key in config}
+
+    @staticmethod
+    def _async_url(connection_string: str) -> str:
+        # postgresql:// 처럼 드라이버가 지정되지 않은 경우 asyncpg를 사용한다
+        url = make_url(connection_string)
+        if url.get_backend_name() == "postgresql" and "+" not in url.drivername:
+            url = url.set(drivername="postgresql+asyncpg")
+        return url.render_as_string(hide_password=False)
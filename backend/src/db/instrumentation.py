@@ -0,0 +1,166 @@
+import time
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from prometheus_client import REGISTRY
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from src.metrics import DB_POOL_CHECKOUT_WAIT, DB_QUERY_DURATION
+
+STATEMENTS_HEADER = "X-DB-Statements"
+DURATION_HEADER = "X-DB-Time-Ms"
+QUERY_STATS_HEADERS = [STATEMENTS_HEADER, DURATION_HEADER]
+
+
+@dataclass
+class QueryStats:
+    statements: int = 0
+    duration: float = 0.0  # 초
+
+
+# 현재 HTTP 요청의 집계. 스레드풀(run_in_threadpool)로 넘어갈 때도 컨텍스트가 복사되므로
+# 같은 QueryStats 객체에 누적된다
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """블록 안에서 실행된 SQL 문 수와 DB 시간을 집계한다. 이미 집계 중이면 같은 객체를 쓴다"""
+    stats = _current_stats.get()
+    if stats is not None:
+        yield stats
+        return
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_started_at")
+    if not started:
+        return
+    duration = time.perf_counter() - started.pop()
+    DB_QUERY_DURATION.observe(duration)
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.duration += duration
+        stats.statements += 1
+
+
+def instrument_engine(engine) -> None:
+    """엔진에 실행된 SQL을 집계하는 리스너를 단다. AsyncEngine은 내부의 동기 엔진에 단다"""
+    engine = getattr(engine, "sync_engine", engine)
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# 메트릭 수집 시 상태를 읽을 풀들. engine.dispose()로 교체된 풀은 자동으로 빠진다
+_pools: "weakref.WeakSet" = weakref.WeakSet()
+
+
+class _TimedPoolMixin:
+    """커넥션 풀에서 연결을 얻을 때까지 기다린 시간과 pool_timeout 초과 횟수를 기록한다"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_seconds = 0.0
+        self.checkout_timeouts = 0
+        _pools.add(self)
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.checkout_timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.wait_seconds += waited
+            DB_POOL_CHECKOUT_WAIT.observe(waited)
+
+
+def describe_pool(pool) -> dict:
+    """풀 상태. 크기 제한이 있는 풀(QueuePool)만 크기·사용 중·overflow 연결 수를 알 수 있다"""
+    status = {
+        "wait_seconds": round(getattr(pool, "wait_seconds", 0.0), 6),
+        "checkout_timeouts": getattr(pool, "checkout_timeouts", 0),
+    }
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            # 연결을 pool_size개까지 만들기 전에는 음수이다
+            overflow=max(pool.overflow(), 0),
+            checked_in=pool.checkedin(),
+        )
+    return status
+
+
+class PoolCollector:
+    """수집 시점의 풀 상태를 Prometheus 메트릭으로 내보낸다"""
+
+    def collect(self):
+        size = GaugeMetricFamily("db_pool_size", "Configured pool size")
+        checked_out = GaugeMetricFamily("db_pool_checked_out", "Connections currently checked out")
+        overflow = GaugeMetricFamily("db_pool_overflow", "Connections opened beyond the pool size")
+        timeouts = CounterMetricFamily("db_pool_checkout_timeouts", "Checkouts that gave up after pool_timeout")
+        statuses = [describe_pool(pool) for pool in list(_pools)]
+        limited = [s for s in statuses if "size" in s]
+        size.add_metric([], sum(s["size"] for s in limited))
+        checked_out.add_metric([], sum(s["checked_out"] for s in limited))
+        overflow.add_metric([], sum(s["overflow"] for s in limited))
+        timeouts.add_metric([], sum(s["checkout_timeouts"] for s in statuses))
+        return [size, checked_out, overflow, timeouts]
+
+
+REGISTRY.register(PoolCollector())
+
+
+def timed_pool_class(connection_string: str):
+    """connection_string의 드라이버가 기본으로 쓰는 풀 클래스에 대기 시간 측정을 더한 클래스.
+
+    create_engine(..., poolclass=timed_pool_class(connection_string))처럼 쓴다.
+    """
+    url = make_url(connection_string)
+    pool_class = url.get_dialect().get_pool_class(url)
+    return type(f"Timed{pool_class.__name__}", (_TimedPoolMixin, pool_class), {})
+
+
+class QueryStatsMiddleware:
+    """요청마다 SQL 문 수와 DB 시간을 집계해 응답 헤더로 내려주는 ASGI 미들웨어 (디버그용)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or _current_stats.get() is not None:
+            # 바깥에서 이미 집계 중이면 헤더는 바깥 쪽에서 한 번만 붙인다
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            async def send_with_stats(message):
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((STATEMENTS_HEADER.lower().encode(), str(stats.statements).encode()))
+                    headers.append((DURATION_HEADER.lower().encode(), f"{stats.duration * 1000:.2f}".encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_stats)
@@ -0,0 +1,182 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from enum import IntEnum
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+
+from src.db.base import AsyncDatabaseInterface, DatabaseOverloadedError
+from src.db.proxy import DatabaseProxy
+from src.db.replicated_db import READ_METHODS
+from src.metrics import DB_CALLS_SHED, DB_CONCURRENCY_LIMIT
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """값이 작을수록 먼저 실행하고 나중에 버린다"""
+    WRITE = 0  # 쓰기와 쓰기 직전의 확인 (get_request)
+    READ = 1  # 인증, 단건 조회
+    POLL = 2  # 클라이언트가 주기적으로 다시 부르는 목록·버전 조회
+
+
+POLL_METHODS = frozenset({
+    "get_user_schedules", "get_user_received_requests", "get_data_version", "count_outbox_messages",
+})
+# 한도 없이 바로 실행하는 관리용 호출
+UNLIMITED_METHODS = frozenset({"connect", "close", "replication_lag"})
+# DB가 감당하지 못하고 있다는 신호. 지연 시간과 관계없이 한도를 줄인다
+OVERLOAD_ERRORS = (PoolTimeoutError, OperationalError, asyncio.TimeoutError)
+
+
+def method_priority(name: str) -> Priority:
+    if name in POLL_METHODS:
+        return Priority.POLL
+    if name in READ_METHODS:
+        return Priority.READ
+    return Priority.WRITE
+
+
+class AIMDLimit:
+    """지연 시간으로 조절하는 동시 실행 한도 (additive increase, multiplicative decrease).
+
+    호출이 latency_target 안에 끝나면 한도를 1/limit씩(한도만큼 호출이 끝날 때마다 1) 늘리고,
+    넘거나 과부하 오류가 나면 backoff배로 줄인다. 한 번의 혼잡에 이미 보낸 호출들이 한꺼번에 느리게 끝나도
+    계속 줄지 않도록 줄인 뒤 latency_target 동안은 다시 줄이지 않는다.
+    """
+
+    def __init__(
+        self,
+        initial: float,
+        min_limit: float,
+        max_limit: float,
+        latency_target: float,
+        backoff: float = 0.9,
+        clock=time.monotonic
+    ):
+        self.value = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self._clock = clock
+        self._hold_until = 0.0
+
+    def on_sample(self, latency: float, inflight: int, overloaded: bool = False) -> None:
+        if overloaded or latency > self.latency_target:
+            now = self._clock()
+            if now >= self._hold_until:
+                self.value = max(self.min_limit, self.value * self.backoff)
+                self._hold_until = now + self.latency_target
+        elif inflight * 2 >= self.value:
+            # 한도의 절반도 쓰지 않을 때는 한도가 충분한지 알 수 없으므로 늘리지 않는다
+            self.value = min(self.max_limit, self.value + 1 / self.value)
+        DB_CONCURRENCY_LIMIT.set(self.value)
+
+
+class ConcurrencyLimitedDatabase(DatabaseProxy):
+    """동시에 실행하는 DB 호출 수를 AIMDLimit 한도로 제한하고, 넘치는 호출은 우선순위 대기열에 둔다.
+
+    - 자리가 나면 우선순위(쓰기 > 단건 읽기 > 목록 조회)가 높은 호출부터, 같으면 먼저 온 순서로 실행한다
+    - 우선순위마다 정해진 시간까지만 기다리고, 넘으면 DatabaseOverloadedError로 바로 실패한다 (API는 503)
+    - 대기열이 max_queue를 넘으면 가장 낮은 우선순위의 나중에 온 호출을 버린다
+
+    DB가 느려지면 한도가 줄어 요청이 프로세스 안에 쌓이는 대신 빨리 거절되고, 남은 자리는 쓰기가 먼저 쓴다.
+    이벤트 루프 안에서만 사용하므로 락을 두지 않는다.
+    """
+
+    def __init__(
+        self,
+        db: AsyncDatabaseInterface,
+        limit: AIMDLimit,
+        queue_timeouts: Dict[Priority, float],
+        max_queue: int = 100,
+        clock=time.monotonic
+    ):
+        super().__init__(db)
+        self.limit = limit
+        self.queue_timeouts = queue_timeouts
+        self.max_queue = max_queue
+        self._clock = clock
+        self._inflight = 0
+        # (우선순위, 도착 순서, future). 기다리다 포기한 항목은 꺼낼 때 버린다
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._order = itertools.count()
+        DB_CONCURRENCY_LIMIT.set(limit.value)
+
+    def pool_status(self) -> Optional[dict]:
+        return {
+            **(self._db.pool_status() or {}),
+            "concurrency_limit": round(self.limit.value, 2),
+            "inflight": self._inflight,
+            "queued": sum(1 for _, _, waiter in self._waiters if not waiter.done()),
+        }
+
+    async def _call(self, name: str, *args, **kwargs):
+        if name in UNLIMITED_METHODS:
+            return await super()._call(name, *args, **kwargs)
+
+        await self._acquire(method_priority(name))
+        started = self._clock()
+        try:
+            result = await super()._call(name, *args, **kwargs)
+        except OVERLOAD_ERRORS:
+            self.limit.on_sample(self._clock() - started, self._inflight, overloaded=True)
+            raise
+        except Exception:
+            # 검증 실패·충돌 같은 오류도 DB는 응답했으므로 지연 시간만 반영한다
+            self.limit.on_sample(self._clock() - started, self._inflight)
+            raise
+        finally:
+            self._release()
+        self.limit.on_sample(self._clock() - started, self._inflight + 1)
+        return result
+
+    async def _acquire(self, priority: Priority) -> None:
+        while self._waiters and self._waiters[0][2].done():
+            heapq.heappop(self._waiters)
+        if not self._waiters and self._inflight < self.limit.value:
+            self._inflight += 1
+            return
+
+        timeout = self.queue_timeouts.get(priority, 0)
+        if timeout <= 0:
+            self._shed(priority)
+        live = [entry for entry in self._waiters if not entry[2].done()]
+        if len(live) >= self.max_queue:
+            victim = max(live, key=lambda entry: (entry[0], entry[1]))
+            if victim[0] <= priority:
+                self._shed(priority)
+            victim[2].set_exception(DatabaseOverloadedError("Database is overloaded"))
+            DB_CALLS_SHED.labels(Priority(victim[0]).name.lower()).inc()
+            self._waiters = [entry for entry in live if entry is not victim]
+            heapq.heapify(self._waiters)
+
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._order), waiter))
+        try:
+            # 자리가 나면 _release가 실행 자리를 넘겨준다 (_inflight는 넘겨주는 쪽에서 올린다)
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            self._shed(priority)
+        except asyncio.CancelledError:
+            # 자리를 넘겨받은 직후 요청이 취소되면 받은 자리를 돌려준다
+            if waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+                self._release()
+            raise
+
+    def _shed(self, priority: Priority) -> None:
+        DB_CALLS_SHED.labels(priority.name.lower()).inc()
+        raise DatabaseOverloadedError("Database is overloaded")
+
+    def _release(self) -> None:
+        self._inflight -= 1
+        # 한도가 줄었으면 넘겨주지 않고 실행 중인 호출이 한도 아래로 내려갈 때까지 기다리게 한다
+        while self._waiters and self._inflight < self.limit.value:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                self._inflight += 1
+                waiter.set_result(None)
@@ -1,34 +1,709 @@
-from typing import Dict, Optional
-from src.models import User, MeetingSchedule, MeetingRequest, APIKey, Time
-from src.db.base import DatabaseInterface
+import heapq
+import logging
+import pickle
+import threading
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from src.availability import BusyIntervals, to_naive_utc
+from src.db.base import DatabaseInterface, ScheduleConflictError
+from src.db.pagination import decode_schedule_cursor, decode_request_cursor
+from src.db.postgres_db import MEETING_REQUEST_EMAIL, generate_api_key
+from src.db.wal import WriteAheadLog, read_snapshot, write_snapshot
+from src.models import (
+    User, MeetingSchedule, MeetingRequest, APIKey, Time, OutboxMessage, OutboxStatus, RequestStatus,
+    IdempotencyRecord
+)
+
+logger = logging.getLogger(__name__)
+
+Interval = Tuple[datetime, datetime]
+
+
+# 내부 저장용 레코드. 도메인 모델(pydantic)보다 가볍고, 관계는 id로만 참조한다.
+@dataclass(slots=True)
+class UserRecord:
+    id: int
+    name: str
+    email: str
+
+
+@dataclass(slots=True)
+class APIKeyRecord:
+    key: str
+    user_id: int
+    created_at: datetime
+    is_active: bool = True
+
+
+@dataclass(slots=True)
+class ScheduleRecord:
+    id: int
+    host_id: int
+    participant_ids: Tuple[int, ...]
+    start_time: datetime
+    end_time: datetime
+    title: str
+    description: Optional[str]
+
+
+@dataclass(slots=True)
+class RequestRecord:
+    id: int
+    sender_id: int
+    receiver_email: str
+    available_times: Tuple[Interval, ...]
+    title: str
+    description: Optional[str]
+    status: str = RequestStatus.PENDING
+    selected_time: Optional[Interval] = None
+
+
+@dataclass(slots=True)
+class OutboxRecord:
+    id: int
+    kind: str
+    reference_id: int
+    recipient: str
+    next_attempt_at: datetime
+    status: str = OutboxStatus.PENDING
+    attempts: int = 0
+    last_error: Optional[str] = None
+    sent_at: Optional[datetime] = None
+
+
+@dataclass(slots=True)
+class IdempotencyEntry:
+    fingerprint: str
+    expires_at: datetime
+    status_code: Optional[int] = None
+    content_type: Optional[str] = None
+    body: Optional[bytes] = None
+
 
 class MemoryDatabase(DatabaseInterface):
+    """프로세스 메모리에 모든 데이터를 두는 구현 (부하 테스트, 단일 노드 실행용).
+
+    조회에 쓰는 보조 인덱스를 함께 유지하므로 모든 조회가 O(1) 또는 O(log n)이다.
+    ThreadPoolDatabase가 여러 스레드에서 호출하므로 하나의 RLock으로 보호한다.
+
+    상태 변경은 모두 `_commit(op, payload)`를 거쳐 `_apply_<op>`에서 일어난다.
+    payload에는 id 등 결과를 결정하는 값이 모두 들어 있어 같은 순서로 다시 적용하면
+    같은 상태가 된다 (영속화 계층이 이 지점에서 로그를 남긴다).
+    """
+
     def __init__(self):
-        self.users: Dict[int, User] = {}
-        self.schedules: Dict[int, MeetingSchedule] = {}
-        self.requests: Dict[int, MeetingRequest] = {}
-        self.api_keys: Dict[str, APIKey] = {}
-        self.next_user_id: int = 1
-        self.next_schedule_id: int = 1
-        self.next_request_id: int = 1
-        
-        # 테스트용 초기 데이터 (선택적)
-        self._init_test_data()
-    
-    def _init_test_data(self):
-        # 기존의 테스트 데이터 초기화 코드
-        self.users = {
-            1: User(id=1, name="John Doe", email="john.doe@example.com"),
-            2: User(id=2, name="Jane Smith", email="jane.smith@example.com"),
-            3: User(id=3, name="Alice Johnson", email="alice.johnson@example.com"),
-        }
-        # ... (나머지 테스트 데이터)
+        self._lock = threading.RLock()
+        self.users: Dict[int, UserRecord] = {}
+        self.api_keys: Dict[str, APIKeyRecord] = {}
+        self.schedules: Dict[int, ScheduleRecord] = {}
+        self.requests: Dict[int, RequestRecord] = {}
+        self.outbox: Dict[int, OutboxRecord] = {}
+        self.idempotency_keys: Dict[Tuple[str, str], IdempotencyEntry] = {}
+
+        # 보조 인덱스
+        self.user_id_by_email: Dict[str, int] = {}
+        self.keys_by_user: Dict[int, List[str]] = {}  # 생성 순
+        self.active_key_by_user: Dict[int, str] = {}  # 가장 먼저 만든 활성 키
+        self.schedules_by_user: Dict[int, List[Tuple[datetime, int]]] = {}  # (시작 시간, id) 정렬
+        self.longest_schedule_by_user: Dict[int, timedelta] = {}  # 바쁜 시간 조회의 탐색 하한용
+        self.busy_by_participant: Dict[int, BusyIntervals] = {}  # 겹침 검사용
+        self.request_ids_by_receiver: Dict[str, List[int]] = {}  # id 순
+        self.receivers_by_sender: Dict[int, Set[str]] = {}
+        self.pending_outbox: List[Tuple[datetime, int]] = []  # (next_attempt_at, id) 힙
+        self.data_versions: Dict[int, int] = {}  # 목록 응답의 ETag용 (Postgres 구현의 users.data_version)
+
+        self.next_user_id = 1
+        self.next_schedule_id = 1
+        self.next_request_id = 1
+        self.next_outbox_id = 1
+
+    @contextmanager
+    def _write(self):
+        """상태를 바꾸는 메서드는 이 안에서 _commit 한다. 락을 놓은 뒤 _sync()가 호출된다"""
+        with self._lock:
+            yield
+        self._sync()
+
+    def _commit(self, op: str, payload: dict) -> None:
+        """모든 상태 변경의 진입점. _write() 안에서 호출해야 한다"""
+        getattr(self, f"_apply_{op}")(**payload)
+
+    def _sync(self) -> None:
+        """커밋한 변경이 내구화될 때까지 기다리는 훅 (메모리 구현은 할 일이 없다)"""
+        pass
+
+    # 상태 변경 (payload만으로 결과가 결정되어야 한다)
+
+    def _bump_data_versions(self, user_ids: Iterable[int]) -> None:
+        for user_id in set(user_ids):
+            self.data_versions[user_id] = self.data_versions.get(user_id, 0) + 1
+
+    def _bump_by_emails(self, emails: Iterable[str]) -> None:
+        self._bump_data_versions(self.user_id_by_email[e] for e in emails if e in self.user_id_by_email)
+
+    def _bump_api_key_audience(self, user_id: int) -> None:
+        """키 목록이 바뀐 사용자가 host/participants/sender로 들어 있는 목록의 버전을 올린다"""
+        user_ids = {user_id}
+        for _, schedule_id in self.schedules_by_user.get(user_id, ()):
+            schedule = self.schedules[schedule_id]
+            user_ids.add(schedule.host_id)
+            user_ids.update(schedule.participant_ids)
+        self._bump_data_versions(user_ids)
+        self._bump_by_emails(self.receivers_by_sender.get(user_id, ()))
+
+    def _track_longest_schedule(self, user_id: int, duration: timedelta) -> None:
+        self.longest_schedule_by_user[user_id] = max(self.longest_schedule_by_user.get(user_id, timedelta(0)), duration)
+
+    def _apply_create_user(self, id: int, name: str, email: str) -> None:
+        self.users[id] = UserRecord(id=id, name=name, email=email)
+        self.user_id_by_email[email] = id
+        self.next_user_id = max(self.next_user_id, id + 1)
+
+    def _apply_create_api_key(self, key: str, user_id: int, created_at: datetime) -> None:
+        self.api_keys[key] = APIKeyRecord(key=key, user_id=user_id, created_at=created_at)
+        self.keys_by_user.setdefault(user_id, []).append(key)
+        self.active_key_by_user.setdefault(user_id, key)
+        self._bump_api_key_audience(user_id)
+
+    def _apply_deactivate_api_key(self, key: str) -> None:
+        record = self.api_keys[key]
+        record.is_active = False
+        if self.active_key_by_user.get(record.user_id) == key:
+            next_key = next(
+                (k for k in self.keys_by_user[record.user_id] if self.api_keys[k].is_active), None
+            )
+            if next_key is None:
+                del self.active_key_by_user[record.user_id]
+            else:
+                self.active_key_by_user[record.user_id] = next_key
+        self._bump_api_key_audience(record.user_id)
+
+    def _apply_create_schedule(
+        self,
+        id: int,
+        host_id: int,
+        participant_ids: List[int],
+        start_time: datetime,
+        end_time: datetime,
+        title: str,
+        description: Optional[str]
+    ) -> None:
+        self.schedules[id] = ScheduleRecord(
+            id=id, host_id=host_id, participant_ids=tuple(participant_ids),
+            start_time=start_time, end_time=end_time, title=title, description=description
+        )
+        for user_id in dict.fromkeys([host_id, *participant_ids]):
+            insort(self.schedules_by_user.setdefault(user_id, []), (start_time, id))
+            self._track_longest_schedule(user_id, end_time - start_time)
+        for user_id in participant_ids:
+            self.busy_by_participant.setdefault(user_id, BusyIntervals()).add(start_time, end_time)
+        self._bump_data_versions([host_id, *participant_ids])
+        self.next_schedule_id = max(self.next_schedule_id, id + 1)
+
+    def _apply_create_requests(self, requests: List[dict], created_at: datetime) -> None:
+        for fields in requests:
+            record = RequestRecord(
+                id=fields["id"],
+                sender_id=fields["sender_id"],
+                receiver_email=fields["receiver_email"],
+                available_times=tuple((s, e) for s, e in fields["available_times"]),
+                title=fields["title"],
+                description=fields["description"],
+                status=fields["status"],
+            )
+            self.requests[record.id] = record
+            self.request_ids_by_receiver.setdefault(record.receiver_email, []).append(record.id)
+            self.receivers_by_sender.setdefault(record.sender_id, set()).add(record.receiver_email)
+            self.next_request_id = max(self.next_request_id, record.id + 1)
+
+            # 초대 이메일 (Postgres 구현의 email_outbox와 같은 역할)
+            outbox_id = self.next_outbox_id
+            self.next_outbox_id += 1
+            self.outbox[outbox_id] = OutboxRecord(
+                id=outbox_id, kind=MEETING_REQUEST_EMAIL, reference_id=record.id,
+                recipient=record.receiver_email, next_attempt_at=created_at
+            )
+            heapq.heappush(self.pending_outbox, (created_at, outbox_id))
+        self._bump_by_emails({fields["receiver_email"] for fields in requests})
+
+    def _apply_update_request_status(self, request_id: int, status: str, selected_time: Optional[Interval]) -> None:
+        record = self.requests[request_id]
+        record.status = status
+        if selected_time is not None:
+            record.selected_time = tuple(selected_time)
+        self._bump_by_emails([record.receiver_email])
+
+    def _apply_claim_outbox(self, message_ids: List[int], next_attempt_at: datetime) -> None:
+        for message_id in message_ids:
+            record = self.outbox[message_id]
+            record.attempts += 1
+            record.next_attempt_at = next_attempt_at
+            heapq.heappush(self.pending_outbox, (next_attempt_at, message_id))
+
+    def _apply_outbox_sent(self, message_ids: List[int], sent_at: datetime) -> None:
+        for message_id in message_ids:
+            record = self.outbox[message_id]
+            record.status = OutboxStatus.SENT
+            record.sent_at = sent_at
+            record.last_error = None
+
+    def _apply_outbox_failed(self, message_id: int, error: str, retry_at: Optional[datetime]) -> None:
+        record = self.outbox[message_id]
+        record.last_error = error[:1000]
+        if retry_at is None:
+            record.status = OutboxStatus.FAILED
+        else:
+            record.next_attempt_at = retry_at
+            heapq.heappush(self.pending_outbox, (retry_at, message_id))
+
+    def _apply_reserve_idempotency_key(
+        self, scope: str, key: str, fingerprint: str, expires_at: datetime
+    ) -> None:
+        self.idempotency_keys[(scope, key)] = IdempotencyEntry(fingerprint=fingerprint, expires_at=expires_at)
+
+    def _apply_complete_idempotency_key(
+        self, scope: str, key: str, status_code: int, content_type: Optional[str], body: bytes, expires_at: datetime
+    ) -> None:
+        entry = self.idempotency_keys.get((scope, key))
+        if entry is not None:
+            entry.status_code = status_code
+            entry.content_type = content_type
+            entry.body = body
+            entry.expires_at = expires_at
+
+    def _apply_release_idempotency_key(self, scope: str, key: str) -> None:
+        entry = self.idempotency_keys.get((scope, key))
+        if entry is not None and entry.status_code is None:
+            del self.idempotency_keys[(scope, key)]
+
+    def _apply_purge_idempotency_keys(self, now: datetime) -> None:
+        expired = [k for k, entry in self.idempotency_keys.items() if entry.expires_at <= now]
+        for k in expired:
+            del self.idempotency_keys[k]
+
+    # 도메인 모델 변환 (저장할 때 검증한 값이므로 model_construct로 다시 검증하지 않는다)
+
+    def _to_api_key(self, record: APIKeyRecord) -> APIKey:
+        return APIKey.model_construct(
+            key=record.key, user_id=record.user_id, created_at=record.created_at, is_active=record.is_active
+        )
+
+    def _to_user(self, record: UserRecord) -> User:
+        return User.model_construct(
+            id=record.id,
+            name=record.name,
+            email=record.email,
+            api_keys=[self._to_api_key(self.api_keys[k]) for k in self.keys_by_user.get(record.id, ())]
+        )
+
+    def _to_time(self, interval: Interval) -> Time:
+        return Time.model_construct(start_time=interval[0], end_time=interval[1])
+
+    def _to_schedule(self, record: ScheduleRecord) -> MeetingSchedule:
+        return MeetingSchedule.model_construct(
+            id=record.id,
+            host=self._to_user(self.users[record.host_id]),
+            participants=[self._to_user(self.users[p]) for p in record.participant_ids],
+            time=Time.model_construct(start_time=record.start_time, end_time=record.end_time),
+            title=record.title,
+            description=record.description
+        )
+
+    def _to_request(self, record: RequestRecord) -> MeetingRequest:
+        return MeetingRequest.model_construct(
+            request_id=record.id,
+            sender=self._to_user(self.users[record.sender_id]),
+            receiver_email=record.receiver_email,
+            available_times=[self._to_time(t) for t in record.available_times],
+            status=RequestStatus(record.status),
+            title=record.title,
+            description=record.description,
+            selected_time=self._to_time(record.selected_time) if record.selected_time else None
+        )
 
     # DatabaseInterface 구현
+
     def get_user_by_email(self, email: str) -> Optional[User]:
-        user = next((user for user in self.users.values() if user.email == email), None)
-        if user is None:
-            raise ValueError(f"User with email {email} not found")
-        return user
-    
-    # ... (나머지 메서드 구현)
\ No newline at end of file
+        with self._lock:
+            user_id = self.user_id_by_email.get(email)
+            return self._to_user(self.users[user_id]) if user_id is not None else None
+
+    def get_users_by_emails(self, emails: List[str]) -> List[User]:
+        with self._lock:
+            return [
+                self._to_user(self.users[self.user_id_by_email[email]])
+                for email in dict.fromkeys(emails)
+                if email in self.user_id_by_email
+            ]
+
+    def create_user(self, name: str, email: str) -> User:
+        with self._write():
+            if email in self.user_id_by_email:
+                raise ValueError(f"User with email {email} already exists")
+            user_id = self.next_user_id
+            self._commit("create_user", {"id": user_id, "name": name, "email": email})
+            return self._to_user(self.users[user_id])
+
+    def get_user(self, user_id: int) -> Optional[User]:
+        with self._lock:
+            record = self.users.get(user_id)
+            return self._to_user(record) if record else None
+
+    def create_schedule(self, schedule: MeetingSchedule) -> MeetingSchedule:
+        start = to_naive_utc(schedule.time.start_time)
+        end = to_naive_utc(schedule.time.end_time)
+        with self._write():
+            if schedule.host.id not in self.users:
+                raise ValueError(f"User with id {schedule.host.id} not found")
+            participant_ids = [
+                user_id for user_id in dict.fromkeys(p.id for p in schedule.participants)
+                if user_id in self.users
+            ]
+            # Postgres 구현의 배타 제약(meeting_participants_no_double_booking)과 같은 검사
+            for user_id in participant_ids:
+                busy = self.busy_by_participant.get(user_id)
+                if busy and busy.overlapping(start, end):
+                    raise ScheduleConflictError("A participant already has a schedule at this time")
+
+            schedule_id = self.next_schedule_id
+            self._commit("create_schedule", {
+                "id": schedule_id,
+                "host_id": schedule.host.id,
+                "participant_ids": participant_ids,
+                "start_time": start,
+                "end_time": end,
+                "title": schedule.title,
+                "description": schedule.description,
+            })
+            return self._to_schedule(self.schedules[schedule_id])
+
+    def get_schedule(self, schedule_id: int) -> Optional[MeetingSchedule]:
+        with self._lock:
+            record = self.schedules.get(schedule_id)
+            return self._to_schedule(record) if record else None
+
+    def get_user_schedules(
+        self,
+        user_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> List[MeetingSchedule]:
+        after = decode_schedule_cursor(cursor) if cursor is not None else None
+        with self._lock:
+            entries = self.schedules_by_user.get(user_id, [])
+            lo = 0
+            if start is not None:
+                lo = bisect_left(entries, (to_naive_utc(start), 0))
+            if after is not None:
+                lo = max(lo, bisect_right(entries, (to_naive_utc(after[0]), after[1])))
+            hi = len(entries)
+            if end is not None:
+                hi = bisect_left(entries, (to_naive_utc(end), 0), lo)
+            if limit is not None:
+                hi = min(hi, lo + limit)
+            return [self._to_schedule(self.schedules[schedule_id]) for _, schedule_id in entries[lo:hi]]
+
+    def get_busy_times(self, user_ids: List[int], start: datetime, end: datetime) -> Dict[int, List[Time]]:
+        start, end = to_naive_utc(start), to_naive_utc(end)
+        with self._lock:
+            busy_times = {}
+            for user_id in user_ids:
+                entries = self.schedules_by_user.get(user_id, [])
+                # start - (가장 긴 스케줄 길이) 전에 시작한 스케줄은 start 전에 끝나므로 그 뒤부터 end 전까지만 본다
+                lo = bisect_left(entries, (start - self.longest_schedule_by_user.get(user_id, timedelta(0)), 0))
+                hi = bisect_left(entries, (end, 0), lo)
+                busy_times[user_id] = [
+                    Time(start_time=begin, end_time=self.schedules[schedule_id].end_time)
+                    for begin, schedule_id in entries[lo:hi]
+                    if self.schedules[schedule_id].end_time > start
+                ]
+            return busy_times
+
+    def create_request(self, request: MeetingRequest) -> MeetingRequest:
+        return self.create_requests([request])[0]
+
+    def create_requests(self, requests: List[MeetingRequest]) -> List[MeetingRequest]:
+        if not requests:
+            return []
+        with self._write():
+            for r in requests:
+                if r.sender.id not in self.users:
+                    raise ValueError(f"User with id {r.sender.id} not found")
+            first_id = self.next_request_id
+            self._commit("create_requests", {
+                "requests": [
+                    {
+                        "id": first_id + i,
+                        "sender_id": r.sender.id,
+                        "receiver_email": r.receiver_email,
+                        "available_times": [
+                            (to_naive_utc(t.start_time), to_naive_utc(t.end_time)) for t in r.available_times
+                        ],
+                        "title": r.title,
+                        "description": r.description,
+                        "status": r.status,
+                    }
+                    for i, r in enumerate(requests)
+                ],
+                "created_at": datetime.utcnow(),
+            })
+            return [self._to_request(self.requests[first_id + i]) for i in range(len(requests))]
+
+    def get_request(self, request_id: int) -> Optional[MeetingRequest]:
+        with self._lock:
+            record = self.requests.get(request_id)
+            return self._to_request(record) if record else None
+
+    def get_user_received_requests(
+        self,
+        user_email: str,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> List[MeetingRequest]:
+        after_id = decode_request_cursor(cursor) if cursor is not None else None
+        with self._lock:
+            request_ids = self.request_ids_by_receiver.get(user_email, [])
+            lo = bisect_right(request_ids, after_id) if after_id is not None else 0
+            hi = len(request_ids) if limit is None else min(len(request_ids), lo + limit)
+            return [self._to_request(self.requests[request_id]) for request_id in request_ids[lo:hi]]
+
+    def create_api_key(self, user_id: int) -> APIKey:
+        with self._write():
+            if user_id not in self.users:
+                raise ValueError(f"User with id {user_id} not found")
+            key = generate_api_key()
+            self._commit("create_api_key", {"key": key, "user_id": user_id, "created_at": datetime.utcnow()})
+            return self._to_api_key(self.api_keys[key])
+
+    def get_user_by_api_key(self, api_key: str) -> Optional[User]:
+        with self._lock:
+            record = self.api_keys.get(api_key)
+            if not record or not record.is_active:
+                return None
+            return self._to_user(self.users[record.user_id])
+
+    def deactivate_api_key(self, api_key: str) -> bool:
+        with self._write():
+            if api_key not in self.api_keys:
+                return False
+            self._commit("deactivate_api_key", {"key": api_key})
+            return True
+
+    def update_request_status(self, request_id: int, status: str, selected_time: Optional[Time] = None) -> MeetingRequest:
+        with self._write():
+            record = self.requests.get(request_id)
+            if not record:
+                raise ValueError(f"Request with id {request_id} not found")
+
+            selected = None
+            if selected_time:
+                # 선택된 시간이 가능한 시간 중 하나인지 확인
+                selected = (to_naive_utc(selected_time.start_time), to_naive_utc(selected_time.end_time))
+                if selected not in record.available_times:
+                    raise ValueError("Selected time is not in available times")
+
+            self._commit("update_request_status", {
+                "request_id": request_id, "status": status, "selected_time": selected
+            })
+            return self._to_request(record)
+
+    def get_data_version(self, user_id: int) -> int:
+        with self._lock:
+            return self.data_versions.get(user_id, 0)
+
+    def get_or_create_user_api_key(self, email: str, name: Optional[str] = None) -> Optional[Tuple[User, APIKey]]:
+        with self._lock:
+            user_id = self.user_id_by_email.get(email)
+            key = self.active_key_by_user.get(user_id) if user_id is not None else None
+            if key is not None:
+                return self._to_user(self.users[user_id]), self._to_api_key(self.api_keys[key])
+            if user_id is None and name is None:
+                return None
+
+        with self._write():
+            # 락을 다시 잡는 사이 다른 요청이 만들었을 수 있으므로 다시 확인한다
+            user_id = self.user_id_by_email.get(email)
+            if user_id is None:
+                user_id = self.next_user_id
+                self._commit("create_user", {"id": user_id, "name": name, "email": email})
+            key = self.active_key_by_user.get(user_id)
+            if key is None:
+                key = generate_api_key()
+                self._commit("create_api_key", {"key": key, "user_id": user_id, "created_at": datetime.utcnow()})
+            return self._to_user(self.users[user_id]), self._to_api_key(self.api_keys[key])
+
+    def get_active_api_key(self, user_id: int) -> Optional[APIKey]:
+        """사용자의 활성화된 API 키를 반환합니다."""
+        with self._lock:
+            key = self.active_key_by_user.get(user_id)
+            return self._to_api_key(self.api_keys[key]) if key else None
+
+    def claim_outbox_messages(self, now: datetime, limit: int, lease: timedelta) -> List[OutboxMessage]:
+        with self._write():
+            claimed: List[int] = []
+            # 힙에는 갱신 전 항목이 남아 있을 수 있으므로 현재 레코드와 맞는 것만 사용한다
+            while self.pending_outbox and len(claimed) < limit and self.pending_outbox[0][0] <= now:
+                attempt_at, message_id = heapq.heappop(self.pending_outbox)
+                record = self.outbox[message_id]
+                if (
+                    record.status == OutboxStatus.PENDING
+                    and record.next_attempt_at == attempt_at
+                    and message_id not in claimed
+                ):
+                    claimed.append(message_id)
+            if not claimed:
+                return []
+            self._commit("claim_outbox", {"message_ids": claimed, "next_attempt_at": now + lease})
+            return [
+                OutboxMessage(
+                    id=r.id, kind=r.kind, reference_id=r.reference_id, recipient=r.recipient, attempts=r.attempts
+                )
+                for r in (self.outbox[message_id] for message_id in sorted(claimed))
+            ]
+
+    def mark_outbox_sent(self, message_ids: List[int]) -> None:
+        with self._write():
+            self._commit("outbox_sent", {"message_ids": list(message_ids), "sent_at": datetime.utcnow()})
+
+    def mark_outbox_failed(self, message_id: int, error: str, retry_at: Optional[datetime]) -> None:
+        with self._write():
+            self._commit("outbox_failed", {"message_id": message_id, "error": error, "retry_at": retry_at})
+
+    def count_outbox_messages(self, status: OutboxStatus) -> int:
+        with self._lock:
+            return sum(1 for record in self.outbox.values() if record.status == status)
+
+    def reserve_idempotency_key(
+        self, scope: str, key: str, fingerprint: str, now: datetime, lease: timedelta
+    ) -> Optional[IdempotencyRecord]:
+        with self._write():
+            entry = self.idempotency_keys.get((scope, key))
+            if entry is not None and entry.expires_at > now:
+                return IdempotencyRecord(
+                    fingerprint=entry.fingerprint, status_code=entry.status_code,
+                    content_type=entry.content_type, body=entry.body
+                )
+            self._commit("reserve_idempotency_key", {
+                "scope": scope, "key": key, "fingerprint": fingerprint, "expires_at": now + lease
+            })
+            return None
+
+    def complete_idempotency_key(
+        self, scope: str, key: str, status_code: int, content_type: Optional[str], body: bytes, expires_at: datetime
+    ) -> None:
+        with self._write():
+            self._commit("complete_idempotency_key", {
+                "scope": scope, "key": key, "status_code": status_code,
+                "content_type": content_type, "body": body, "expires_at": expires_at
+            })
+
+    def release_idempotency_key(self, scope: str, key: str) -> None:
+        with self._write():
+            self._commit("release_idempotency_key", {"scope": scope, "key": key})
+
+    def purge_idempotency_keys(self, now: datetime) -> int:
+        with self._write():
+            count = sum(1 for entry in self.idempotency_keys.values() if entry.expires_at <= now)
+            if count:
+                self._commit("purge_idempotency_keys", {"now": now})
+            return count
+
+
+class DurableMemoryDatabase(MemoryDatabase):
+    """MemoryDatabase에 WAL과 스냅샷을 붙여 재시작해도 데이터가 남게 한다.
+
+    상태 변경은 적용 전에 WAL에 기록되고, 메서드는 fsync(group commit)가 끝난 뒤 반환한다.
+    조회는 MemoryDatabase와 같이 메모리에서만 처리한다.
+    WAL 레코드가 snapshot_every개 쌓이면 백그라운드에서 전체 상태를 스냅샷으로 저장하고
+    반영된 WAL을 지운다. 시작할 때는 스냅샷을 읽은 뒤 그 이후의 WAL만 다시 적용한다.
+    """
+
+    STATE_ATTRS = (
+        "users", "api_keys", "schedules", "requests", "outbox", "idempotency_keys",
+        "user_id_by_email", "keys_by_user", "active_key_by_user", "schedules_by_user", "longest_schedule_by_user",
+        "busy_by_participant", "request_ids_by_receiver", "receivers_by_sender", "pending_outbox", "data_versions",
+        "next_user_id", "next_schedule_id", "next_request_id", "next_outbox_id",
+    )
+
+    def __init__(self, data_dir: str, fsync: bool = True, snapshot_every: int = 100000):
+        super().__init__()
+        self.data_dir = data_dir
+        self.snapshot_every = snapshot_every
+        self._local = threading.local()
+        self._snapshot_lock = threading.Lock()
+        self._snapshot_guard = threading.Lock()
+        self._snapshotting = False
+
+        self.wal = WriteAheadLog(data_dir, fsync=fsync)
+        self.snapshot_seq = 0
+        self.wal.open(self._recover())
+
+    def _recover(self) -> int:
+        """스냅샷과 WAL로 상태를 복원하고 마지막 seq를 반환한다"""
+        seq = 0
+        snapshot = read_snapshot(self.data_dir)
+        if snapshot is not None:
+            seq, state = snapshot
+            # 이전 버전의 스냅샷에 없는 상태는 __init__의 빈 값으로 둔다
+            for name in self.STATE_ATTRS:
+                if name in state:
+                    setattr(self, name, state[name])
+            if "longest_schedule_by_user" not in state:
+                for schedule in self.schedules.values():
+                    for user_id in {schedule.host_id, *schedule.participant_ids}:
+                        self._track_longest_schedule(user_id, schedule.end_time - schedule.start_time)
+            self.snapshot_seq = seq
+        for seq, op, payload in self.wal.read(after_seq=seq):
+            super()._commit(op, payload)
+        return seq
+
+    def _commit(self, op: str, payload: dict) -> None:
+        self._local.seq = self.wal.append(op, payload)
+        super()._commit(op, payload)
+
+    def _sync(self) -> None:
+        self.wal.sync(getattr(self._local, "seq", 0))
+        if self.wal.written_seq - self.snapshot_seq >= self.snapshot_every:
+            self._start_snapshot()
+
+    def _start_snapshot(self) -> None:
+        with self._snapshot_guard:
+            if self._snapshotting:
+                return
+            self._snapshotting = True
+        threading.Thread(target=self._background_snapshot, name="memory-db-snapshot", daemon=True).start()
+
+    def _background_snapshot(self) -> None:
+        try:
+            self.snapshot()
+        except Exception:
+            logger.exception("Error occurred while writing memory database snapshot")
+        finally:
+            with self._snapshot_guard:
+                self._snapshotting = False
+
+    def snapshot(self) -> None:
+        """현재 상태를 스냅샷으로 저장하고 반영된 WAL 세그먼트를 지운다.
+
+        락은 상태를 직렬화하는 동안만 잡고, 파일 쓰기는 락 밖에서 한다.
+        """
+        with self._snapshot_lock:
+            with self._lock:
+                state = pickle.dumps(
+                    {name: getattr(self, name) for name in self.STATE_ATTRS}, protocol=pickle.HIGHEST_PROTOCOL
+                )
+                seq = self.wal.rotate()
+            write_snapshot(self.data_dir, seq, state)
+            self.wal.remove_segments_through(seq)
+            self.snapshot_seq = seq
+
+    def close(self) -> None:
+        # 다음 시작 때 WAL을 다시 적용하지 않도록 종료 시 스냅샷을 남긴다
+        self.snapshot()
+        self.wal.close()
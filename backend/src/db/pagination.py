@@ -0,0 +1,51 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Tuple
+
+from src.models import MeetingRequest, MeetingSchedule
+
+
+# 커서는 클라이언트에게 불투명한 문자열로 전달되는 keyset 값이다.
+def encode_cursor(*values: Any) -> str:
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def schedule_cursor(schedule: MeetingSchedule) -> str:
+    """스케줄 목록은 (시작 시간, id) 순으로 정렬된다"""
+    return encode_cursor(schedule.time.start_time.isoformat(), schedule.id)
+
+
+def decode_schedule_cursor(cursor: str) -> Tuple[datetime, int]:
+    values = decode_cursor(cursor)
+    try:
+        start_time, schedule_id = values
+        return datetime.fromisoformat(start_time), int(schedule_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+def request_cursor(request: MeetingRequest) -> str:
+    """요청 목록은 id 순으로 정렬된다"""
+    return encode_cursor(request.request_id)
+
+
+def decode_request_cursor(cursor: str) -> int:
+    values = decode_cursor(cursor)
+    try:
+        (request_id,) = values
+        return int(request_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
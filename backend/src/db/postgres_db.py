@@ -1,64 +1,537 @@
-from typing import List, Optional
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import (
+    and_, create_engine, delete, func, insert, literal_column, select, text, update, or_, tuple_, union
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.orm import sessionmaker, selectinload, joinedload, contains_eager
 import secrets
-from datetime import datetime
+from datetime import datetime, timedelta
 
-from src.db.base import DatabaseInterface
+from src.db.base import DatabaseInterface, ScheduleConflictError
 from src.db.db_model import (
-    Base, UserModel, APIKeyModel, TimeModel, 
-    MeetingScheduleModel, MeetingRequestModel
+    UserModel, APIKeyModel, TimeModel, 
+    MeetingScheduleModel, MeetingRequestModel, EmailOutboxModel, IdempotencyKeyModel, meeting_participants
+)
+from src.db.instrumentation import describe_pool, instrument_engine, timed_pool_class
+from src.db.pagination import decode_schedule_cursor, decode_request_cursor
+from src.models import (
+    User, APIKey, Time, MeetingSchedule, MeetingRequest, OutboxMessage, OutboxStatus, RequestStatus,
+    IdempotencyRecord
 )
-from src.models import User, APIKey, Time, MeetingSchedule, MeetingRequest
 
-class PostgresDatabase(DatabaseInterface):
-    def __init__(self, connection_string: str):
-        self.engine = create_engine(connection_string)
-        self.Session = sessionmaker(bind=self.engine)
-        Base.metadata.create_all(self.engine)
-    
+# 변환 헬퍼가 접근하는 관계를 미리 로드하기 위한 옵션.
+# 행마다 lazy load 하면 N+1 쿼리가 되고, 비동기 세션에서는 lazy load 자체가 불가능하다.
+USER_LOAD_OPTIONS = [selectinload(UserModel.api_keys)]
+_SCHEDULE_USER_OPTIONS = [
+    selectinload(MeetingScheduleModel.host).selectinload(UserModel.api_keys),
+    selectinload(MeetingScheduleModel.participants).selectinload(UserModel.api_keys),
+]
+SCHEDULE_LOAD_OPTIONS = _SCHEDULE_USER_OPTIONS + [joinedload(MeetingScheduleModel.time)]
+REQUEST_LOAD_OPTIONS = [
+    selectinload(MeetingRequestModel.sender).selectinload(UserModel.api_keys),
+    selectinload(MeetingRequestModel.available_times),
+    joinedload(MeetingRequestModel.selected_time),
+]
+
+
+def user_schedules_query(
+    user_id: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None
+):
+    """사용자가 호스트이거나 참가한 스케줄을 (시작 시간, id) 순으로 조회하는 쿼리"""
+    stmt = (
+        select(MeetingScheduleModel)
+        .join(MeetingScheduleModel.time)
+        .where(or_(
+            MeetingScheduleModel.host_id == user_id,
+            MeetingScheduleModel.participants.any(UserModel.id == user_id)
+        ))
+        .options(*_SCHEDULE_USER_OPTIONS, contains_eager(MeetingScheduleModel.time))
+        .order_by(TimeModel.start_time, MeetingScheduleModel.id)
+    )
+    if start is not None:
+        stmt = stmt.where(TimeModel.start_time >= start)
+    if end is not None:
+        stmt = stmt.where(TimeModel.start_time < end)
+    if cursor is not None:
+        after_start, after_id = decode_schedule_cursor(cursor)
+        stmt = stmt.where(
+            tuple_(TimeModel.start_time, MeetingScheduleModel.id) > tuple_(after_start, after_id)
+        )
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+def overlaps_window(dialect_name: str, start: datetime, end: datetime):
+    """[start, end)와 겹치는 시간 조건. Postgres에서는 0003의 times.period를 GiST 인덱스(ix_times_period)로 찾는다"""
+    if dialect_name == "postgresql":
+        return literal_column("times.period").op("&&")(func.tsrange(start, end, "[)"))
+    return and_(TimeModel.start_time < end, TimeModel.end_time > start)
+
+
+def busy_times_query(dialect_name: str, user_ids: List[int], start: datetime, end: datetime):
+    """여러 사용자가 호스트이거나 참가한 스케줄 중 [start, end)와 겹치는 것의 (user_id, 시작, 끝)을 한 번에 조회하는 쿼리"""
+    in_window = overlaps_window(dialect_name, start, end)
+    as_participant = (
+        select(meeting_participants.c.user_id, TimeModel.start_time, TimeModel.end_time)
+        .join(MeetingScheduleModel, MeetingScheduleModel.id == meeting_participants.c.meeting_id)
+        .join(TimeModel, TimeModel.id == MeetingScheduleModel.time_id)
+        .where(meeting_participants.c.user_id.in_(user_ids), in_window)
+    )
+    as_host = (
+        select(MeetingScheduleModel.host_id, TimeModel.start_time, TimeModel.end_time)
+        .join(TimeModel, TimeModel.id == MeetingScheduleModel.time_id)
+        .where(MeetingScheduleModel.host_id.in_(user_ids), in_window)
+    )
+    return union(as_participant, as_host)
+
+
+def group_busy_times(user_ids: List[int], rows) -> Dict[int, List[Time]]:
+    busy_times: Dict[int, List[Time]] = {user_id: [] for user_id in user_ids}
+    for user_id, start, end in sorted(rows, key=lambda row: row[1]):
+        busy_times[user_id].append(Time(start_time=start, end_time=end))
+    return busy_times
+
+
+def received_requests_query(user_email: str, limit: Optional[int] = None, cursor: Optional[str] = None):
+    """사용자가 받은 미팅 요청을 id 순으로 조회하는 쿼리"""
+    stmt = (
+        select(MeetingRequestModel)
+        .where(MeetingRequestModel.receiver_email == user_email)
+        .options(*REQUEST_LOAD_OPTIONS)
+        .order_by(MeetingRequestModel.id)
+    )
+    if cursor is not None:
+        stmt = stmt.where(MeetingRequestModel.id > decode_request_cursor(cursor))
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+# meeting_participants_no_double_booking 배타 제약 위반 (migrations/versions/0003_time_ranges.py)
+EXCLUSION_VIOLATION = "23P01"
+
+
+def is_schedule_conflict(error: IntegrityError) -> bool:
+    return getattr(error.orig, "pgcode", None) == EXCLUSION_VIOLATION
+
+
+def insert_requests_statement():
+    """meeting_requests 다건 insert. 여러 행을 한 번에 넣고 입력 순서대로 id를 돌려받는다"""
+    return insert(MeetingRequestModel).returning(MeetingRequestModel.id, sort_by_parameter_order=True)
+
+
+def request_rows(requests: List[MeetingRequest]) -> List[dict]:
+    return [
+        {
+            "sender_id": r.sender.id,
+            "receiver_email": r.receiver_email,
+            "title": r.title,
+            "description": r.description,
+            "status": r.status,
+        }
+        for r in requests
+    ]
+
+
+def available_time_rows(request_ids: List[int], requests: List[MeetingRequest]) -> List[dict]:
+    return [
+        {"start_time": t.start_time, "end_time": t.end_time, "meeting_request_id": request_id}
+        for request_id, r in zip(request_ids, requests)
+        for t in r.available_times
+    ]
+
+
+def created_requests(request_ids: List[int], requests: List[MeetingRequest]) -> List[MeetingRequest]:
+    """insert한 값 그대로이므로 다시 조회하지 않고 id만 채워서 반환한다"""
+    return [r.model_copy(update={"request_id": request_id}) for request_id, r in zip(request_ids, requests)]
+
+
+# email_outbox.kind. 워커가 종류별로 본문을 만든다 (src/email_worker.py)
+MEETING_REQUEST_EMAIL = "meeting_request"
+
+
+def outbox_rows(request_ids: List[int], requests: List[MeetingRequest]) -> List[dict]:
+    """요청마다 수신자에게 보낼 초대 이메일 행"""
+    now = datetime.utcnow()
+    return [
+        {
+            "kind": MEETING_REQUEST_EMAIL,
+            "reference_id": request_id,
+            "recipient": r.receiver_email,
+            "status": OutboxStatus.PENDING,
+            "next_attempt_at": now,
+        }
+        for request_id, r in zip(request_ids, requests)
+    ]
+
+
+def claim_outbox_statement(now: datetime, limit: int, lease: timedelta):
+    """발송 대상을 잠그고(FOR UPDATE SKIP LOCKED) 다음 시도 시각을 lease 뒤로 미루는 한 번의 UPDATE.
+
+    여러 워커가 동시에 실행되어도 같은 행을 가져가지 않고, 워커가 발송 도중 죽으면
+    lease가 지난 뒤 다른 워커가 다시 가져간다.
+    """
+    due = (
+        select(EmailOutboxModel.id)
+        .where(
+            EmailOutboxModel.status == OutboxStatus.PENDING,
+            EmailOutboxModel.next_attempt_at <= now
+        )
+        .order_by(EmailOutboxModel.next_attempt_at, EmailOutboxModel.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    return (
+        update(EmailOutboxModel)
+        .where(EmailOutboxModel.id.in_(due.scalar_subquery()))
+        .values(attempts=EmailOutboxModel.attempts + 1, next_attempt_at=now + lease)
+        .returning(
+            EmailOutboxModel.id, EmailOutboxModel.kind, EmailOutboxModel.reference_id,
+            EmailOutboxModel.recipient, EmailOutboxModel.attempts
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def claimed_outbox_messages(rows) -> List[OutboxMessage]:
+    return sorted(
+        (
+            OutboxMessage(id=id, kind=kind, reference_id=reference_id, recipient=recipient, attempts=attempts)
+            for id, kind, reference_id, recipient, attempts in rows
+        ),
+        key=lambda m: m.id
+    )
+
+
+def outbox_sent_statement(message_ids: List[int]):
+    return (
+        update(EmailOutboxModel)
+        .where(EmailOutboxModel.id.in_(message_ids))
+        .values(status=OutboxStatus.SENT, sent_at=datetime.utcnow(), last_error=None)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def count_outbox_statement(status: OutboxStatus):
+    return select(func.count()).select_from(EmailOutboxModel).where(EmailOutboxModel.status == status)
+
+
+def outbox_failed_statement(message_id: int, error: str, retry_at: Optional[datetime]):
+    values = {"last_error": error[:1000]}
+    if retry_at is None:
+        values["status"] = OutboxStatus.FAILED
+    else:
+        values["next_attempt_at"] = retry_at
+    return (
+        update(EmailOutboxModel)
+        .where(EmailOutboxModel.id == message_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def bump_data_versions_statement(condition):
+    """condition에 맞는 사용자의 data_version을 올린다.
+
+    스케줄·받은 요청 목록을 바꾸는 쓰기와 같은 트랜잭션에서 실행해 목록 응답의 ETag를 바꾼다.
+    행 잠금을 짧게 잡도록 커밋 직전에 실행한다.
+    """
+    return (
+        update(UserModel)
+        .where(condition)
+        .values(data_version=UserModel.data_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def api_key_audience(user_id: int):
+    """user_id의 키 목록이 들어 있는 목록 응답을 받는 사용자 조건.
+
+    목록의 host/participants/sender에는 api_keys가 함께 내려가므로 키가 바뀌면 본인뿐 아니라
+    같은 스케줄의 참가자·호스트와 이 사용자가 보낸 요청의 수신자 목록도 바뀐다.
+    """
+    schedule_ids = union(
+        select(meeting_participants.c.meeting_id).where(meeting_participants.c.user_id == user_id),
+        select(MeetingScheduleModel.id).where(MeetingScheduleModel.host_id == user_id),
+    )
+    return or_(
+        UserModel.id == user_id,
+        UserModel.id.in_(
+            select(meeting_participants.c.user_id).where(meeting_participants.c.meeting_id.in_(schedule_ids))
+        ),
+        UserModel.id.in_(select(MeetingScheduleModel.host_id).where(MeetingScheduleModel.id.in_(schedule_ids))),
+        UserModel.email.in_(select(MeetingRequestModel.receiver_email).where(MeetingRequestModel.sender_id == user_id)),
+    )
+
+
+def user_with_active_key_query(email: str):
+    """사용자와 가장 먼저 만든 활성 키를 한 번에 조회한다 (활성 키가 없으면 APIKeyModel 자리가 None)"""
+    return (
+        select(UserModel.id, UserModel.name, UserModel.email, APIKeyModel)
+        .outerjoin(APIKeyModel, and_(APIKeyModel.user_id == UserModel.id, APIKeyModel.is_active == True))
+        .where(UserModel.email == email)
+        .order_by(APIKeyModel.created_at, APIKeyModel.key)
+        .limit(1)
+    )
+
+
+def active_key_query(user_id: int):
+    """사용자의 가장 먼저 만든 활성 키 (user_with_active_key_query와 같은 순서)"""
+    return (
+        select(APIKeyModel)
+        .where(APIKeyModel.user_id == user_id, APIKeyModel.is_active == True)
+        .order_by(APIKeyModel.created_at, APIKeyModel.key)
+        .limit(1)
+    )
+
+
+def upsert_dialect(dialect_name: str):
+    """ON CONFLICT를 쓰는 insert를 만들 방언 (테스트는 sqlite에서 실행한다)"""
+    return sqlite if dialect_name == "sqlite" else postgresql
+
+
+def insert_user_statement(dialect_name: str, name: str, email: str):
+    """email이 이미 있으면 아무것도 넣지 않는다 (동시 가입이 unique 제약 오류가 되지 않는다).
+
+    충돌로 넣지 못하면 RETURNING이 비어 있고, 먼저 넣은 트랜잭션이 커밋된 뒤이므로 다시 조회하면 보인다.
+    """
+    return (
+        upsert_dialect(dialect_name).insert(UserModel)
+        .values(name=name, email=email)
+        .on_conflict_do_nothing(index_elements=[UserModel.email])
+        .returning(UserModel.id)
+    )
+
+
+def lock_user_statement(user_id: int):
+    """키 발급을 사용자별로 줄 세우기 위해 사용자 행을 트랜잭션 끝까지 잠근다 (SQLite는 FOR UPDATE 없이 실행한다)"""
+    return select(UserModel.id).where(UserModel.id == user_id).with_for_update()
+
+
+def issue_api_key_statement(user_id: int) -> tuple:
+    """(insert 문, 발급한 키). 커밋 후 다시 조회하지 않도록 값을 미리 정해서 넣는다"""
+    api_key = APIKey.model_construct(
+        key=generate_api_key(), user_id=user_id, created_at=datetime.utcnow(), is_active=True
+    )
+    return insert(APIKeyModel).values(**api_key.model_dump()), api_key
+
+
+def data_version_query(user_id: int):
+    return select(UserModel.data_version).where(UserModel.id == user_id)
+
+
+def reserve_idempotency_key_statement(
+    dialect_name: str, scope: str, key: str, fingerprint: str, now: datetime, lease: timedelta
+):
+    """키가 없거나 만료되었으면 처리 중으로 예약한다 (RETURNING이 비어 있으면 이미 있는 키다).
+
+    동시에 같은 키로 들어온 요청은 unique 제약에서 기다렸다가 먼저 넣은 쪽이 커밋한 뒤 충돌로 끝난다.
+    """
+    values = {
+        "scope": scope, "key": key, "fingerprint": fingerprint, "status_code": None,
+        "content_type": None, "body": None, "created_at": now, "expires_at": now + lease,
+    }
+    statement = upsert_dialect(dialect_name).insert(IdempotencyKeyModel).values(**values)
+    return statement.on_conflict_do_update(
+        index_elements=[IdempotencyKeyModel.scope, IdempotencyKeyModel.key],
+        set_={name: statement.excluded[name] for name in values if name not in ("scope", "key")},
+        where=IdempotencyKeyModel.expires_at <= now,
+    ).returning(IdempotencyKeyModel.key)
+
+
+def idempotency_record_query(scope: str, key: str):
+    return select(
+        IdempotencyKeyModel.fingerprint, IdempotencyKeyModel.status_code,
+        IdempotencyKeyModel.content_type, IdempotencyKeyModel.body
+    ).where(IdempotencyKeyModel.scope == scope, IdempotencyKeyModel.key == key)
+
+
+def idempotency_record(row, fingerprint: str) -> IdempotencyRecord:
+    # 예약과 조회 사이에 처리 중이던 예약이 지워졌으면 처리 중으로 보고 클라이언트가 다시 시도하게 한다
+    if row is None:
+        return IdempotencyRecord(fingerprint=fingerprint)
+    fingerprint, status_code, content_type, body = row
+    return IdempotencyRecord(fingerprint=fingerprint, status_code=status_code, content_type=content_type, body=body)
+
+
+def complete_idempotency_key_statement(
+    scope: str, key: str, status_code: int, content_type: Optional[str], body: bytes, expires_at: datetime
+):
+    return (
+        update(IdempotencyKeyModel)
+        .where(IdempotencyKeyModel.scope == scope, IdempotencyKeyModel.key == key)
+        .values(status_code=status_code, content_type=content_type, body=body, expires_at=expires_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def release_idempotency_key_statement(scope: str, key: str):
+    return (
+        delete(IdempotencyKeyModel)
+        .where(
+            IdempotencyKeyModel.scope == scope,
+            IdempotencyKeyModel.key == key,
+            IdempotencyKeyModel.status_code.is_(None)
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def purge_idempotency_keys_statement(now: datetime):
+    return (
+        delete(IdempotencyKeyModel)
+        .where(IdempotencyKeyModel.expires_at <= now)
+        .execution_options(synchronize_session=False)
+    )
+
+
+# 복제본이 primary의 WAL을 모두 반영했으면 0, 아니면 마지막으로 반영한 트랜잭션 이후 지난 시간.
+# (primary에 쓰기가 없으면 pg_last_xact_replay_timestamp가 오래되므로 LSN 비교를 먼저 한다)
+REPLICATION_LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+def engine_options(
+    connection_string: str,
+    pool_size: Optional[int] = None,
+    max_overflow: Optional[int] = None,
+    pool_timeout: Optional[float] = None,
+    pool_recycle: Optional[float] = None,
+    pool_pre_ping: bool = False,
+    statement_timeout: Optional[float] = None
+) -> dict:
+    """create_engine / create_async_engine에 넘길 풀·타임아웃 인자.
+
+    pool_timeout은 연결을 얻을 때까지 기다리는 최대 시간(초)이고, 넘기면 TimeoutError가 난다.
+    SQLite처럼 크기 제한이 없는 풀에는 크기 관련 인자를 넘기지 않는다.
+    statement_timeout(초)은 PostgreSQL 드라이버(psycopg2, asyncpg)에서만 적용된다.
+    """
+    pool_class = timed_pool_class(connection_string)
+    options = {"poolclass": pool_class, "pool_pre_ping": pool_pre_ping}
+    if pool_recycle is not None:
+        options["pool_recycle"] = pool_recycle
+    if issubclass(pool_class, QueuePool):
+        sizing = {"pool_size": pool_size, "max_overflow": max_overflow, "pool_timeout": pool_timeout}
+        options.update({key: value for key, value in sizing.items() if value is not None})
+
+    if statement_timeout:
+        milliseconds = str(int(statement_timeout * 1000))
+        driver = make_url(connection_string).get_driver_name()
+        if driver == "asyncpg":
+            options["connect_args"] = {"server_settings": {"statement_timeout": milliseconds}}
+        elif driver == "psycopg2":
+            options["connect_args"] = {"options": f"-c statement_timeout={milliseconds}"}
+    return options
+
+
+def generate_api_key() -> str:
+    return f"mcp_{secrets.token_urlsafe(32)}"
+
+
+class ModelConverterMixin:
+    """SQLAlchemy 모델을 도메인 모델로 변환 (동기/비동기 구현 공용).
+
+    DB에서 읽은 값은 타입이 이미 맞으므로 model_construct로 검증 없이 만든다.
+    EmailStr 등의 검증이 목록 응답 CPU 시간의 대부분을 차지했다.
+    """
+
+    def _convert_api_key_model(self, api_key_model: APIKeyModel) -> APIKey:
+        return APIKey.model_construct(
+            key=api_key_model.key,
+            user_id=api_key_model.user_id,
+            created_at=api_key_model.created_at,
+            is_active=api_key_model.is_active
+        )
+
     def _convert_user_model(self, user_model: UserModel) -> User:
-        return User(
+        return User.model_construct(
             id=user_model.id,
             name=user_model.name,
             email=user_model.email,
-            api_keys=[
-                APIKey(
-                    key=key.key,
-                    user_id=key.user_id,
-                    created_at=key.created_at,
-                    is_active=key.is_active
-                ) for key in user_model.api_keys
-            ]
+            api_keys=[self._convert_api_key_model(key) for key in user_model.api_keys]
         )
     
     def _convert_time_model(self, time_model: TimeModel) -> Time:
-        return Time(
+        return Time.model_construct(
             start_time=time_model.start_time,
             end_time=time_model.end_time
         )
 
+    def _convert_schedule_model(self, schedule_model: MeetingScheduleModel) -> MeetingSchedule:
+        return MeetingSchedule.model_construct(
+            id=schedule_model.id,
+            host=self._convert_user_model(schedule_model.host),
+            participants=[self._convert_user_model(p) for p in schedule_model.participants],
+            time=self._convert_time_model(schedule_model.time),
+            title=schedule_model.title,
+            description=schedule_model.description
+        )
+
+    def _convert_request_model(self, request_model: MeetingRequestModel) -> MeetingRequest:
+        return MeetingRequest.model_construct(
+            request_id=request_model.id,
+            sender=self._convert_user_model(request_model.sender),
+            receiver_email=request_model.receiver_email,
+            available_times=[self._convert_time_model(t) for t in request_model.available_times],
+            status=RequestStatus(request_model.status),
+            title=request_model.title,
+            description=request_model.description,
+            selected_time=self._convert_time_model(request_model.selected_time) if request_model.selected_time else None
+        )
+
+
+class PostgresDatabase(ModelConverterMixin, DatabaseInterface):
+    def __init__(self, connection_string: str, **options):
+        """options는 engine_options()의 인자 (pool_size, pool_timeout, statement_timeout 등)"""
+        self.engine = create_engine(connection_string, **engine_options(connection_string, **options))
+        instrument_engine(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        # 스키마는 마이그레이션(alembic upgrade head)이 관리한다
+
+    def pool_status(self) -> Optional[dict]:
+        return describe_pool(self.engine.pool)
+
+    def replication_lag(self) -> float:
+        if self.engine.dialect.name != "postgresql":
+            return 0.0
+        with self.engine.connect() as conn:
+            return float(conn.scalar(REPLICATION_LAG_QUERY))
+
     def get_user_by_email(self, email: str) -> Optional[User]:
         with self.Session() as session:
             user = session.query(UserModel).filter(UserModel.email == email).first()
             if user:
-                return User(
-                    id=user.id,
-                    name=user.name,
-                    email=user.email    
-                )
+                return User.model_construct(id=user.id, name=user.name, email=user.email)
             return None  # 사용자를 찾지 못한 경우 None 반환
     
+    def get_users_by_emails(self, emails: List[str]) -> List[User]:
+        with self.Session() as session:
+            user_models = session.query(UserModel).filter(UserModel.email.in_(emails)).all()
+            return [User.model_construct(id=u.id, name=u.name, email=u.email) for u in user_models]
+    
     def create_user(self, name: str, email: str) -> User:
         with self.Session() as session:
             user_model = UserModel(name=name, email=email)
             session.add(user_model)
             session.commit()
-            return self._convert_user_model(user_model)
+            return User.model_construct(id=user_model.id, name=user_model.name, email=user_model.email)
     
     def get_user(self, user_id: int) -> Optional[User]:
         with self.Session() as session:
-            user_model = session.query(UserModel).get(user_id)
+            user_model = session.get(UserModel, user_id, options=USER_LOAD_OPTIONS)
             return self._convert_user_model(user_model) if user_model else None
     
     def create_schedule(self, schedule: MeetingSchedule) -> MeetingSchedule:
@@ -75,56 +548,59 @@ class PostgresDatabase(DatabaseInterface):
                 time=time_model
             )
             
-            # 참가자 추가
-            for participant in schedule.participants:
-                participant_model = session.query(UserModel).get(participant.id)
-                if participant_model:
-                    schedule_model.participants.append(participant_model)
+            # 참가자 추가 (한 번의 쿼리로 조회)
+            participant_ids = [p.id for p in schedule.participants]
+            schedule_model.participants = session.query(UserModel).filter(
+                UserModel.id.in_(participant_ids)
+            ).all()
             
             session.add(schedule_model)
-            session.commit()
+            try:
+                session.flush()
+                schedule_id = schedule_model.id
+                session.execute(bump_data_versions_statement(
+                    UserModel.id.in_([schedule.host.id, *participant_ids])
+                ))
+                session.commit()
+            except IntegrityError as e:
+                # 겹침 검사는 DB의 배타 제약이 insert 시점에 원자적으로 수행한다
+                if is_schedule_conflict(e):
+                    raise ScheduleConflictError("A participant already has a schedule at this time") from e
+                raise
             
-            return MeetingSchedule(
-                id=schedule_model.id,
-                host=self._convert_user_model(schedule_model.host),
-                participants=[self._convert_user_model(p) for p in schedule_model.participants],
-                time=self._convert_time_model(schedule_model.time),
-                title=schedule_model.title,
-                description=schedule_model.description
+            # 커밋 후 만료된 관계를 하나씩 lazy load 하지 않고 한 번에 다시 로드
+            session.expunge_all()
+            return self._convert_schedule_model(
+                session.get(MeetingScheduleModel, schedule_id, options=SCHEDULE_LOAD_OPTIONS)
             )
     
     def get_schedule(self, schedule_id: int) -> Optional[MeetingSchedule]:
         with self.Session() as session:
-            schedule_model = session.query(MeetingScheduleModel).get(schedule_id)
+            schedule_model = session.get(MeetingScheduleModel, schedule_id, options=SCHEDULE_LOAD_OPTIONS)
             if not schedule_model:
                 return None
                 
-            return MeetingSchedule(
-                id=schedule_model.id,
-                host=self._convert_user_model(schedule_model.host),
-                participants=[self._convert_user_model(p) for p in schedule_model.participants],
-                time=self._convert_time_model(schedule_model.time),
-                title=schedule_model.title,
-                description=schedule_model.description
-            )
+            return self._convert_schedule_model(schedule_model)
     
-    def get_user_schedules(self, user_id: int) -> List[MeetingSchedule]:
+    def get_user_schedules(
+        self,
+        user_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> List[MeetingSchedule]:
         with self.Session() as session:
-            schedule_models = session.query(MeetingScheduleModel).filter(
-                (MeetingScheduleModel.host_id == user_id) |
-                (MeetingScheduleModel.participants.any(id=user_id))
-            ).all()
+            schedule_models = session.scalars(
+                user_schedules_query(user_id, start, end, limit, cursor)
+            ).unique().all()
             
-            return [
-                MeetingSchedule(
-                    id=sm.id,
-                    host=self._convert_user_model(sm.host),
-                    participants=[self._convert_user_model(p) for p in sm.participants],
-                    time=self._convert_time_model(sm.time),
-                    title=sm.title,
-                    description=sm.description
-                ) for sm in schedule_models
-            ]
+            return [self._convert_schedule_model(sm) for sm in schedule_models]
+    
+    def get_busy_times(self, user_ids: List[int], start: datetime, end: datetime) -> Dict[int, List[Time]]:
+        with self.Session() as session:
+            rows = session.execute(busy_times_query(self.engine.dialect.name, user_ids, start, end)).all()
+            return group_busy_times(user_ids, rows)
     
     def create_request(self, request: MeetingRequest) -> MeetingRequest:
         with self.Session() as session:
@@ -144,95 +620,85 @@ class PostgresDatabase(DatabaseInterface):
             )
             
             session.add(request_model)
+            session.flush()
+            request_id = request_model.id
+            # 초대 이메일은 요청과 같은 트랜잭션에 기록하고 워커가 발송한다
+            session.execute(insert(EmailOutboxModel), outbox_rows([request_id], [request]))
+            session.execute(bump_data_versions_statement(UserModel.email == request.receiver_email))
             session.commit()
             
-            return MeetingRequest(
-                request_id=request_model.id,
-                sender=self._convert_user_model(request_model.sender),
-                receiver_email=request_model.receiver_email,
-                available_times=[self._convert_time_model(t) for t in request_model.available_times],
-                status=request_model.status,
-                title=request_model.title,
-                description=request_model.description,
-                selected_time=self._convert_time_model(request_model.selected_time) if request_model.selected_time else None
+            # 커밋 후 만료된 관계를 하나씩 lazy load 하지 않고 한 번에 다시 로드
+            session.expunge_all()
+            return self._convert_request_model(
+                session.get(MeetingRequestModel, request_id, options=REQUEST_LOAD_OPTIONS)
             )
     
+    def create_requests(self, requests: List[MeetingRequest]) -> List[MeetingRequest]:
+        if not requests:
+            return []
+        with self.Session() as session:
+            request_ids = session.scalars(insert_requests_statement(), request_rows(requests)).all()
+            time_rows = available_time_rows(request_ids, requests)
+            if time_rows:
+                session.execute(insert(TimeModel), time_rows)
+            session.execute(insert(EmailOutboxModel), outbox_rows(request_ids, requests))
+            session.execute(bump_data_versions_statement(
+                UserModel.email.in_({r.receiver_email for r in requests})
+            ))
+            session.commit()
+        return created_requests(request_ids, requests)
+    
     def get_request(self, request_id: int) -> Optional[MeetingRequest]:
         with self.Session() as session:
-            request_model = session.query(MeetingRequestModel).get(request_id)
+            request_model = session.get(MeetingRequestModel, request_id, options=REQUEST_LOAD_OPTIONS)
             if not request_model:
                 return None
             
-            return MeetingRequest(
-                request_id=request_model.id,
-                sender=self._convert_user_model(request_model.sender),
-                receiver_email=request_model.receiver_email,
-                available_times=[self._convert_time_model(t) for t in request_model.available_times],
-                status=request_model.status,
-                title=request_model.title,
-                description=request_model.description,
-                selected_time=self._convert_time_model(request_model.selected_time) if request_model.selected_time else None
-            )
+            return self._convert_request_model(request_model)
     
-    def get_user_received_requests(self, user_email: str) -> List[MeetingRequest]:
+    def get_user_received_requests(
+        self,
+        user_email: str,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> List[MeetingRequest]:
         with self.Session() as session:
-            request_models = session.query(MeetingRequestModel).filter(
-                MeetingRequestModel.receiver_email == user_email
-            ).all()
+            request_models = session.scalars(
+                received_requests_query(user_email, limit, cursor)
+            ).unique().all()
             
-            return [
-                MeetingRequest(
-                    request_id=rm.id,
-                    sender=self._convert_user_model(rm.sender),
-                    receiver_email=rm.receiver_email,
-                    available_times=[self._convert_time_model(t) for t in rm.available_times],
-                    status=rm.status,
-                    title=rm.title,
-                    description=rm.description,
-                    selected_time=self._convert_time_model(rm.selected_time) if rm.selected_time else None
-                ) for rm in request_models
-            ]
+            return [self._convert_request_model(rm) for rm in request_models]
     
     def create_api_key(self, user_id: int) -> APIKey:
         with self.Session() as session:
-            user_model = session.query(UserModel).get(user_id)
+            user_model = session.get(UserModel, user_id)
             if not user_model:
                 raise ValueError(f"User with id {user_id} not found")
             
             api_key = APIKeyModel(
-                key=f"mcp_{secrets.token_urlsafe(32)}",
+                key=generate_api_key(),
                 user_id=user_id
             )
             
             session.add(api_key)
+            session.execute(bump_data_versions_statement(api_key_audience(user_id)))
             session.commit()
             
-            return APIKey(
-                key=api_key.key,
-                user_id=api_key.user_id,
-                created_at=api_key.created_at,
-                is_active=api_key.is_active
-            )
+            return self._convert_api_key_model(api_key)
     
     def get_user_by_api_key(self, api_key: str) -> Optional[User]:
         with self.Session() as session:
-            api_key_model = session.query(APIKeyModel).filter(
+            # 키 조회와 사용자 조회를 조인 한 번으로 처리하고 api_keys는 함께 로드
+            user_model = session.query(UserModel).join(
+                APIKeyModel, APIKeyModel.user_id == UserModel.id
+            ).filter(
                 APIKeyModel.key == api_key,
                 APIKeyModel.is_active == True
-            ).first()
-            
-            if not api_key_model:
-                return None
-            
-            # 디버깅 로그 추가
-            print(f"Found API key: {api_key_model.key}, user_id: {api_key_model.user_id}")
+            ).options(*USER_LOAD_OPTIONS).first()
             
-            user_model = session.query(UserModel).get(api_key_model.user_id)
             if not user_model:
-                print(f"User not found for user_id: {api_key_model.user_id}")
                 return None
             
-            print(f"Found user: {user_model.email} for API key: {api_key}")
             return self._convert_user_model(user_model)
     
     def deactivate_api_key(self, api_key: str) -> bool:
@@ -245,12 +711,13 @@ class PostgresDatabase(DatabaseInterface):
                 return False
                 
             api_key_model.is_active = False
+            session.execute(bump_data_versions_statement(api_key_audience(api_key_model.user_id)))
             session.commit()
             return True
     
     def update_request_status(self, request_id: int, status: str, selected_time: Optional[Time] = None) -> MeetingRequest:
         with self.Session() as session:
-            request_model = session.query(MeetingRequestModel).get(request_id)
+            request_model = session.get(MeetingRequestModel, request_id, options=REQUEST_LOAD_OPTIONS)
             if not request_model:
                 raise ValueError(f"Request with id {request_id} not found")
             
@@ -268,33 +735,108 @@ class PostgresDatabase(DatabaseInterface):
                 
                 request_model.selected_time = matching_time
                 
+            session.execute(bump_data_versions_statement(UserModel.email == request_model.receiver_email))
+            # 커밋하면 모든 속성이 만료되어 변환할 때 관계를 다시 lazy load 하므로 커밋 전에 변환한다
+            updated = self._convert_request_model(request_model)
             session.commit()
-            
-            return MeetingRequest(
-                request_id=request_model.id,
-                sender=self._convert_user_model(request_model.sender),
-                receiver_email=request_model.receiver_email,
-                available_times=[self._convert_time_model(t) for t in request_model.available_times],
-                status=request_model.status,
-                title=request_model.title,
-                description=request_model.description,
-                selected_time=self._convert_time_model(request_model.selected_time) if request_model.selected_time else None
-            )
+            return updated
+
+    def get_data_version(self, user_id: int) -> int:
+        with self.Session() as session:
+            return session.scalar(data_version_query(user_id)) or 0
+
+    def get_or_create_user_api_key(self, email: str, name: Optional[str] = None) -> Optional[Tuple[User, APIKey]]:
+        with self.Session() as session:
+            # 가입된 사용자가 활성 키를 가지고 있으면(대부분의 로그인) 이 조회 한 번으로 끝난다
+            row = session.execute(user_with_active_key_query(email)).first()
+            created = False
+            if row is None:
+                if name is None:
+                    return None
+                user_id = session.scalar(insert_user_statement(self.engine.dialect.name, name, email))
+                created = user_id is not None
+                # 동시에 가입한 다른 요청이 먼저 넣었으면 그 사용자를 쓴다
+                if created:
+                    row = (user_id, name, email, None)
+                else:
+                    row = session.execute(user_with_active_key_query(email)).one()
+
+            user_id, user_name, user_email, api_key_model = row
+            user = User.model_construct(id=user_id, name=user_name, email=user_email)
+            if api_key_model is not None:
+                return user, self._convert_api_key_model(api_key_model)
+            if not created:
+                # 활성 키가 없는 사용자가 동시에 로그인해도 키를 하나만 발급하도록 사용자 행을 잠그고,
+                # 기다리는 동안 다른 요청이 발급해 커밋했으면 그 키를 쓴다
+                session.execute(lock_user_statement(user_id))
+                api_key_model = session.scalar(active_key_query(user_id))
+                if api_key_model is not None:
+                    return user, self._convert_api_key_model(api_key_model)
+
+            statement, api_key = issue_api_key_statement(user_id)
+            session.execute(statement)
+            if not created:
+                session.execute(bump_data_versions_statement(api_key_audience(user_id)))
+            session.commit()
+            return user, api_key
 
     def get_active_api_key(self, user_id: int) -> Optional[APIKey]:
         """사용자의 활성화된 API 키를 반환합니다."""
         with self.Session() as session:
-            api_key_model = session.query(APIKeyModel).filter(
-                APIKeyModel.user_id == user_id,
-                APIKeyModel.is_active == True
-            ).first()
+            api_key_model = session.scalar(active_key_query(user_id))
             
             if not api_key_model:
                 return None
                 
-            return APIKey(
-                key=api_key_model.key,
-                user_id=api_key_model.user_id,
-                created_at=api_key_model.created_at,
-                is_active=api_key_model.is_active
-            )
\ No newline at end of file
+            return self._convert_api_key_model(api_key_model)
+
+    def claim_outbox_messages(self, now: datetime, limit: int, lease: timedelta) -> List[OutboxMessage]:
+        with self.Session() as session:
+            rows = session.execute(claim_outbox_statement(now, limit, lease)).all()
+            session.commit()
+            return claimed_outbox_messages(rows)
+
+    def mark_outbox_sent(self, message_ids: List[int]) -> None:
+        with self.Session() as session:
+            session.execute(outbox_sent_statement(message_ids))
+            session.commit()
+
+    def mark_outbox_failed(self, message_id: int, error: str, retry_at: Optional[datetime]) -> None:
+        with self.Session() as session:
+            session.execute(outbox_failed_statement(message_id, error, retry_at))
+            session.commit()
+
+    def count_outbox_messages(self, status: OutboxStatus) -> int:
+        with self.Session() as session:
+            return session.scalar(count_outbox_statement(status))
+
+    def reserve_idempotency_key(
+        self, scope: str, key: str, fingerprint: str, now: datetime, lease: timedelta
+    ) -> Optional[IdempotencyRecord]:
+        with self.Session() as session:
+            reserved = session.scalar(reserve_idempotency_key_statement(
+                self.engine.dialect.name, scope, key, fingerprint, now, lease
+            ))
+            if reserved is not None:
+                session.commit()
+                return None
+            row = session.execute(idempotency_record_query(scope, key)).first()
+            return idempotency_record(row, fingerprint)
+
+    def complete_idempotency_key(
+        self, scope: str, key: str, status_code: int, content_type: Optional[str], body: bytes, expires_at: datetime
+    ) -> None:
+        with self.Session() as session:
+            session.execute(complete_idempotency_key_statement(scope, key, status_code, content_type, body, expires_at))
+            session.commit()
+
+    def release_idempotency_key(self, scope: str, key: str) -> None:
+        with self.Session() as session:
+            session.execute(release_idempotency_key_statement(scope, key))
+            session.commit()
+
+    def purge_idempotency_keys(self, now: datetime) -> int:
+        with self.Session() as session:
+            deleted = session.execute(purge_idempotency_keys_statement(now)).rowcount
+            session.commit()
+            return deleted
@@ -0,0 +1,150 @@
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+from starlette.concurrency import run_in_threadpool
+
+from src.db.base import AsyncDatabaseInterface, DatabaseInterface
+from src.models import (
+    User, MeetingSchedule, MeetingRequest, APIKey, Time, OutboxMessage, OutboxStatus, IdempotencyRecord
+)
+
+
+class DatabaseProxy(AsyncDatabaseInterface):
+    """다른 DB 구현으로 모든 호출을 위임하는 기반 클래스.
+
+    하위 클래스는 `_call`을 재정의해서 호출 방식을 바꾸거나, 특정 메서드만 재정의해서
+    동작을 덧붙인다.
+    """
+
+    def __init__(self, db: Any):
+        self._db = db
+
+    async def _call(self, name: str, *args, **kwargs):
+        return await getattr(self._db, name)(*args, **kwargs)
+
+    async def connect(self) -> None:
+        await self._call("connect")
+
+    async def close(self) -> None:
+        await self._call("close")
+
+    def pool_status(self) -> Optional[dict]:
+        return self._db.pool_status()
+
+    async def replication_lag(self) -> float:
+        return await self._call("replication_lag")
+
+    async def get_user_by_email(self, email: str) -> Optional[User]:
+        return await self._call("get_user_by_email", email)
+
+    async def get_users_by_emails(self, emails: List[str]) -> List[User]:
+        return await self._call("get_users_by_emails", emails)
+
+    async def create_user(self, name: str, email: str) -> User:
+        return await self._call("create_user", name, email)
+
+    async def get_user(self, user_id: int) -> Optional[User]:
+        return await self._call("get_user", user_id)
+
+    async def create_schedule(self, schedule: MeetingSchedule) -> MeetingSchedule:
+        return await self._call("create_schedule", schedule)
+
+    async def get_schedule(self, schedule_id: int) -> Optional[MeetingSchedule]:
+        return await self._call("get_schedule", schedule_id)
+
+    async def get_user_schedules(
+        self,
+        user_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> List[MeetingSchedule]:
+        return await self._call("get_user_schedules", user_id, start, end, limit, cursor)
+
+    async def get_busy_times(self, user_ids: List[int], start: datetime, end: datetime) -> Dict[int, List[Time]]:
+        return await self._call("get_busy_times", user_ids, start, end)
+
+    async def create_request(self, request: MeetingRequest) -> MeetingRequest:
+        return await self._call("create_request", request)
+
+    async def create_requests(self, requests: List[MeetingRequest]) -> List[MeetingRequest]:
+        return await self._call("create_requests", requests)
+
+    async def get_request(self, request_id: int) -> Optional[MeetingRequest]:
+        return await self._call("get_request", request_id)
+
+    async def get_user_received_requests(
+        self,
+        user_email: str,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> List[MeetingRequest]:
+        return await self._call("get_user_received_requests", user_email, limit, cursor)
+
+    async def create_api_key(self, user_id: int) -> APIKey:
+        return await self._call("create_api_key", user_id)
+
+    async def get_user_by_api_key(self, api_key: str) -> Optional[User]:
+        return await self._call("get_user_by_api_key", api_key)
+
+    async def deactivate_api_key(self, api_key: str) -> bool:
+        return await self._call("deactivate_api_key", api_key)
+
+    async def update_request_status(self, request_id: int, status: str, selected_time: Optional[Time] = None) -> MeetingRequest:
+        return await self._call("update_request_status", request_id, status, selected_time)
+
+    async def get_data_version(self, user_id: int) -> int:
+        return await self._call("get_data_version", user_id)
+
+    async def get_or_create_user_api_key(self, email: str, name: Optional[str] = None) -> Optional[Tuple[User, APIKey]]:
+        return await self._call("get_or_create_user_api_key", email, name)
+
+    async def get_active_api_key(self, user_id: int) -> Optional[APIKey]:
+        return await self._call("get_active_api_key", user_id)
+
+    async def claim_outbox_messages(self, now: datetime, limit: int, lease: timedelta) -> List[OutboxMessage]:
+        return await self._call("claim_outbox_messages", now, limit, lease)
+
+    async def mark_outbox_sent(self, message_ids: List[int]) -> None:
+        return await self._call("mark_outbox_sent", message_ids)
+
+    async def mark_outbox_failed(self, message_id: int, error: str, retry_at: Optional[datetime]) -> None:
+        return await self._call("mark_outbox_failed", message_id, error, retry_at)
+
+    async def count_outbox_messages(self, status: OutboxStatus) -> int:
+        return await self._call("count_outbox_messages", status)
+
+    async def reserve_idempotency_key(
+        self, scope: str, key: str, fingerprint: str, now: datetime, lease: timedelta
+    ) -> Optional[IdempotencyRecord]:
+        return await self._call("reserve_idempotency_key", scope, key, fingerprint, now, lease)
+
+    async def complete_idempotency_key(
+        self, scope: str, key: str, status_code: int, content_type: Optional[str], body: bytes, expires_at: datetime
+    ) -> None:
+        return await self._call("complete_idempotency_key", scope, key, status_code, content_type, body, expires_at)
+
+    async def release_idempotency_key(self, scope: str, key: str) -> None:
+        return await self._call("release_idempotency_key", scope, key)
+
+    async def purge_idempotency_keys(self, now: datetime) -> int:
+        return await self._call("purge_idempotency_keys", now)
+
+
+class ThreadPoolDatabase(DatabaseProxy):
+    """동기 DatabaseInterface 구현을 스레드풀에서 실행해 이벤트 루프를 막지 않도록 감싼다."""
+
+    def __init__(self, db: DatabaseInterface):
+        super().__init__(db)
+
+    async def _call(self, name: str, *args, **kwargs):
+        return await run_in_threadpool(getattr(self._db, name), *args, **kwargs)
+
+    async def connect(self) -> None:
+        # 동기 구현은 생성 시점에 초기화가 끝난다
+        pass
+
+    async def close(self) -> None:
+        close = getattr(self._db, "close", None)
+        if close is not None:
+            await run_in_threadpool(close)
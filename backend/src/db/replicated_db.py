@@ -0,0 +1,152 @@
+import asyncio
+import contextlib
+import logging
+import time
+from contextvars import ContextVar
+from typing import List, Optional
+
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+
+from src.db.base import AsyncDatabaseInterface
+from src.db.proxy import DatabaseProxy
+from src.metrics import DB_REPLICA_LAG
+
+logger = logging.getLogger(__name__)
+
+# 복제본으로 보내는 읽기 전용 메서드
+READ_METHODS = frozenset({
+    "get_user_by_email", "get_users_by_emails", "get_user", "get_schedule", "get_user_schedules",
+    "get_busy_times", "get_user_received_requests", "get_user_by_api_key", "get_active_api_key",
+    "count_outbox_messages", "get_data_version",
+})
+# primary에서 하는 읽기. get_request는 응답 처리(상태 확인 후 갱신)에 쓰이므로 오래된 값을 읽으면 안 된다
+PRIMARY_READ_METHODS = frozenset({"get_request"})
+# 복제본에서 찾지 못하면 primary에서 다시 찾는 단건 조회 (방금 만든 사용자·키가 아직 복제되지 않았을 수 있다)
+RETRY_ON_MISS = frozenset({"get_user_by_email", "get_user", "get_schedule", "get_user_by_api_key", "get_active_api_key"})
+# 이 예외가 나면 해당 복제본을 다음 지연 확인 때까지 빼고 primary에서 다시 읽는다
+CONNECTION_ERRORS = (OperationalError, PoolTimeoutError, OSError)
+
+# 현재 요청(컨텍스트)이 쓰기를 한 뒤 primary에서 읽어야 하는 시각 (monotonic)
+_read_primary_until: ContextVar[float] = ContextVar("read_primary_until", default=0.0)
+# 현재 요청이 읽고 있는 복제본. 한 요청 안의 읽기는 같은 복제본에서 해서 시점이 뒤로 가지 않게 한다
+# (data_version을 읽은 뒤 목록을 더 뒤처진 복제본에서 읽으면 오래된 목록이 새 ETag로 캐시된다)
+_request_replica: ContextVar[Optional["Replica"]] = ContextVar("request_replica", default=None)
+
+
+class Replica:
+    __slots__ = ("name", "db", "lag", "healthy")
+
+    def __init__(self, name: str, db: AsyncDatabaseInterface):
+        self.name = name
+        self.db = db
+        self.lag: Optional[float] = None
+        self.healthy = False
+
+
+class ReplicatedDatabase(DatabaseProxy):
+    """쓰기와 일관성이 필요한 읽기는 primary로, 나머지 읽기는 복제본으로 나눠 보낸다.
+
+    - 복제본은 요청마다 라운드 로빈으로 고르고 (한 요청 안에서는 같은 복제본), 지연이 max_lag초를 넘거나 연결 오류가 난 복제본은 건너뛴다.
+      쓸 수 있는 복제본이 없으면 primary에서 읽는다.
+    - 쓰기를 한 요청은 이후 max_lag초 동안 primary에서 읽어 자신이 쓴 내용을 바로 읽는다.
+      다른 요청은 최대 max_lag초 전의 데이터를 읽을 수 있다.
+    """
+
+    def __init__(
+        self,
+        primary: AsyncDatabaseInterface,
+        replicas: List[AsyncDatabaseInterface],
+        max_lag: float = 1.0,
+        check_interval: float = 1.0,
+        clock=time.monotonic
+    ):
+        super().__init__(primary)
+        self.replicas = [Replica(f"replica-{i}", db) for i, db in enumerate(replicas)]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._clock = clock
+        self._next = 0
+        self._watcher: Optional[asyncio.Task] = None
+
+    async def connect(self) -> None:
+        await self._db.connect()
+        for replica in self.replicas:
+            await replica.db.connect()
+        await self.check_replicas()
+        self._watcher = asyncio.create_task(self._watch_replicas())
+
+    async def close(self) -> None:
+        if self._watcher is not None:
+            self._watcher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._watcher
+            self._watcher = None
+        for replica in self.replicas:
+            await replica.db.close()
+        await self._db.close()
+
+    def pool_status(self) -> Optional[dict]:
+        return {
+            **(self._db.pool_status() or {}),
+            "replicas": [
+                {"name": r.name, "healthy": r.healthy, "lag": r.lag, **(r.db.pool_status() or {})}
+                for r in self.replicas
+            ],
+        }
+
+    async def replication_lag(self) -> float:
+        return await self._db.replication_lag()
+
+    async def check_replicas(self) -> None:
+        """복제본마다 지연을 확인해 사용할 수 있는지 갱신한다"""
+        lags = await asyncio.gather(*(r.db.replication_lag() for r in self.replicas), return_exceptions=True)
+        for replica, lag in zip(self.replicas, lags):
+            if isinstance(lag, Exception):
+                if replica.healthy:
+                    logger.warning("Replica is unreachable", extra={"replica": replica.name, "error": str(lag)})
+                replica.lag, replica.healthy = None, False
+                continue
+            replica.lag, replica.healthy = lag, lag <= self.max_lag
+            DB_REPLICA_LAG.labels(replica.name).set(lag)
+
+    async def _watch_replicas(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            try:
+                await self.check_replicas()
+            except Exception:
+                logger.exception("Error occurred while checking replicas")
+
+    def _pick_replica(self) -> Optional[Replica]:
+        replica = _request_replica.get()
+        if replica is not None and replica.healthy:
+            return replica
+        healthy = [r for r in self.replicas if r.healthy]
+        if not healthy:
+            return None
+        self._next += 1
+        replica = healthy[self._next % len(healthy)]
+        _request_replica.set(replica)
+        return replica
+
+    async def _call(self, name: str, *args, **kwargs):
+        if name in PRIMARY_READ_METHODS:
+            return await super()._call(name, *args, **kwargs)
+        if name not in READ_METHODS:
+            # 쓰기 이후의 읽기는 복제가 따라올 때까지 primary에서 한다
+            _read_primary_until.set(self._clock() + self.max_lag)
+            return await super()._call(name, *args, **kwargs)
+
+        replica = None if self._clock() < _read_primary_until.get() else self._pick_replica()
+        if replica is None:
+            return await super()._call(name, *args, **kwargs)
+
+        try:
+            result = await getattr(replica.db, name)(*args, **kwargs)
+        except CONNECTION_ERRORS as e:
+            replica.healthy = False
+            logger.warning("Replica read failed, falling back to primary", extra={"replica": replica.name, "error": str(e)})
+            return await super()._call(name, *args, **kwargs)
+        if result is None and name in RETRY_ON_MISS:
+            return await super()._call(name, *args, **kwargs)
+        return result
@@ -0,0 +1,192 @@
+import mmap
+import os
+import pickle
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Iterator, Optional, Tuple
+
+# 레코드: [길이 u32][crc32 u32][pickle((seq, op, payload))]
+RECORD_HEADER = struct.Struct("<II")
+# 스냅샷: [매직 8바이트][마지막으로 반영된 seq u64][pickle(state)]
+SNAPSHOT_MAGIC = b"SCHSNAP1"
+SNAPSHOT_HEADER = struct.Struct("<8sQ")
+
+SNAPSHOT_FILE = "snapshot.bin"
+SEGMENT_PREFIX = "wal-"
+SEGMENT_SUFFIX = ".log"
+
+
+def _segment_name(first_seq: int) -> str:
+    return f"{SEGMENT_PREFIX}{first_seq:020d}{SEGMENT_SUFFIX}"
+
+
+def _fsync_dir(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _records(data: bytes) -> Iterator[Tuple[bytes, int]]:
+    """(레코드 본문, 레코드가 끝나는 위치). 길이나 체크섬이 맞지 않는 레코드에서 멈춘다"""
+    offset = 0
+    while offset + RECORD_HEADER.size <= len(data):
+        length, checksum = RECORD_HEADER.unpack_from(data, offset)
+        body = data[offset + RECORD_HEADER.size:offset + RECORD_HEADER.size + length]
+        if len(body) < length or zlib.crc32(body) != checksum:
+            # 기록 도중 종료된 경우. 이후 내용은 내구화된 적이 없다
+            return
+        offset += RECORD_HEADER.size + length
+        yield body, offset
+
+
+class WriteAheadLog:
+    """append 전용 로그. fsync는 group commit으로 묶어서 한다.
+
+    append()는 락을 잡은 쪽에서 순서대로 호출하고(기록만 하고 fsync 하지 않는다),
+    sync(seq)는 락을 놓은 뒤 호출한다. 동시에 sync를 기다리는 스레드 중 하나(리더)가
+    그때까지 기록된 모든 레코드를 한 번의 fsync로 내구화하고 나머지는 결과만 기다린다.
+
+    로그는 seq 구간별 세그먼트 파일로 나뉘며, 스냅샷을 만들 때 새 세그먼트로 넘어가고
+    스냅샷에 반영된 세그먼트는 지운다.
+    """
+
+    def __init__(self, directory: str, fsync: bool = True):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.fsync = fsync
+        self._cond = threading.Condition()
+        self._syncing = False
+        self._fd: Optional[int] = None
+        self.written_seq = 0
+        self.durable_seq = 0
+
+    def segments(self) -> list:
+        return sorted(self.directory.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}"))
+
+    def read(self, after_seq: int = 0) -> Iterator[Tuple[int, str, Any]]:
+        """after_seq 이후의 레코드를 순서대로 읽는다. 마지막에 잘린 레코드는 버린다"""
+        for segment in self.segments():
+            with open(segment, "rb") as f:
+                data = f.read()
+            for body, _ in _records(data):
+                seq, op, payload = pickle.loads(body)
+                if seq > after_seq:
+                    yield seq, op, payload
+
+    def open(self, last_seq: int) -> None:
+        """복구가 끝난 뒤 last_seq 다음부터 새 세그먼트에 기록한다.
+
+        마지막 세그먼트 끝의 잘린 레코드는 먼저 잘라낸다. 첫 레코드가 잘렸으면 같은 이름의 세그먼트
+        (last_seq + 1)에 이어 쓰게 되므로, 남겨 두면 새 레코드가 잘린 레코드 뒤에 붙어 다음 복구에서 읽히지 않는다.
+        """
+        segments = self.segments()
+        if segments:
+            self._truncate_torn(segments[-1])
+        self.written_seq = self.durable_seq = last_seq
+        self._open_segment(last_seq + 1)
+
+    def _truncate_torn(self, segment: Path) -> None:
+        with open(segment, "r+b") as f:
+            data = f.read()
+            valid = max((end for _, end in _records(data)), default=0)
+            if valid < len(data):
+                f.truncate(valid)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _open_segment(self, first_seq: int) -> None:
+        self._fd = os.open(
+            self.directory / _segment_name(first_seq), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644
+        )
+        _fsync_dir(self.directory)
+
+    def append(self, op: str, payload: Any) -> int:
+        seq = self.written_seq + 1
+        body = pickle.dumps((seq, op, payload), protocol=pickle.HIGHEST_PROTOCOL)
+        os.write(self._fd, RECORD_HEADER.pack(len(body), zlib.crc32(body)) + body)
+        self.written_seq = seq
+        return seq
+
+    def sync(self, seq: int) -> None:
+        """seq까지의 레코드가 디스크에 내구화될 때까지 기다린다"""
+        if not self.fsync:
+            return
+        with self._cond:
+            while self.durable_seq < seq:
+                if self._syncing:
+                    self._cond.wait()
+                    continue
+                self._syncing = True
+                target, fd = self.written_seq, self._fd
+                self._cond.release()
+                try:
+                    os.fsync(fd)
+                finally:
+                    self._cond.acquire()
+                    self._syncing = False
+                    self._cond.notify_all()
+                self.durable_seq = max(self.durable_seq, target)
+
+    def rotate(self) -> int:
+        """현재 세그먼트를 닫고 새 세그먼트를 연다. append와 같은 락 안에서 호출한다.
+
+        닫기 전까지 기록된 마지막 seq를 반환한다.
+        """
+        with self._cond:
+            while self._syncing:
+                self._cond.wait()
+            os.fsync(self._fd)
+            os.close(self._fd)
+            self.durable_seq = self.written_seq
+            self._cond.notify_all()
+        self._open_segment(self.written_seq + 1)
+        return self.written_seq
+
+    def remove_segments_through(self, seq: int) -> None:
+        """seq 이하의 레코드만 담은 세그먼트를 지운다 (현재 세그먼트는 남긴다)"""
+        segments = self.segments()
+        for segment, following in zip(segments, segments[1:]):
+            next_first_seq = int(following.name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+            if next_first_seq - 1 <= seq:
+                segment.unlink()
+
+    def close(self) -> None:
+        with self._cond:
+            while self._syncing:
+                self._cond.wait()
+            if self._fd is not None:
+                os.fsync(self._fd)
+                os.close(self._fd)
+                self._fd = None
+            self.durable_seq = self.written_seq
+
+
+def write_snapshot(directory: str, seq: int, state: bytes) -> None:
+    """임시 파일에 쓰고 fsync 한 뒤 rename 해서 항상 완전한 스냅샷만 보이게 한다"""
+    directory = Path(directory)
+    tmp = directory / (SNAPSHOT_FILE + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, seq))
+        f.write(state)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, directory / SNAPSHOT_FILE)
+    _fsync_dir(directory)
+
+
+def read_snapshot(directory: str) -> Optional[Tuple[int, Any]]:
+    """(seq, state)를 반환한다. 파일을 mmap으로 읽어 복사 없이 역직렬화한다"""
+    path = Path(directory) / SNAPSHOT_FILE
+    if not path.exists() or path.stat().st_size < SNAPSHOT_HEADER.size:
+        return None
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        magic, seq = SNAPSHOT_HEADER.unpack_from(data, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not a snapshot file")
+        with memoryview(data) as view:
+            state = pickle.loads(view[SNAPSHOT_HEADER.size:])
+    return seq, state
@@ -1,24 +1,24 @@
-from fastapi import BackgroundTasks
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig
+from email.message import EmailMessage
+from email.utils import formataddr, formatdate, make_msgid
+from fastapi_mail import MessageSchema, ConnectionConfig
 from typing import List
 from datetime import datetime
 from src.models import MeetingRequest, Time
 import os
 
 class EmailService:
-    def __init__(self):
-        self.conf = ConnectionConfig(
+    def __init__(self, conf: ConnectionConfig | None = None):
+        self.conf = conf or ConnectionConfig(
             MAIL_USERNAME = os.getenv("GMAIL_USERNAME"),  # Gmail 주소
             MAIL_PASSWORD = os.getenv("GMAIL_APP_PASSWORD"),  # Gmail 앱 비밀번호
             MAIL_FROM = os.getenv("GMAIL_USERNAME"),  # Gmail 주소와 동일하게
-            MAIL_PORT = 587,
-            MAIL_SERVER = "smtp.gmail.com",
+            MAIL_PORT = int(os.getenv("MAIL_PORT", "587")),
+            MAIL_SERVER = os.getenv("MAIL_SERVER", "smtp.gmail.com"),
             MAIL_FROM_NAME = "Schedulia",
             MAIL_STARTTLS = True,
             MAIL_SSL_TLS = False,
             USE_CREDENTIALS = True
         )
-        self.fastmail = FastMail(self.conf)
 
     def _format_time(self, time: Time) -> str:
         return f"{time.start_time.strftime('%Y-%m-%d %H:%M')} - {time.end_time.strftime('%H:%M')}"
@@ -26,7 +26,7 @@ class EmailService:
     def _format_available_times(self, times: List[Time]) -> str:
         return "\n".join([f"- {self._format_time(time)}" for time in times])
 
-    async def send_meeting_request_email(self, meeting_request: MeetingRequest, background_tasks: BackgroundTasks):
+    def meeting_request_message(self, meeting_request: MeetingRequest) -> MessageSchema:
         # 이메일 본문 생성
          # TODO: 실제 회원가입 URL로 변경 필요
         body = f"""
@@ -47,17 +47,22 @@ Thank you.
 Schedulia Team
 """
 
-        message = MessageSchema(
+        return MessageSchema(
             subject=f"[Schedulia]<Meeting Request> {meeting_request.title}",
             recipients=[meeting_request.receiver_email],
             body=body,
             subtype="plain"
         )
 
-        # 백그라운드에서 이메일 전송
-        background_tasks.add_task(
-            self.fastmail.send_message,
-            message
-        )
+    def build(self, message: MessageSchema) -> EmailMessage:
+        """SMTP로 보낼 수 있는 MIME 메시지로 변환한다 (fastapi-mail 내부 API에 기대지 않고 직접 만든다)"""
+        email = EmailMessage()
+        email["Subject"] = message.subject
+        email["From"] = formataddr((self.conf.MAIL_FROM_NAME, self.conf.MAIL_FROM))
+        email["To"] = ", ".join(message.recipients)
+        email["Date"] = formatdate(localtime=True)
+        email["Message-ID"] = make_msgid()
+        email.set_content(message.body, subtype=message.subtype.value)
+        return email
 
 email_service = EmailService() 
\ No newline at end of file
@@ -0,0 +1,222 @@
+"""email_outbox를 비우는 발송 워커. API 서버와 별도 프로세스로 실행한다.
+
+    python -m src.email_worker
+"""
+import asyncio
+import logging
+import signal
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+import aiosmtplib
+from fastapi_mail import ConnectionConfig
+from prometheus_client import start_http_server
+
+from src.db.base import AsyncDatabaseInterface
+from src.db.postgres_db import MEETING_REQUEST_EMAIL
+from src.email_service import EmailService
+from src.metrics import EMAIL_OUTBOX_PENDING, EMAILS_FAILED, EMAILS_SENT
+from src.models import OutboxMessage, OutboxStatus
+
+logger = logging.getLogger(__name__)
+
+
+class SMTPConnectionPool:
+    """로그인까지 끝난 SMTP 연결을 재사용한다. 동시에 최대 size개의 연결만 사용한다.
+
+    서버가 유휴 연결을 끊을 수 있으므로 max_idle초 넘게 쉰 연결은 버리고 새로 연결한다.
+    발송 중 오류가 난 연결은 상태를 알 수 없으므로 돌려놓지 않는다.
+    """
+
+    def __init__(self, conf: ConnectionConfig, size: int = 4, max_idle: float = 60.0, clock=time.monotonic):
+        self.conf = conf
+        self.max_idle = max_idle
+        self._clock = clock
+        self._semaphore = asyncio.Semaphore(size)
+        self._idle: List[Tuple[aiosmtplib.SMTP, float]] = []
+        self.connects = 0
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        smtp = aiosmtplib.SMTP(
+            hostname=self.conf.MAIL_SERVER,
+            port=self.conf.MAIL_PORT,
+            timeout=self.conf.TIMEOUT,
+            use_tls=self.conf.MAIL_SSL_TLS,
+            start_tls=self.conf.MAIL_STARTTLS,
+            validate_certs=self.conf.VALIDATE_CERTS,
+        )
+        await smtp.connect()
+        if self.conf.USE_CREDENTIALS:
+            await smtp.login(self.conf.MAIL_USERNAME, self.conf.MAIL_PASSWORD)
+        self.connects += 1
+        return smtp
+
+    async def _checkout(self) -> aiosmtplib.SMTP:
+        while self._idle:
+            smtp, idle_since = self._idle.pop()
+            if smtp.is_connected and self._clock() - idle_since < self.max_idle:
+                return smtp
+            await self._discard(smtp)
+        return await self._connect()
+
+    async def _discard(self, smtp: aiosmtplib.SMTP) -> None:
+        try:
+            if smtp.is_connected:
+                await smtp.quit()
+        except aiosmtplib.SMTPException:
+            smtp.close()
+
+    @asynccontextmanager
+    async def connection(self):
+        async with self._semaphore:
+            smtp = await self._checkout()
+            try:
+                yield smtp
+            except BaseException:
+                smtp.close()
+                raise
+            self._idle.append((smtp, self._clock()))
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for smtp, _ in idle:
+            await self._discard(smtp)
+
+
+class RateLimiter:
+    """발송 간격을 1 / rate_per_second초 이상으로 벌린다 (이벤트 루프 하나에서만 사용)"""
+
+    def __init__(self, rate_per_second: float, clock=time.monotonic):
+        self.interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self._clock = clock
+        self._next = 0.0
+
+    async def wait(self) -> None:
+        now = self._clock()
+        at = max(now, self._next)
+        self._next = at + self.interval
+        if at > now:
+            await asyncio.sleep(at - now)
+
+
+class PermanentEmailError(Exception):
+    """재시도해도 보낼 수 없는 이메일 (예: 원본 데이터가 사라짐)"""
+
+
+class OutboxWorker:
+    def __init__(
+        self,
+        db: AsyncDatabaseInterface,
+        email_service: EmailService,
+        pool: SMTPConnectionPool,
+        rate_per_second: float = 5.0,
+        batch_size: int = 50,
+        max_attempts: int = 8,
+        backoff: float = 30.0,
+        max_backoff: float = 3600.0,
+        poll_interval: float = 1.0,
+        lease: timedelta = timedelta(minutes=5)
+    ):
+        self.db = db
+        self.email_service = email_service
+        self.pool = pool
+        self.rate_limiter = RateLimiter(rate_per_second)
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.poll_interval = poll_interval
+        self.lease = lease
+
+    def retry_at(self, attempts: int, now: datetime) -> Optional[datetime]:
+        """attempts번 실패한 뒤의 다음 시도 시각. 최대 시도 횟수를 넘기면 None"""
+        if attempts >= self.max_attempts:
+            return None
+        delay = min(self.backoff * 2 ** (attempts - 1), self.max_backoff)
+        return now + timedelta(seconds=delay)
+
+    async def _render(self, message: OutboxMessage):
+        if message.kind == MEETING_REQUEST_EMAIL:
+            meeting_request = await self.db.get_request(message.reference_id)
+            if meeting_request is None:
+                raise PermanentEmailError(f"Request with id {message.reference_id} not found")
+            return self.email_service.build(self.email_service.meeting_request_message(meeting_request))
+        raise PermanentEmailError(f"Unknown email kind: {message.kind}")
+
+    async def _deliver(self, message: OutboxMessage) -> bool:
+        try:
+            email = await self._render(message)
+            async with self.pool.connection() as smtp:
+                await self.rate_limiter.wait()
+                await smtp.send_message(email)
+            EMAILS_SENT.labels(message.kind).inc()
+            return True
+        except PermanentEmailError as e:
+            EMAILS_FAILED.labels(message.kind, "permanent").inc()
+            await self.db.mark_outbox_failed(message.id, str(e), None)
+        except Exception as e:
+            retry_at = self.retry_at(message.attempts, datetime.utcnow())
+            EMAILS_FAILED.labels(message.kind, "retry" if retry_at else "permanent").inc()
+            await self.db.mark_outbox_failed(message.id, f"{type(e).__name__}: {e}", retry_at)
+        return False
+
+    async def run_once(self) -> int:
+        """발송 대상을 한 번 가져와 보내고, 가져온 개수를 반환한다"""
+        messages = await self.db.claim_outbox_messages(datetime.utcnow(), self.batch_size, self.lease)
+        if not messages:
+            return 0
+        # 동시 발송 수는 연결 풀 크기로 제한된다
+        delivered = await asyncio.gather(*(self._deliver(m) for m in messages))
+        sent = [m.id for m, ok in zip(messages, delivered) if ok]
+        if sent:
+            await self.db.mark_outbox_sent(sent)
+        return len(messages)
+
+    async def run(self, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            try:
+                claimed = await self.run_once()
+                EMAIL_OUTBOX_PENDING.set(await self.db.count_outbox_messages(OutboxStatus.PENDING))
+            except Exception:
+                logger.exception("Error occurred while draining email outbox")
+                claimed = 0
+            if claimed < self.batch_size:
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+
+async def main() -> None:
+    from config import DB_CONFIG, EMAIL_OUTBOX_CONFIG, LOGGING_CONFIG
+    from src.db.factory import DatabaseFactory
+    from src.log import configure_logging
+
+    configure_logging(**LOGGING_CONFIG)
+
+    config = dict(EMAIL_OUTBOX_CONFIG)
+    db = DatabaseFactory.create_async_database(DB_CONFIG)
+    email_service = EmailService()
+    pool = SMTPConnectionPool(email_service.conf, size=config.pop("smtp_pool_size"))
+    metrics_port = config.pop("metrics_port")
+    if metrics_port:
+        start_http_server(metrics_port)
+    worker = OutboxWorker(db, email_service, pool, **config)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    await db.connect()
+    try:
+        await worker.run(stop)
+    finally:
+        await pool.close()
+        await db.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
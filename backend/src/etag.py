@@ -0,0 +1,30 @@
+"""목록 API의 ETag / If-None-Match 처리.
+
+ETag는 사용자의 data_version과 경로·쿼리로 만든다. 목록이 바뀌는 쓰기는 같은 트랜잭션에서
+data_version을 올리므로, 버전만 읽어 보면 목록을 조회하지 않고도 바뀌었는지 알 수 있다.
+"""
+import hashlib
+from typing import Iterable, Optional, Tuple
+
+# 사용자마다 다른 응답이므로 공유 캐시에 두지 않고, 클라이언트는 매번 ETag로 다시 확인한다
+LISTING_CACHE_HEADERS = {"Cache-Control": "private, no-cache", "Vary": "X-API-Key"}
+
+
+def listing_etag(user_id: int, version: int, path: str, query: Iterable[Tuple[str, str]]) -> str:
+    """같은 사용자·버전이라도 경로와 쿼리(페이지, 기간)가 다르면 다른 ETag가 된다"""
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(f"{user_id}\0{path}".encode())
+    for key, value in sorted(query):
+        digest.update(f"\0{key}={value}".encode())
+    return f'"{version}-{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더(여러 값, 약한 비교 W/ 포함)에 etag가 들어 있는지"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
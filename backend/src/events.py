@@ -0,0 +1,266 @@
+"""사용자별 이벤트 전달 (GET /events의 Server-Sent Events).
+
+EventHub는 이 프로세스에 연결된 구독자(SSE 스트림)에게 이벤트를 나눠 주고, 워커 사이의 전달은 broker가 맡는다.
+
+- LocalBroker: 같은 프로세스 안에서만 전달한다 (단일 워커, 테스트)
+- PostgresBroker: LISTEN/NOTIFY로 모든 워커의 EventHub에 전달한다
+
+이벤트는 무엇이 바뀌었는지만 알리는 작은 메시지다. 클라이언트는 이벤트를 받으면 목록을 ETag로 다시 조회한다.
+"""
+import asyncio
+import contextlib
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+
+import asyncpg
+
+from src.metrics import EVENT_SUBSCRIBERS, EVENTS_DROPPED
+from src.models import MeetingRequest
+
+logger = logging.getLogger(__name__)
+
+REQUEST_CREATED = "request.created"
+REQUEST_UPDATED = "request.updated"
+# 연결 직후, 그리고 이벤트를 놓쳤을 수 있을 때(큐 넘침, broker 재연결) 보낸다. 받으면 목록을 다시 조회한다
+READY = "ready"
+RESYNC = "resync"
+
+# 연결이 끊기면 브라우저 EventSource가 이 시간(ms) 뒤에 다시 연결한다
+RETRY_MS = 3000
+
+
+@dataclass(frozen=True)
+class Event:
+    type: str
+    data: dict = field(default_factory=dict)
+
+    def encode(self) -> str:
+        """SSE 형식 (event/data 필드와 빈 줄)"""
+        return f"event: {self.type}\ndata: {json.dumps(self.data, separators=(',', ':'))}\n\n"
+
+
+def request_event(event_type: str, request: MeetingRequest) -> Event:
+    return Event(event_type, {"request_id": request.request_id, "status": request.status.value})
+
+
+# (받을 사용자 이메일들, 이벤트)
+Message = Tuple[List[str], Event]
+
+
+class Subscription:
+    """SSE 연결 하나의 이벤트 큐"""
+
+    def __init__(self, key: str, queue_size: int):
+        self.key = key
+        self.queue: "asyncio.Queue[Optional[Event]]" = asyncio.Queue(maxsize=queue_size)
+
+    def put(self, event: Optional[Event]) -> None:
+        """None은 스트림을 닫으라는 뜻이다"""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # 읽지 못하는 클라이언트: 쌓인 이벤트를 버리고 다시 조회하라는 이벤트 하나로 바꾼다
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(Event(RESYNC) if event is not None else None)
+            if event is not None:
+                EVENTS_DROPPED.inc()
+
+
+class EventHub:
+    def __init__(self, broker=None, queue_size: int = 100, heartbeat: float = 15.0):
+        self.broker = broker or LocalBroker()
+        self.broker.attach(self)
+        self.queue_size = queue_size
+        self.heartbeat = heartbeat
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+
+    async def start(self) -> None:
+        await self.broker.start()
+
+    async def stop(self) -> None:
+        await self.broker.stop()
+        # 열린 스트림을 끝내서 서버가 종료를 기다리지 않게 한다
+        for subscription in self._all_subscriptions():
+            subscription.put(None)
+
+    @contextlib.contextmanager
+    def subscribe(self, key: str):
+        subscription = Subscription(key, self.queue_size)
+        self._subscribers.setdefault(key, set()).add(subscription)
+        EVENT_SUBSCRIBERS.inc()
+        try:
+            yield subscription
+        finally:
+            subscribers = self._subscribers[key]
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[key]
+            EVENT_SUBSCRIBERS.dec()
+
+    def subscriber_count(self, key: Optional[str] = None) -> int:
+        if key is not None:
+            return len(self._subscribers.get(key, ()))
+        return sum(len(s) for s in self._subscribers.values())
+
+    async def publish(self, messages: Iterable[Message]) -> None:
+        """이벤트를 broker로 보낸다. 알림은 부가 기능이므로 실패해도 요청 처리는 계속한다"""
+        messages = [(list(keys), event) for keys, event in messages]
+        if not messages:
+            return
+        try:
+            await self.broker.publish(messages)
+        except Exception:
+            logger.exception("Error occurred while publishing events", extra={"messages": len(messages)})
+
+    def deliver(self, messages: Iterable[Message]) -> None:
+        """broker가 받은 메시지를 이 프로세스의 구독자에게 나눠 준다"""
+        for keys, event in messages:
+            for key in keys:
+                for subscription in self._subscribers.get(key, ()):
+                    subscription.put(event)
+
+    def resync(self) -> None:
+        """전달이 끊겼던 동안 놓친 이벤트가 있을 수 있으므로 모든 구독자에게 다시 조회하라고 알린다"""
+        for subscription in self._all_subscriptions():
+            subscription.put(Event(RESYNC))
+
+    def _all_subscriptions(self) -> List[Subscription]:
+        return [s for subscribers in self._subscribers.values() for s in subscribers]
+
+    async def stream(self, key: str) -> AsyncIterator[str]:
+        """key(사용자 이메일)의 이벤트를 SSE 텍스트로 내보낸다.
+
+        구독한 뒤에 ready를 보내므로, 클라이언트가 ready를 받고 목록을 조회하면 그 사이 이벤트를 놓치지 않는다.
+        이벤트가 없으면 heartbeat초마다 주석 줄을 보내 프록시가 연결을 끊지 않게 한다.
+        """
+        with self.subscribe(key) as subscription:
+            yield f"retry: {RETRY_MS}\n" + Event(READY).encode()
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), self.heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if event is None:
+                    return
+                yield event.encode()
+
+
+class LocalBroker:
+    """같은 프로세스의 EventHub에 바로 전달한다"""
+
+    def attach(self, hub: EventHub) -> None:
+        self._hub = hub
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def publish(self, messages: List[Message]) -> None:
+        self._hub.deliver(messages)
+
+
+# NOTIFY 페이로드 최대 크기는 8000바이트다
+NOTIFY_PAYLOAD_LIMIT = 7900
+
+
+def encode_notifications(messages: List[Message], limit: int = NOTIFY_PAYLOAD_LIMIT) -> List[str]:
+    """메시지를 NOTIFY 페이로드 크기 제한 안에서 되도록 적은 수의 JSON 배열로 묶는다"""
+    payloads, batch, size = [], [], 2
+    for keys, event in messages:
+        entry = json.dumps([keys, event.type, event.data], separators=(",", ":"))
+        if batch and size + len(entry) + 1 > limit:
+            payloads.append("[" + ",".join(batch) + "]")
+            batch, size = [], 2
+        batch.append(entry)
+        size += len(entry) + 1
+    if batch:
+        payloads.append("[" + ",".join(batch) + "]")
+    return payloads
+
+
+def decode_notification(payload: str) -> List[Message]:
+    return [(keys, Event(event_type, data)) for keys, event_type, data in json.loads(payload)]
+
+
+class PostgresBroker:
+    """LISTEN/NOTIFY로 모든 워커에 전달한다.
+
+    LISTEN 연결이 끊기면 reconnect_delay초 뒤에 다시 연결하고, 그 사이 놓친 이벤트 대신 구독자 전체에 resync를 보낸다.
+    NOTIFY는 쓰기 트랜잭션이 커밋된 뒤 별도 연결에서 보내므로, 그 사이 워커가 죽으면 이벤트가 빠질 수 있다
+    (클라이언트는 재연결할 때 ready를 받고 다시 조회한다).
+    """
+
+    def __init__(self, dsn: str, channel: str = "schedulia_events", reconnect_delay: float = 1.0):
+        self.dsn = dsn
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self._listener: Optional[asyncio.Task] = None
+        self._publisher: Optional[asyncpg.Connection] = None
+        self._publish_lock = asyncio.Lock()
+
+    def attach(self, hub: EventHub) -> None:
+        self._hub = hub
+
+    async def start(self) -> None:
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+        if self._publisher is not None:
+            await self._publisher.close()
+            self._publisher = None
+
+    async def publish(self, messages: List[Message]) -> None:
+        payloads = encode_notifications(messages)
+        async with self._publish_lock:
+            if self._publisher is None or self._publisher.is_closed():
+                self._publisher = await asyncpg.connect(self.dsn)
+            await self._publisher.executemany(
+                "SELECT pg_notify($1, $2)", [(self.channel, payload) for payload in payloads]
+            )
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        try:
+            self._hub.deliver(decode_notification(payload))
+        except Exception:
+            logger.exception("Error occurred while delivering events", extra={"channel": channel})
+
+    async def _listen(self) -> None:
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _: lost.set())
+                await connection.add_listener(self.channel, self._on_notify)
+                self._hub.resync()
+                await lost.wait()
+                logger.warning("Event listener connection lost", extra={"channel": self.channel})
+            except asyncio.CancelledError:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+                raise
+            except Exception:
+                logger.exception("Error occurred while listening for events", extra={"channel": self.channel})
+            await asyncio.sleep(self.reconnect_delay)
+
+
+def create_event_hub(config: dict, dsn: str) -> EventHub:
+    broker_type = config.get("broker", "local")
+    if broker_type == "postgres":
+        broker = PostgresBroker(dsn, channel=config.get("channel", "schedulia_events"))
+    elif broker_type == "local":
+        broker = LocalBroker()
+    else:
+        raise ValueError(f"Unsupported event broker: {broker_type}")
+    return EventHub(broker, queue_size=config.get("queue_size", 100), heartbeat=config.get("heartbeat", 15.0))
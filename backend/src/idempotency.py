@@ -0,0 +1,190 @@
+"""POST 요청의 Idempotency-Key 처리.
+
+클라이언트가 같은 Idempotency-Key로 다시 보내면 처음 응답을 저장해 두었다가 그대로 돌려준다.
+재시도할 때 요청과 초대 이메일(email_outbox)이 다시 만들어지지 않으므로, 재시도가 몰려도 쓰기와 발송이 늘지 않는다.
+
+- 키는 경로와 X-API-Key별로 따로 쓰인다 (다른 클라이언트가 같은 키를 써도 섞이지 않는다)
+- 같은 키에 다른 본문이 오면 422, 처음 요청이 아직 처리 중이면 409를 반환한다
+- 2xx 응답만 저장한다. 처리에 실패하면 예약을 지워 같은 키로 다시 시도할 수 있게 한다
+- 처리 중 예약은 lease초, 저장한 응답은 ttl초 동안 유지되고 만료된 키는 purge_expired_keys가 지운다
+"""
+import asyncio
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, Optional
+
+from src.metrics import IDEMPOTENT_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+# 저장한 응답을 다시 보낼 때 붙인다
+IDEMPOTENT_REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+
+def request_scope(path: str, api_key: str) -> str:
+    """키를 나누는 범위. API 키를 그대로 저장하지 않도록 해시한다"""
+    return hashlib.sha256(f"{path}\0{api_key}".encode()).hexdigest()
+
+
+def request_fingerprint(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+def _header(scope, name: str) -> Optional[str]:
+    name = name.lower().encode()
+    return next((value.decode("latin-1") for key, value in scope["headers"] if key == name), None)
+
+
+async def _send_json(send, status: int, detail, headers: Iterable[tuple] = ()) -> None:
+    body = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()), *headers],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class IdempotencyMiddleware:
+    """paths로 오는 POST 요청 중 Idempotency-Key 헤더가 있는 요청만 처리한다.
+
+    get_db는 호출할 때마다 현재 DB를 반환한다 (테스트에서 main.db를 바꿔 끼운다).
+    """
+
+    def __init__(
+        self,
+        app,
+        get_db: Callable,
+        paths: Iterable[str],
+        ttl: float = 86400.0,
+        lease: float = 60.0,
+        clock=datetime.utcnow
+    ):
+        self.app = app
+        self.get_db = get_db
+        self.paths = frozenset(paths)
+        self.ttl = timedelta(seconds=ttl)
+        self.lease = timedelta(seconds=lease)
+        self._clock = clock
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+        key = _header(scope, IDEMPOTENCY_KEY_HEADER)
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+        if not key or len(key) > MAX_KEY_LENGTH:
+            await _send_json(send, 400, f"{IDEMPOTENCY_KEY_HEADER} must be 1 to {MAX_KEY_LENGTH} characters")
+            return
+
+        # 본문으로 fingerprint를 만든 뒤 앱에는 읽은 본문을 그대로 다시 넘긴다
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        body = b"".join(chunks)
+
+        db = self.get_db()
+        path = scope["path"]
+        key_scope = request_scope(path, _header(scope, "X-API-Key") or "")
+        fingerprint = request_fingerprint(body)
+        try:
+            record = await db.reserve_idempotency_key(key_scope, key, fingerprint, self._clock(), self.lease)
+        except Exception:
+            # 앱의 예외 처리기보다 바깥이므로 직접 응답한다. 예약하지 못했으면 처리하지 않는다 (중복 생성 방지)
+            logger.exception("Error occurred while reserving idempotency key", extra={"path": path})
+            await _send_json(send, 503, "Database is busy, please retry", [(b"retry-after", b"1")])
+            return
+        if record is not None:
+            await self._reply(send, path, record, fingerprint)
+            return
+
+        replayed = False
+
+        async def receive_body():
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        status, content_type, response = None, None, []
+
+        async def capture(message):
+            nonlocal status, content_type
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                content_type = next(
+                    (v.decode("latin-1") for k, v in message.get("headers", []) if k.lower() == b"content-type"), None
+                )
+            elif message["type"] == "http.response.body":
+                response.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_body, capture)
+        except BaseException:
+            # 취소되어도 예약은 지운다 (지우지 못하면 lease가 지난 뒤 만료된다)
+            await asyncio.shield(self._release(db, key_scope, key))
+            raise
+
+        if status is not None and 200 <= status < 300:
+            try:
+                await db.complete_idempotency_key(
+                    key_scope, key, status, content_type, b"".join(response), self._clock() + self.ttl
+                )
+            except Exception:
+                # 응답은 이미 보냈다. 저장하지 못한 예약은 lease가 지나면 만료된다
+                logger.exception("Error occurred while storing idempotent response", extra={"path": path})
+        else:
+            await self._release(db, key_scope, key)
+
+    async def _release(self, db, key_scope: str, key: str) -> None:
+        try:
+            await db.release_idempotency_key(key_scope, key)
+        except Exception:
+            logger.exception("Error occurred while releasing idempotency key")
+
+    async def _reply(self, send, path: str, record, fingerprint: str) -> None:
+        if record.fingerprint != fingerprint:
+            IDEMPOTENT_REQUESTS.labels(path, "mismatch").inc()
+            await _send_json(send, 422, f"{IDEMPOTENCY_KEY_HEADER} was already used with a different request body")
+            return
+        if record.status_code is None:
+            IDEMPOTENT_REQUESTS.labels(path, "in_progress").inc()
+            await _send_json(
+                send, 409, "A request with this Idempotency-Key is still being processed", [(b"retry-after", b"1")]
+            )
+            return
+
+        IDEMPOTENT_REQUESTS.labels(path, "replayed").inc()
+        headers = [
+            (b"content-length", str(len(record.body)).encode()),
+            (IDEMPOTENT_REPLAYED_HEADER.lower().encode(), b"true"),
+        ]
+        if record.content_type:
+            headers.append((b"content-type", record.content_type.encode("latin-1")))
+        await send({"type": "http.response.start", "status": record.status_code, "headers": headers})
+        await send({"type": "http.response.body", "body": record.body})
+
+
+async def purge_expired_keys(get_db: Callable, interval: float) -> None:
+    """interval초마다 만료된 키를 지운다 (API 서버 lifespan에서 실행)"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            deleted = await get_db().purge_idempotency_keys(datetime.utcnow())
+            if deleted:
+                logger.info("Purged expired idempotency keys", extra={"deleted": deleted})
+        except Exception:
+            logger.exception("Error occurred while purging idempotency keys")
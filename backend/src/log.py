@@ -0,0 +1,176 @@
+"""JSON 구조화 로깅.
+
+요청 처리 코드는 로그 레코드를 큐에 넣기만 하고, JSON 변환과 stdout 쓰기는 백그라운드 스레드
+(QueueListener)가 한다. 큐가 가득 차면 기다리지 않고 버린다.
+
+    logger = logging.getLogger(__name__)
+    logger.info("API key created", extra={"user_id": user.id})
+
+extra로 넘긴 필드는 JSON의 최상위 키가 되고, 비밀 값(API 키, 비밀번호 등)은 가려서 기록한다.
+"""
+import atexit
+import json
+import logging
+import queue
+import random
+import re
+import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# 값을 통째로 가리는 필드 이름 (extra의 키)
+SECRET_FIELDS = {"api_key", "x_api_key", "password", "token", "authorization", "secret"}
+# 메시지 본문에 섞여 들어온 API 키 (generate_api_key 형식)
+API_KEY_PATTERN = re.compile(r"mcp_[A-Za-z0-9_-]{8,}")
+
+# LogRecord가 원래 가진 속성. 이 외의 속성은 extra로 넘어온 필드다
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "request_id"}
+
+
+def redact(value: str) -> str:
+    """앞 4글자만 남기고 가린다"""
+    return f"{value[:4]}***" if len(value) > 4 else "***"
+
+
+def redact_text(text: str) -> str:
+    return API_KEY_PATTERN.sub(lambda m: redact(m.group()), text)
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": redact_text(record.getMessage()),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+        for key, value in vars(record).items():
+            if key in _RECORD_ATTRS or key.startswith("_"):
+                continue
+            if key in SECRET_FIELDS and value is not None:
+                value = redact(str(value))
+            entry[key] = value
+        if record.exc_info:
+            entry["exception"] = redact_text(self.formatException(record.exc_info))
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """레벨별로 rates[level] 비율의 레코드만 통과시킨다. 지정되지 않은 레벨은 모두 남긴다"""
+
+    def __init__(self, rates: Dict[int, float], rng: random.Random = None):
+        super().__init__()
+        self.rates = rates
+        self._random = (rng or random.Random()).random
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = self.rates.get(record.levelno)
+        return rate is None or self._random() < rate
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """호출한 스레드에서는 요청 ID만 붙여 큐에 넣는다. 큐가 가득 차면 레코드를 버린다"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 기본 구현은 여기서 포맷까지 하므로, 포맷은 리스너 스레드로 미루고 컨텍스트 값만 옮긴다
+        record.request_id = request_id_var.get()
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener: Optional[QueueListener] = None
+
+
+def configure_logging(
+    level: str = "INFO",
+    sample_rates: Optional[Dict[str, float]] = None,
+    queue_size: int = 10000,
+    stream=None
+) -> NonBlockingQueueHandler:
+    """루트 로거가 큐를 거쳐 stdout에 JSON 한 줄씩 쓰도록 설정한다. 다시 호출하면 설정을 바꾼다"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter())
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=queue_size))
+    handler.addFilter(SamplingFilter({
+        logging.getLevelName(name.upper()): rate for name, rate in (sample_rates or {}).items()
+    }))
+
+    root = logging.getLogger()
+    for existing in [h for h in root.handlers if isinstance(h, NonBlockingQueueHandler)]:
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level.upper())
+
+    _listener = QueueListener(handler.queue, output, respect_handler_level=False)
+    _listener.start()
+    return handler
+
+
+@atexit.register
+def flush_logging() -> None:
+    """큐에 남은 레코드를 모두 쓰고 리스너 스레드를 멈춘다"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def parse_sample_rates(value: str) -> Dict[str, float]:
+    """"DEBUG=0.01,INFO=0.5" 형식"""
+    rates = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        name, rate = item.split("=")
+        rates[name.strip().upper()] = float(rate)
+    return rates
+
+
+class RequestIdMiddleware:
+    """요청마다 X-Request-ID(없으면 새로 만든 값)를 로그 컨텍스트에 두고 응답 헤더로 돌려준다"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        header = REQUEST_ID_HEADER.lower().encode()
+        request_id = next(
+            (value.decode("latin-1")[:128] for name, value in scope["headers"] if name == header),
+            None
+        ) or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), (header, request_id.encode("latin-1"))]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
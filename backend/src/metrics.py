@@ -0,0 +1,107 @@
+"""Prometheus 메트릭.
+
+API 서버는 /metrics로, 발송 워커는 EMAIL_WORKER_METRICS_PORT의 별도 HTTP 서버로 노출한다.
+uvicorn 워커를 여러 개 띄울 때는 PROMETHEUS_MULTIPROC_DIR을 지정하면 프로세스별 값을 합쳐서 보여준다.
+"""
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+)
+from prometheus_client.multiprocess import MultiProcessCollector
+from starlette.routing import Match
+
+# DB 대기·쿼리는 ms 단위가 대부분이라 HTTP보다 작은 구간부터 나눈다
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "route", "status"]
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests currently being handled", ["method", "route"],
+    multiprocess_mode="livesum"
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a connection from the pool", buckets=DB_BUCKETS
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "SQL statement execution time", buckets=DB_BUCKETS
+)
+DB_REPLICA_LAG = Gauge(
+    "db_replica_lag_seconds", "Replication lag of each read replica", ["replica"], multiprocess_mode="max"
+)
+DB_CONCURRENCY_LIMIT = Gauge(
+    "db_concurrency_limit", "Adaptive limit of concurrent database calls", multiprocess_mode="livesum"
+)
+# 한도와 대기열이 가득 차 바로 거절한 DB 호출. priority: write, read, poll
+DB_CALLS_SHED = Counter("db_calls_shed_total", "Database calls rejected by the concurrency limiter", ["priority"])
+EMAILS_QUEUED = Counter("emails_queued_total", "Emails written to the outbox", ["kind"])
+EMAILS_SENT = Counter("emails_sent_total", "Emails delivered to the SMTP server", ["kind"])
+# reason: retry(다시 시도함), permanent(포기함)
+EMAILS_FAILED = Counter("emails_failed_total", "Failed email delivery attempts", ["kind", "reason"])
+EMAIL_OUTBOX_PENDING = Gauge(
+    "email_outbox_pending", "Emails waiting in the outbox", multiprocess_mode="mostrecent"
+)
+EVENT_SUBSCRIBERS = Gauge(
+    "event_subscribers", "Open /events streams", multiprocess_mode="livesum"
+)
+# 느린 구독자의 큐가 넘쳐서 쌓인 이벤트를 버리고 resync로 바꾼 횟수
+EVENTS_DROPPED = Counter("events_dropped_total", "Event queues that overflowed and were replaced by a resync")
+# API 키별 요청 수 제한(src/rate_limit.py)에 걸려 429를 반환한 요청
+RATE_LIMITED = Counter("rate_limited_requests_total", "Requests rejected by the per-API-key rate limit", ["route"])
+# Idempotency-Key로 처리하지 않고 바로 응답한 요청. outcome: replayed(저장한 응답), in_progress(409), mismatch(422)
+IDEMPOTENT_REQUESTS = Counter(
+    "idempotent_requests_total", "Requests answered from an Idempotency-Key record", ["path", "outcome"]
+)
+
+# 라우트에 매칭되지 않은 요청(404 등)은 경로 대신 이 값으로 묶어 레이블 수가 늘어나지 않게 한다
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def render_metrics() -> tuple:
+    """(본문, content-type)"""
+    registry = REGISTRY
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def route_template(scope) -> str:
+    """/users/{user_id}/api-keys 처럼 경로 파라미터를 치환하기 전의 라우트 경로"""
+    for route in scope["app"].routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", UNMATCHED_ROUTE)
+    return UNMATCHED_ROUTE
+
+
+class PrometheusMiddleware:
+    """라우트별 처리 시간 히스토그램과 처리 중인 요청 수를 기록하는 ASGI 미들웨어"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method, route = scope["method"], route_template(scope)
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method, route)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUEST_DURATION.labels(method, route, str(status)).observe(time.perf_counter() - started)
+            in_progress.dec()
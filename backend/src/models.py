@@ -43,4 +43,23 @@ class MeetingRequest(BaseModel):
     status: RequestStatus = RequestStatus.PENDING
     title: str
     description: str | None = None
-    selected_time: Time | None = None  # 수락된 경우 선택된 시간 
\ No newline at end of file
+    selected_time: Time | None = None  # 수락된 경우 선택된 시간 
+
+class OutboxStatus(str, Enum):
+    PENDING = "PENDING"
+    SENT = "SENT"
+    FAILED = "FAILED"  # 최대 재시도 횟수를 넘겨 더 이상 보내지 않음
+
+class OutboxMessage(BaseModel):
+    id: int
+    kind: str
+    reference_id: int
+    recipient: str
+    attempts: int = 0  # 이번 시도를 포함한 시도 횟수
+
+class IdempotencyRecord(BaseModel):
+    """Idempotency-Key로 저장한 요청과 응답"""
+    fingerprint: str  # 요청 본문 해시. 같은 키에 다른 본문이 오면 거절한다
+    status_code: int | None = None  # None이면 처음 요청이 아직 처리 중
+    content_type: str | None = None
+    body: bytes | None = None
@@ -0,0 +1,191 @@
+"""API 키별 요청 수 제한 (토큰 버킷).
+
+키마다 burst개의 토큰을 가진 버킷이 있고 초당 rate개씩 다시 채워진다. 요청마다 토큰 하나를 쓰고,
+남은 토큰이 없으면 다음 토큰이 채워질 때까지의 시간을 Retry-After로 429를 반환한다.
+라우트마다 따로 제한을 둘 수 있고, 따로 정하지 않은 라우트는 키별 기본 버킷 하나를 함께 쓴다.
+
+- LocalBucketStore: 워커 프로세스 메모리. 워커마다 따로 세므로 워커 N개면 키당 최대 N배까지 허용된다
+- PostgresBucketStore: 모든 워커가 UNLOGGED 테이블의 버킷을 함께 쓴다 (요청마다 UPSERT 한 번)
+"""
+import asyncio
+import contextlib
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+import asyncpg
+
+from src.metrics import RATE_LIMITED
+
+logger = logging.getLogger(__name__)
+
+# 라우트별 제한이 없는 라우트가 함께 쓰는 버킷 이름
+DEFAULT_BUCKET = "*"
+
+
+@dataclass(frozen=True)
+class Limit:
+    rate: float  # 초당 채워지는 토큰 수
+    burst: float  # 버킷 크기 (쉬었다가 한 번에 보낼 수 있는 요청 수)
+
+
+def parse_limit(value: str) -> Optional[Limit]:
+    """"5:20" → Limit(rate=5, burst=20). "0"이나 빈 값은 제한하지 않는다는 뜻이다"""
+    value = value.strip()
+    if not value or value == "0":
+        return None
+    rate, _, burst = value.partition(":")
+    rate = float(rate)
+    burst = float(burst) if burst else max(rate, 1.0)
+    if rate <= 0 or burst < 1:
+        raise ValueError(f"Invalid rate limit: {value}")
+    return Limit(rate=rate, burst=burst)
+
+
+def parse_route_limits(value: str) -> Dict[str, Optional[Limit]]:
+    """"GET /requests/=5:20,POST /requests/bulk=0.5:2" → {"GET /requests/": Limit(5, 20), ...}"""
+    limits = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        route, _, limit = item.rpartition("=")
+        limits[" ".join(route.split())] = parse_limit(limit)
+    return limits
+
+
+class LocalBucketStore:
+    """프로세스 메모리의 버킷. 이벤트 루프 안에서만 사용하므로 락 없이 갱신한다.
+
+    오래 쓰지 않은 키부터 max_keys개를 넘는 버킷을 버린다 (버린 키는 다시 가득 찬 버킷으로 시작한다).
+    """
+
+    def __init__(self, max_keys: int = 100000, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max_keys
+        self._clock = clock
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()  # key -> [토큰, 마지막 갱신 시각]
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def take(self, key: str, limit: Limit) -> float:
+        """토큰 하나를 쓴다. 허용하면 0, 아니면 다음 토큰까지 남은 초"""
+        now = self._clock()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [limit.burst, now]
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(limit.burst, bucket[0] + (now - bucket[1]) * limit.rate)
+            bucket[1] = now
+
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0.0
+        return (1 - bucket[0]) / limit.rate
+
+
+# 지난 시간만큼 채운 토큰 수 (SET의 식은 모두 갱신 전 행을 본다)
+_REFILLED = "LEAST($3::float8, b.tokens + EXTRACT(EPOCH FROM now() - b.updated_at)::float8 * $2::float8)"
+# 채운 토큰으로 하나를 쓸 수 있으면 쓴다. 거절한 요청은 토큰을 쓰지 않는다
+TAKE_TOKEN_SQL = f"""
+    INSERT INTO rate_limit_buckets AS b (key, tokens, allowed, updated_at)
+    VALUES ($1, $3::float8 - 1, true, now())
+    ON CONFLICT (key) DO UPDATE SET
+        tokens = {_REFILLED} - CASE WHEN {_REFILLED} >= 1 THEN 1 ELSE 0 END,
+        allowed = {_REFILLED} >= 1,
+        updated_at = now()
+    RETURNING allowed, tokens
+"""
+# 오래 쓰지 않은 버킷은 이미 가득 찼으므로 지워도 결과가 같다
+PURGE_BUCKETS_SQL = "DELETE FROM rate_limit_buckets WHERE updated_at < now() - make_interval(secs => $1)"
+
+
+class PostgresBucketStore:
+    """모든 워커가 공유하는 버킷 (0007_rate_limit_buckets의 UNLOGGED 테이블).
+
+    애플리케이션 DB 풀과 따로 작은 asyncpg 풀을 쓴다. 저장소에 접근하지 못하면 요청을 막지 않고 허용한다.
+    """
+
+    def __init__(self, dsn: str, pool_size: int = 2, idle_ttl: float = 3600.0):
+        self.dsn = dsn
+        self.pool_size = pool_size
+        self.idle_ttl = idle_ttl
+        self._pool: Optional[asyncpg.Pool] = None
+        self._purger: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._pool = await asyncpg.create_pool(self.dsn, min_size=1, max_size=self.pool_size)
+        self._purger = asyncio.create_task(self._purge())
+
+    async def stop(self) -> None:
+        if self._purger is not None:
+            self._purger.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._purger
+            self._purger = None
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    async def take(self, key: str, limit: Limit) -> float:
+        # API 키를 그대로 저장하지 않는다
+        digest = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+        try:
+            allowed, tokens = await self._pool.fetchrow(TAKE_TOKEN_SQL, digest, limit.rate, limit.burst)
+        except Exception:
+            logger.exception("Error occurred while checking rate limit")
+            return 0.0
+        return 0.0 if allowed else (1 - tokens) / limit.rate
+
+    async def _purge(self) -> None:
+        while True:
+            await asyncio.sleep(self.idle_ttl)
+            try:
+                await self._pool.execute(PURGE_BUCKETS_SQL, self.idle_ttl)
+            except Exception:
+                logger.exception("Error occurred while purging rate limit buckets")
+
+
+class RateLimiter:
+    def __init__(self, store, default: Optional[Limit], routes: Optional[Dict[str, Optional[Limit]]] = None):
+        self.store = store
+        self.default = default
+        self.routes = routes or {}
+
+    async def start(self) -> None:
+        await self.store.start()
+
+    async def stop(self) -> None:
+        await self.store.stop()
+
+    async def check(self, api_key: str, route: str) -> float:
+        """route("GET /requests/")에 대한 api_key의 요청을 허용하면 0, 아니면 Retry-After(초)"""
+        if route in self.routes:
+            limit, bucket = self.routes[route], route
+        else:
+            limit, bucket = self.default, DEFAULT_BUCKET
+        if limit is None:
+            return 0.0
+        retry_after = await self.store.take(f"{api_key}\0{bucket}", limit)
+        if retry_after:
+            RATE_LIMITED.labels(route).inc()
+        return retry_after
+
+
+def create_rate_limiter(config: dict, dsn: str) -> RateLimiter:
+    store_type = config.get("store", "local")
+    if store_type == "postgres":
+        store = PostgresBucketStore(dsn)
+    elif store_type == "local":
+        store = LocalBucketStore(max_keys=config.get("max_keys", 100000))
+    else:
+        raise ValueError(f"Unsupported rate limit store: {store_type}")
+    return RateLimiter(store, default=config.get("default"), routes=config.get("routes"))
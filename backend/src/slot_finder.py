@@ -0,0 +1,100 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+
+Interval = Tuple[datetime, datetime]
+
+
+@dataclass
+class SlotCandidate:
+    start_time: datetime
+    end_time: datetime
+    available: int
+    unavailable: List[int]  # 참석할 수 없는 참가자 인덱스
+
+
+def rasterize(
+    busy_by_participant: Sequence[Sequence[Interval]],
+    start: datetime,
+    granularity: timedelta,
+    n_slots: int
+) -> np.ndarray:
+    """참가자별 바쁜 구간을 (참가자 수 x 슬롯 수) boolean 타임라인으로 변환한다.
+
+    구간 경계를 슬롯 인덱스로 바꾼 뒤 차분 배열에 +1/-1을 찍고 누적합을 구하므로
+    참가자/구간 수와 무관하게 파이썬 루프 없이 한 번에 처리된다.
+    조금이라도 걸치는 슬롯은 바쁜 것으로 본다.
+    """
+    rows = np.repeat(
+        np.arange(len(busy_by_participant)),
+        [len(intervals) for intervals in busy_by_participant]
+    )
+    flat = [interval for intervals in busy_by_participant for interval in intervals]
+    diff = np.zeros((len(busy_by_participant), n_slots + 1), dtype=np.int32)
+    if flat:
+        origin = np.datetime64(start, "us")
+        step = np.timedelta64(granularity, "us")
+        starts = np.array([s for s, _ in flat], dtype="datetime64[us]")
+        ends = np.array([e for _, e in flat], dtype="datetime64[us]")
+        first = np.clip((starts - origin) // step, 0, n_slots)
+        # 끝 경계는 올림 (슬롯 일부만 걸쳐도 바쁨)
+        last = np.clip(-((origin - ends) // step), 0, n_slots)
+        np.add.at(diff, (rows, first), 1)
+        np.add.at(diff, (rows, last), -1)
+    return np.cumsum(diff, axis=1)[:, :n_slots] > 0
+
+
+def find_common_slots(
+    busy_by_participant: Sequence[Sequence[Interval]],
+    start: datetime,
+    end: datetime,
+    duration: timedelta,
+    granularity: timedelta,
+    top_k: int,
+    min_available: int | None = None
+) -> List[SlotCandidate]:
+    """모든(또는 min_available명 이상의) 참가자가 비어 있는 시간을 최대 top_k개 찾는다.
+
+    참석 가능 인원이 많은 순, 같으면 이른 순으로 서로 겹치지 않게 고른다.
+    """
+    n_participants = len(busy_by_participant)
+    n_slots = int((end - start) // granularity)
+    width = -(-duration // granularity)  # 올림
+    if min_available is None:
+        min_available = n_participants
+    if n_slots < width or width <= 0:
+        return []
+
+    busy = rasterize(busy_by_participant, start, granularity, n_slots)
+    # 참가자별로 각 시작 슬롯의 창(width 슬롯) 안에 바쁜 슬롯이 하나라도 있는지 (누적합의 차로 한 번에 계산)
+    busy_count = np.zeros((n_participants, n_slots + 1), dtype=np.int32)
+    np.cumsum(busy, axis=1, out=busy_count[:, 1:])
+    win_busy = (busy_count[:, width:] - busy_count[:, :-width]) > 0
+    # 각 시작 슬롯에서 duration 동안 계속 참석 가능한 인원
+    score = n_participants - win_busy.sum(axis=0)
+
+    candidates = np.flatnonzero(score >= min_available)
+    order = candidates[np.lexsort((candidates, -score[candidates]))]
+
+    picked: List[int] = []
+    taken = np.zeros(len(score), dtype=bool)
+    for index in order:
+        if taken[index]:
+            continue
+        picked.append(int(index))
+        taken[max(0, index - width + 1):index + width] = True
+        if len(picked) == top_k:
+            break
+
+    return [
+        SlotCandidate(
+            start_time=start + granularity * index,
+            end_time=start + granularity * (index + width),
+            available=int(score[index]),
+            unavailable=np.flatnonzero(win_busy[:, index]).tolist()
+        )
+        for index in picked
+    ]
@@ -0,0 +1,111 @@
+import asyncio
+import contextlib
+import json
+import os
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+
+from src.db.db_model import Base
+from src.db.postgres_db import PostgresDatabase
+
+# 실제 Postgres가 필요한 테스트(@pytest.mark.postgres)가 사용할 비어 있는 데이터베이스. 없으면 건너뛴다
+TEST_POSTGRES_DSN = os.getenv("TEST_POSTGRES_DSN")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "postgres: TEST_POSTGRES_DSN의 실제 Postgres가 필요한 테스트")
+
+
+def pytest_collection_modifyitems(config, items):
+    if TEST_POSTGRES_DSN:
+        return
+    skip = pytest.mark.skip(reason="TEST_POSTGRES_DSN is not set")
+    for item in items:
+        if item.get_closest_marker("postgres"):
+            item.add_marker(skip)
+
+
+@pytest.fixture
+def postgres_db():
+    """SQLite 위에서 동작하는 PostgresDatabase (스키마는 마이그레이션 대신 create_all로 생성)"""
+    db = PostgresDatabase("sqlite://")
+    Base.metadata.create_all(db.engine)
+    yield db
+    db.engine.dispose()
+
+
+@pytest.fixture
+def migrated_postgres_db():
+    """TEST_POSTGRES_DSN에 마이그레이션(0003의 배타 제약 포함)을 끝까지 적용하고, 끝나면 되돌린다"""
+    config = Config(str(Path(__file__).parent.parent / "alembic.ini"))
+    config.cmd_opts = type("Options", (), {"x": [f"url={TEST_POSTGRES_DSN}"]})()
+    command.upgrade(config, "head")
+    db = PostgresDatabase(TEST_POSTGRES_DSN)
+    try:
+        yield db
+    finally:
+        db.engine.dispose()
+        command.downgrade(config, "base")
+
+
+class EventStream:
+    """ASGI 앱이 보내는 SSE 응답을 이벤트 단위로 읽는다"""
+
+    def __init__(self, start: dict, messages: asyncio.Queue):
+        self.status = start["status"]
+        self.headers = {k.decode().lower(): v.decode() for k, v in start["headers"]}
+        self._messages = messages
+        self._buffer = ""
+
+    async def next_event(self, timeout: float = 1.0) -> tuple:
+        """(event, data). keepalive 주석은 건너뛴다"""
+        while True:
+            block, sep, rest = self._buffer.partition("\n\n")
+            if sep:
+                self._buffer = rest
+                fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+                if "event" in fields:
+                    return fields["event"], json.loads(fields["data"])
+                continue
+            message = await asyncio.wait_for(self._messages.get(), timeout)
+            self._buffer += message.get("body", b"").decode()
+
+
+@pytest.fixture
+def open_event_stream():
+    """스트리밍 응답을 끝까지 기다리지 않고 여는 헬퍼.
+
+    httpx의 ASGITransport는 본문을 모두 받은 뒤 반환하므로 끝나지 않는 SSE 응답은 직접 ASGI로 호출한다.
+    블록을 나가면 클라이언트 연결 종료(http.disconnect)를 보낸다.
+    """
+    @contextlib.asynccontextmanager
+    async def open_stream(app, path: str, headers: dict):
+        messages: asyncio.Queue = asyncio.Queue()
+        disconnected = asyncio.Event()
+        requested = False
+
+        async def receive():
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+            "client": ("test", 1), "server": ("test", 80),
+        }
+        task = asyncio.create_task(app(scope, receive, messages.put))
+        try:
+            yield EventStream(await asyncio.wait_for(messages.get(), 1.0), messages)
+        finally:
+            disconnected.set()
+            await asyncio.wait_for(task, 1.0)
+
+    return open_stream
@@ -0,0 +1,68 @@
+import asyncio
+from datetime import datetime
+
+from src.db.async_postgres_db import AsyncPostgresDatabase
+from src.db.db_model import Base
+from src.models import MeetingRequest, MeetingSchedule, RequestStatus, Time
+
+
+def run(coro_fn):
+    async def runner():
+        db = AsyncPostgresDatabase("sqlite+aiosqlite://")
+        async with db.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        try:
+            return await coro_fn(db)
+        finally:
+            await db.close()
+    return asyncio.run(runner())
+
+
+def test_비동기_DB로_사용자와_API키를_관리할_수_있다():
+    async def scenario(db):
+        user = await db.create_user(name="John", email="john@example.com")
+        api_key = await db.create_api_key(user.id)
+
+        found = await db.get_user_by_api_key(api_key.key)
+        assert found.email == "john@example.com"
+        assert [k.key for k in found.api_keys] == [api_key.key]
+        assert (await db.get_active_api_key(user.id)).key == api_key.key
+
+        assert await db.deactivate_api_key(api_key.key)
+        assert await db.get_user_by_api_key(api_key.key) is None
+        assert await db.get_active_api_key(user.id) is None
+
+    run(scenario)
+
+
+def test_비동기_DB로_미팅요청을_수락하고_스케줄을_만들_수_있다():
+    async def scenario(db):
+        sender = await db.create_user(name="Sender", email="sender@example.com")
+        receiver = await db.create_user(name="Receiver", email="receiver@example.com")
+        time = Time(start_time=datetime(2025, 5, 1, 10), end_time=datetime(2025, 5, 1, 11))
+
+        created = await db.create_request(MeetingRequest(
+            request_id=0,
+            sender=sender,
+            receiver_email=receiver.email,
+            available_times=[time],
+            title="Sync"
+        ))
+        assert created.sender.email == sender.email
+        assert [r.request_id for r in await db.get_user_received_requests(receiver.email)] == [created.request_id]
+
+        updated = await db.update_request_status(created.request_id, RequestStatus.ACCEPTED, time)
+        assert updated.status == RequestStatus.ACCEPTED
+        assert updated.selected_time == time
+
+        schedule = await db.create_schedule(MeetingSchedule(
+            id=0,
+            host=sender,
+            participants=[sender, receiver],
+            time=time,
+            title="Sync"
+        ))
+        assert {p.email for p in schedule.participants} == {sender.email, receiver.email}
+        assert [s.id for s in await db.get_user_schedules(receiver.id)] == [schedule.id]
+
+    run(scenario)
@@ -0,0 +1,100 @@
+import asyncio
+
+from src.cache import TTLCache
+from src.db.cached_db import AuthCachingDatabase
+from src.models import APIKey, User
+
+
+class FakeAuthDatabase:
+    def __init__(self):
+        self.keys = {"key-1": 1, "key-2": 1}
+        self.active = {"key-1", "key-2"}
+        self.lookups = 0
+
+    def _user(self, user_id):
+        return User(
+            id=user_id,
+            name="John",
+            email="john@example.com",
+            api_keys=[APIKey(key=k, user_id=user_id, is_active=k in self.active) for k in self.keys]
+        )
+
+    async def get_user_by_api_key(self, api_key):
+        self.lookups += 1
+        if api_key not in self.active:
+            return None
+        return self._user(self.keys[api_key])
+
+    async def create_api_key(self, user_id):
+        key = f"key-{len(self.keys) + 1}"
+        self.keys[key] = user_id
+        self.active.add(key)
+        return APIKey(key=key, user_id=user_id)
+
+    async def deactivate_api_key(self, api_key):
+        self.active.discard(api_key)
+        return True
+
+
+def test_캐시된_API키는_DB를_다시_조회하지_않는다():
+    async def scenario():
+        inner = FakeAuthDatabase()
+        db = AuthCachingDatabase(inner)
+
+        for _ in range(3):
+            assert (await db.get_user_by_api_key("key-1")).id == 1
+        assert await db.get_user_by_api_key("unknown") is None
+        assert await db.get_user_by_api_key("unknown") is None
+
+        assert inner.lookups == 3
+        assert db.auth_cache.stats() == {"size": 1, "hits": 2, "misses": 3}
+
+    asyncio.run(scenario())
+
+
+def test_API키를_비활성화하면_캐시가_즉시_무효화된다():
+    async def scenario():
+        inner = FakeAuthDatabase()
+        db = AuthCachingDatabase(inner)
+        await db.get_user_by_api_key("key-1")
+        await db.get_user_by_api_key("key-2")
+
+        await db.deactivate_api_key("key-1")
+
+        assert await db.get_user_by_api_key("key-1") is None
+        # 같은 사용자의 다른 키 항목도 api_keys 목록이 바뀌었으므로 다시 조회된다
+        user = await db.get_user_by_api_key("key-2")
+        assert {k.key: k.is_active for k in user.api_keys} == {"key-1": False, "key-2": True}
+
+    asyncio.run(scenario())
+
+
+def test_API키를_새로_만들면_사용자_캐시가_무효화된다():
+    async def scenario():
+        inner = FakeAuthDatabase()
+        db = AuthCachingDatabase(inner)
+        await db.get_user_by_api_key("key-1")
+
+        new_key = await db.create_api_key(1)
+
+        user = await db.get_user_by_api_key("key-1")
+        assert new_key.key in [k.key for k in user.api_keys]
+        assert inner.lookups == 2
+
+    asyncio.run(scenario())
+
+
+def test_TTL이_지나거나_용량을_넘으면_항목이_제거된다():
+    now = [0.0]
+    cache = TTLCache(max_size=2, ttl=10, clock=lambda: now[0])
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)  # 가장 오래 사용되지 않은 b가 제거된다
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    now[0] = 11
+    assert cache.get("a") is None
+    assert len(cache) == 1
@@ -0,0 +1,110 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy.dialects import postgresql
+
+from src.availability import AvailabilityIndex, BusyIntervals
+from src.db.postgres_db import busy_times_query
+from src.models import MeetingSchedule, Time, User
+
+
+def at(hour, minute=0):
+    return datetime(2025, 5, 1, hour, minute)
+
+
+def test_겹치거나_맞닿은_구간은_병합된다():
+    intervals = BusyIntervals([(at(9), at(10)), (at(13), at(14))])
+    intervals.add(at(9, 30), at(11))
+    intervals.add(at(11), at(12))
+    intervals.add(at(15), at(16))
+    intervals.add(at(12, 30), at(15, 30))
+
+    assert list(zip(intervals.starts, intervals.ends)) == [(at(9), at(12)), (at(12, 30), at(16))]
+
+
+def test_창_안의_빈_시간을_계산할_수_있다():
+    intervals = BusyIntervals([(at(8), at(9, 30)), (at(11), at(12)), (at(12, 15), at(13)), (at(17), at(18))])
+
+    free = intervals.free_slots(at(9), at(14), min_duration=timedelta(minutes=30))
+
+    assert free == [(at(9, 30), at(11)), (at(13), at(14))]
+    assert intervals.overlapping(at(9), at(14)) == [(at(9), at(9, 30)), (at(11), at(12)), (at(12, 15), at(13))]
+
+
+class FakeBusyDatabase:
+    def __init__(self, times):
+        self.times = times
+        self.loads = 0
+
+    async def get_busy_times(self, user_ids, start, end):
+        self.loads += 1
+        return {
+            user_id: [t for t in self.times if t.start_time < end and t.end_time > start]
+            for user_id in user_ids
+        }
+
+
+def test_스케줄이_생기면_DB를_다시_읽지_않고_인덱스가_갱신된다():
+    async def scenario():
+        db = FakeBusyDatabase([Time(start_time=at(9), end_time=at(10))])
+        index = AvailabilityIndex()
+        user = User(id=1, name="John", email="john@example.com")
+
+        free, _ = await index.free_slots(db, 1, at(8), at(12))
+        assert [(t.start_time, t.end_time) for t in free] == [(at(8), at(9)), (at(10), at(12))]
+
+        index.add_schedule(MeetingSchedule(
+            id=1, host=user, participants=[user],
+            time=Time(start_time=at(10), end_time=at(11)), title="Sync"
+        ))
+
+        free, busy = await index.free_slots(db, 1, at(8), at(12))
+        assert [(t.start_time, t.end_time) for t in free] == [(at(8), at(9)), (at(11), at(12))]
+        assert [(t.start_time, t.end_time) for t in busy] == [(at(9), at(11))]
+        assert db.loads == 1
+
+    asyncio.run(scenario())
+
+
+def test_캐시한_창을_벗어나면_그_창만_다시_읽는다():
+    async def scenario():
+        db = FakeBusyDatabase([Time(start_time=at(9), end_time=at(10)), Time(start_time=at(15), end_time=at(16))])
+        index = AvailabilityIndex()
+
+        _, busy = await index.free_slots(db, 1, at(8), at(12))
+        assert [(t.start_time, t.end_time) for t in busy] == [(at(9), at(10))]
+        await index.free_slots(db, 1, at(9), at(11))
+        assert db.loads == 1
+
+        _, busy = await index.free_slots(db, 1, at(14), at(17))
+        assert [(t.start_time, t.end_time) for t in busy] == [(at(15), at(16))]
+        assert db.loads == 2
+
+    asyncio.run(scenario())
+
+
+def test_DB에서_사용자의_바쁜_시간을_조회할_수_있다(postgres_db):
+    host = postgres_db.create_user(name="Host", email="host@example.com")
+    guest = postgres_db.create_user(name="Guest", email="guest@example.com")
+    other = postgres_db.create_user(name="Other", email="other@example.com")
+    for hour, participants in ((13, [host, guest]), (9, [host, other])):
+        postgres_db.create_schedule(MeetingSchedule(
+            id=0, host=host, participants=participants,
+            time=Time(start_time=at(hour), end_time=at(hour + 1)), title="Meeting"
+        ))
+
+    busy_times = postgres_db.get_busy_times([host.id, guest.id, 99], at(0), at(23))
+
+    assert [t.start_time for t in busy_times[host.id]] == [at(9), at(13)]
+    assert [t.start_time for t in busy_times[guest.id]] == [at(13)]
+    assert busy_times[99] == []
+
+    # 창과 겹치는 스케줄만 (끝나는 시각에 시작하는 창은 겹치지 않는다)
+    busy_times = postgres_db.get_busy_times([host.id], at(9, 30), at(13))
+    assert [t.start_time for t in busy_times[host.id]] == [at(9)]
+
+
+def test_Postgres에서는_바쁜_시간을_period_범위로_찾는다():
+    query = busy_times_query("postgresql", [1], at(9), at(10)).compile(dialect=postgresql.dialect())
+
+    assert str(query).count("times.period && tsrange(") == 2
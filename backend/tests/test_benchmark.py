@@ -0,0 +1,22 @@
+import asyncio
+
+from benchmarks.api_benchmark import ENDPOINTS, format_report, run
+
+# api_benchmark가 기본 DB와 요청 수 제한 환경 변수를 정한 뒤 main을 import 한다
+import main  # noqa: E402
+
+
+def test_벤치마크가_모든_엔드포인트를_오류_없이_측정한다():
+    app_db = main.db
+    report = asyncio.run(run(
+        backend="memory", users=5, schedules_per_user=2, requests_per_user=2,
+        iterations=10, warmup=2, concurrency=2
+    ))
+
+    assert list(report["results"]) == ENDPOINTS
+    for result in report["results"].values():
+        assert result["requests"] == 10 and result["errors"] == 0
+        assert result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"]
+    assert "req/s" in format_report(report, baseline=report)
+    # 벤치마크용 DB는 끝나면 앱에서 빠진다
+    assert main.db is app_db
@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta
+
+from src.models import MeetingRequest, Time
+
+
+def at(hour):
+    return datetime(2025, 5, 1, hour)
+
+
+def make_requests(sender, count):
+    return [
+        MeetingRequest(
+            request_id=0, sender=sender, receiver_email=f"guest{i}@example.com",
+            available_times=[Time(start_time=at(9), end_time=at(10)), Time(start_time=at(13), end_time=at(14))],
+            title=f"Request {i}"
+        )
+        for i in range(count)
+    ]
+
+
+def test_여러_요청을_한_번에_생성할_수_있다(postgres_db):
+    db = postgres_db
+    sender = db.create_user(name="Sender", email="sender@example.com")
+
+    created = db.create_requests(make_requests(sender, 3))
+
+    assert [r.receiver_email for r in created] == [f"guest{i}@example.com" for i in range(3)]
+    assert len({r.request_id for r in created}) == 3
+    for request in created:
+        stored = db.get_request(request.request_id)
+        assert stored.receiver_email == request.receiver_email
+        assert [t.start_time for t in stored.available_times] == [at(9), at(13)]
+    assert db.create_requests([]) == []
+
+
+def test_요청과_같은_트랜잭션에서_초대_이메일이_기록된다(postgres_db):
+    db = postgres_db
+    sender = db.create_user(name="Sender", email="sender@example.com")
+
+    created = db.create_requests(make_requests(sender, 3))
+    single = db.create_request(make_requests(sender, 1)[0])
+
+    messages = db.claim_outbox_messages(datetime.utcnow(), 10, timedelta(minutes=5))
+    assert [(m.reference_id, m.recipient) for m in messages] == [
+        (r.request_id, r.receiver_email) for r in created + [single]
+    ]
@@ -0,0 +1,148 @@
+import asyncio
+import os
+
+import httpx
+import pytest
+
+# main을 import 할 때 기본 DB(asyncpg)를 만들지 않도록 한다
+os.environ.setdefault("DB_TYPE", "memory")
+
+import main  # noqa: E402
+from src.db.base import DatabaseOverloadedError  # noqa: E402
+from src.db.limiter import AIMDLimit, ConcurrencyLimitedDatabase, Priority  # noqa: E402
+from src.db.memory_db import MemoryDatabase  # noqa: E402
+from src.db.proxy import ThreadPoolDatabase  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class GatedDatabase:
+    """gate가 열릴 때까지 끝나지 않는 DB. 호출된 메서드 이름을 순서대로 기록한다"""
+
+    def __init__(self):
+        self.gate = asyncio.Event()
+        self.calls = []
+
+    def pool_status(self):
+        return None
+
+    def __getattr__(self, name):
+        async def call(*args):
+            self.calls.append(name)
+            await self.gate.wait()
+            return name
+        return call
+
+
+def limited(db, timeout=1.0, max_queue=100):
+    return ConcurrencyLimitedDatabase(
+        db,
+        AIMDLimit(initial=1, min_limit=1, max_limit=1, latency_target=10),
+        queue_timeouts={Priority.WRITE: timeout, Priority.READ: timeout, Priority.POLL: timeout},
+        max_queue=max_queue
+    )
+
+
+def test_지연이_목표_안이면_한도를_늘리고_넘으면_한_번만_줄인다():
+    clock = FakeClock()
+    limit = AIMDLimit(initial=10, min_limit=2, max_limit=11, latency_target=0.1, clock=clock)
+
+    limit.on_sample(0.01, inflight=2)  # 한도의 절반도 쓰지 않으면 늘리지 않는다
+    assert limit.value == 10
+    for _ in range(20):
+        limit.on_sample(0.01, inflight=10)
+    assert limit.value == 11
+
+    limit.on_sample(0.5, inflight=11)
+    limit.on_sample(0.5, inflight=11)  # 같은 혼잡으로 늦게 끝난 호출은 다시 줄이지 않는다
+    assert limit.value == pytest.approx(9.9)
+    clock.now = 0.1
+    limit.on_sample(0.0, inflight=0, overloaded=True)
+    assert limit.value == pytest.approx(8.91)
+
+    for _ in range(100):
+        clock.now += 0.1
+        limit.on_sample(1.0, inflight=1)
+    assert limit.value == 2
+
+
+def test_자리가_나면_우선순위가_높은_호출부터_실행한다():
+    async def scenario():
+        inner = GatedDatabase()
+        db = limited(inner)
+        running = asyncio.create_task(db.get_user_schedules(1))
+        await asyncio.sleep(0)
+        poll = asyncio.create_task(db.get_user_received_requests("a@example.com"))
+        read = asyncio.create_task(db.get_user_by_api_key("key"))
+        write = asyncio.create_task(db.create_request(None))
+        await asyncio.sleep(0)
+        assert db.pool_status() == {"concurrency_limit": 1, "inflight": 1, "queued": 3}
+
+        inner.gate.set()
+        await asyncio.gather(running, poll, read, write)
+        return inner.calls
+
+    assert asyncio.run(scenario()) == [
+        "get_user_schedules", "create_request", "get_user_by_api_key", "get_user_received_requests"
+    ]
+
+
+def test_기다릴_수_없으면_바로_거절하고_대기열이_차면_낮은_우선순위를_버린다():
+    async def scenario():
+        inner = GatedDatabase()
+        db = limited(inner, max_queue=1)
+        running = asyncio.create_task(db.create_request(None))
+        await asyncio.sleep(0)
+        poll = asyncio.create_task(db.get_data_version(1))
+        await asyncio.sleep(0)
+
+        # 대기열이 차 있으면 같거나 낮은 우선순위는 바로 거절된다
+        with pytest.raises(DatabaseOverloadedError):
+            await db.get_user_schedules(1)
+        write = asyncio.create_task(db.update_request_status(1, "ACCEPTED"))
+        with pytest.raises(DatabaseOverloadedError):
+            await poll
+
+        inner.gate.set()
+        await asyncio.gather(running, write)
+
+        timed_out = limited(GatedDatabase(), timeout=0.01)
+        holder = asyncio.create_task(timed_out.create_request(None))
+        await asyncio.sleep(0)
+        with pytest.raises(DatabaseOverloadedError):
+            await timed_out.create_request(None)
+        holder.cancel()
+        return inner.calls
+
+    assert asyncio.run(scenario()) == ["create_request", "update_request_status"]
+
+
+def test_DB_호출_한도가_차면_503과_Retry_After를_반환한다(monkeypatch):
+    memory = MemoryDatabase()
+    user = memory.create_user(name="Owner", email="owner@example.com")
+    api_key = memory.create_api_key(user.id).key
+    db = ConcurrencyLimitedDatabase(
+        ThreadPoolDatabase(memory),
+        AIMDLimit(initial=1, min_limit=1, max_limit=1, latency_target=10),
+        queue_timeouts={Priority.WRITE: 0, Priority.READ: 0, Priority.POLL: 0}
+    )
+    monkeypatch.setattr(main, "db", db)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            allowed = await client.get("/requests/", headers={"X-API-Key": api_key})
+            db._inflight = 1  # 다른 요청이 한도를 쓰고 있는 상태
+            shed = await client.get("/requests/", headers={"X-API-Key": api_key})
+            return allowed, shed
+
+    allowed, shed = asyncio.run(scenario())
+
+    assert allowed.status_code == 200
+    assert shed.status_code == 503 and shed.headers["Retry-After"] == "1"
@@ -0,0 +1,125 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+from src.db import wal as wal_module
+from src.db.memory_db import DurableMemoryDatabase
+from src.models import MeetingRequest, MeetingSchedule, RequestStatus, Time
+
+
+def at(hour):
+    return datetime(2025, 5, 1, hour)
+
+
+def populate(db):
+    host = db.create_user(name="Host", email="host@example.com")
+    guest = db.create_user(name="Guest", email="guest@example.com")
+    old_key = db.create_api_key(host.id)
+    new_key = db.create_api_key(host.id)
+    db.deactivate_api_key(old_key.key)
+    time = Time(start_time=at(9), end_time=at(10))
+    db.create_schedule(MeetingSchedule(id=0, host=host, participants=[host, guest], time=time, title="Sync"))
+    request = db.create_request(MeetingRequest(
+        request_id=0, sender=host, receiver_email=guest.email, available_times=[time], title="Sync"
+    ))
+    db.update_request_status(request.request_id, RequestStatus.ACCEPTED, time)
+    return host, new_key, request
+
+
+def assert_restored(db, host, api_key, request):
+    assert db.get_user_by_email("guest@example.com").name == "Guest"
+    assert db.get_user_by_api_key(api_key.key).id == host.id
+    assert db.get_active_api_key(host.id).key == api_key.key
+    assert [s.title for s in db.get_user_schedules(host.id)] == ["Sync"]
+    assert db.get_request(request.request_id).status == RequestStatus.ACCEPTED
+    # id 할당도 이어진다
+    assert db.create_user(name="Next", email="next@example.com").id == 3
+
+
+def test_종료하지_않고_재시작해도_WAL로_복구된다(tmp_path):
+    db = DurableMemoryDatabase(str(tmp_path))
+    host, api_key, request = populate(db)
+
+    assert_restored(DurableMemoryDatabase(str(tmp_path)), host, api_key, request)
+
+
+def test_스냅샷_이후의_변경만_WAL에서_다시_적용한다(tmp_path):
+    db = DurableMemoryDatabase(str(tmp_path))
+    host, api_key, request = populate(db)
+    db.snapshot()
+    db.create_user(name="After", email="after@example.com")
+
+    restored = DurableMemoryDatabase(str(tmp_path))
+
+    assert restored.snapshot_seq == db.snapshot_seq > 0
+    assert restored.get_user_by_email("after@example.com") is not None
+    assert restored.get_user_schedules(host.id)[0].participants[1].email == "guest@example.com"
+    # 스냅샷에 반영된 세그먼트는 지워지고 현재 세그먼트만 남는다
+    assert len(restored.wal.segments()) <= 2
+    restored.close()
+    assert DurableMemoryDatabase(str(tmp_path)).get_request(request.request_id).title == "Sync"
+
+
+def test_기록_도중_잘린_마지막_레코드는_무시한다(tmp_path):
+    db = DurableMemoryDatabase(str(tmp_path))
+    db.create_user(name="John", email="john@example.com")
+    with open(db.wal.segments()[-1], "ab") as f:
+        f.write(b"\x40\x00\x00\x00garbage")
+
+    restored = DurableMemoryDatabase(str(tmp_path))
+
+    assert restored.get_user_by_email("john@example.com").id == 1
+    assert restored.create_user(name="Jane", email="jane@example.com").id == 2
+    assert DurableMemoryDatabase(str(tmp_path)).get_user_by_email("jane@example.com").id == 2
+
+
+def test_세그먼트의_첫_레코드가_잘렸어도_이후_기록은_복구된다(tmp_path):
+    db = DurableMemoryDatabase(str(tmp_path))
+    db.create_user(name="John", email="john@example.com")
+    db.snapshot()  # 다음 기록(seq 2)부터 새 세그먼트
+    with open(db.wal.segments()[-1], "ab") as f:
+        f.write(b"\x40\x00\x00\x00garbage")
+
+    restored = DurableMemoryDatabase(str(tmp_path))
+    restored.create_user(name="Jane", email="jane@example.com")  # 종료하지 않고 재시작
+
+    assert DurableMemoryDatabase(str(tmp_path)).get_user_by_email("jane@example.com").id == 2
+
+
+def test_WAL의_잘린_첫_레코드_뒤에_이어_쓰지_않는다(tmp_path):
+    segment = tmp_path / wal_module._segment_name(1)
+    segment.write_bytes(b"\x40\x00\x00\x00garbage")
+    log = wal_module.WriteAheadLog(str(tmp_path))
+    log.open(0)
+    log.append("c", {})
+    log.sync(1)
+    log.close()
+
+    assert [op for _, op, _ in wal_module.WriteAheadLog(str(tmp_path)).read()] == ["c"]
+
+
+def test_동시에_커밋하면_fsync를_묶어서_한다(tmp_path, monkeypatch):
+    fsyncs = []
+    real_fsync = wal_module.os.fsync
+
+    def slow_fsync(fd):
+        fsyncs.append(fd)
+        time.sleep(0.005)
+        real_fsync(fd)
+
+    db = DurableMemoryDatabase(str(tmp_path))
+    monkeypatch.setattr(wal_module.os, "fsync", slow_fsync)
+
+    def create_users(worker):
+        for i in range(5):
+            db.create_user(name=f"User {worker}-{i}", email=f"user{worker}-{i}@example.com")
+
+    threads = [threading.Thread(target=create_users, args=(w,)) for w in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert db.wal.durable_seq == db.wal.written_seq == 80
+    assert len(fsyncs) < 80
+    assert len(DurableMemoryDatabase(str(tmp_path)).users) == 80
@@ -0,0 +1,184 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi_mail import ConnectionConfig
+from prometheus_client import REGISTRY
+
+from src.db.async_postgres_db import AsyncPostgresDatabase
+from src.db.db_model import Base
+from src.models import MeetingRequest, OutboxStatus, Time, User
+
+
+class StandInSMTPServer:
+    """테스트용 최소 SMTP 서버. 받은 메시지와 연결 수를 기록하고 rejected 수신자는 거부한다"""
+
+    def __init__(self, rejected=()):
+        self.rejected = set(rejected)
+        self.connections = 0
+        self.recipients = []
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        recipients = []
+        writer.write(b"220 localhost ready\r\n")
+        while line := await reader.readline():
+            command = line.decode().strip()
+            verb = command.split(" ")[0].upper()
+            if verb in ("EHLO", "HELO"):
+                writer.write(b"250 localhost\r\n")
+            elif verb == "RCPT":
+                address = command[command.index("<") + 1:command.index(">")]
+                if address in self.rejected:
+                    writer.write(b"451 try again later\r\n")
+                else:
+                    recipients.append(address)
+                    writer.write(b"250 OK\r\n")
+            elif verb == "DATA":
+                writer.write(b"354 end with .\r\n")
+                await writer.drain()
+                while await reader.readline() != b".\r\n":
+                    pass
+                self.recipients.extend(recipients)
+                recipients = []
+                writer.write(b"250 OK\r\n")
+            elif verb == "QUIT":
+                writer.write(b"221 bye\r\n")
+                await writer.drain()
+                break
+            else:
+                if verb == "RSET":
+                    recipients = []
+                writer.write(b"250 OK\r\n")
+            await writer.drain()
+        writer.close()
+
+
+def sample(name, reason=None):
+    labels = {"kind": "meeting_request"}
+    if reason:
+        labels["reason"] = reason
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def make_request(sender, receiver_email):
+    return MeetingRequest(
+        request_id=0, sender=sender, receiver_email=receiver_email,
+        available_times=[Time(start_time=datetime(2025, 5, 1, 9), end_time=datetime(2025, 5, 1, 10))],
+        title="Sync"
+    )
+
+
+def run(scenario, rejected=(), **worker_options):
+    async def runner():
+        from src.email_service import EmailService
+        from src.email_worker import OutboxWorker, SMTPConnectionPool
+
+        server = StandInSMTPServer(rejected)
+        port = await server.start()
+        conf = ConnectionConfig(
+            MAIL_USERNAME="", MAIL_PASSWORD="", MAIL_FROM="schedulia@example.com",
+            MAIL_PORT=port, MAIL_SERVER="127.0.0.1", MAIL_FROM_NAME="Schedulia",
+            MAIL_STARTTLS=False, MAIL_SSL_TLS=False, USE_CREDENTIALS=False
+        )
+        db = AsyncPostgresDatabase("sqlite+aiosqlite://")
+        async with db.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        pool = SMTPConnectionPool(conf, size=2)
+        worker = OutboxWorker(db, EmailService(conf), pool, rate_per_second=0, **worker_options)
+        try:
+            await scenario(db, worker, server)
+        finally:
+            await pool.close()
+            await db.close()
+            await server.stop()
+
+    asyncio.run(runner())
+
+
+@pytest.fixture(autouse=True)
+def mail_env(monkeypatch):
+    # src.email_service 모듈은 import 시 환경 변수로 기본 설정을 만든다
+    monkeypatch.setenv("GMAIL_USERNAME", "schedulia@example.com")
+    monkeypatch.setenv("GMAIL_APP_PASSWORD", "password")
+
+
+def test_워커는_SMTP_연결을_재사용해_outbox를_비운다():
+    async def scenario(db, worker, server):
+        sender = await db.create_user(name="Sender", email="sender@example.com")
+        await db.create_requests([make_request(sender, f"guest{i}@example.com") for i in range(3)])
+
+        assert await worker.run_once() == 3
+
+        await db.create_request(make_request(sender, "late@example.com"))
+        assert await worker.run_once() == 1
+        assert await worker.run_once() == 0
+
+        assert sorted(server.recipients) == sorted([f"guest{i}@example.com" for i in range(3)] + ["late@example.com"])
+        # 연결은 풀 크기만큼만 열리고 두 번째 배치에서는 재사용된다
+        assert server.connections == worker.pool.connects <= 2
+
+    run(scenario)
+
+
+def test_발송에_실패하면_재시도하고_최대_횟수를_넘기면_포기한다():
+    async def scenario(db, worker, server):
+        sender = await db.create_user(name="Sender", email="sender@example.com")
+        await db.create_requests([make_request(sender, "bounce@example.com"), make_request(sender, "ok@example.com")])
+
+        sent, retried, failed = sample("emails_sent_total"), sample("emails_failed_total", "retry"), sample("emails_failed_total", "permanent")
+
+        assert await worker.run_once() == 2
+        assert server.recipients == ["ok@example.com"]
+        # 실패한 이메일만 다시 가져가고, 두 번째 실패 후에는 더 이상 시도하지 않는다
+        assert await worker.run_once() == 1
+        assert await worker.run_once() == 0
+
+        assert sample("emails_sent_total") - sent == 1
+        assert sample("emails_failed_total", "retry") - retried == 1
+        assert sample("emails_failed_total", "permanent") - failed == 1
+        assert await db.count_outbox_messages(OutboxStatus.FAILED) == 1
+        assert await db.count_outbox_messages(OutboxStatus.PENDING) == 0
+
+    run(scenario, rejected={"bounce@example.com"}, max_attempts=2, backoff=0)
+
+
+def test_재시도_간격은_지수적으로_늘어난다():
+    from src.email_worker import OutboxWorker
+
+    worker = OutboxWorker(db=None, email_service=None, pool=None, max_attempts=5, backoff=30, max_backoff=200)
+    now = datetime(2025, 5, 1)
+
+    assert [worker.retry_at(n, now) - now for n in (1, 2, 3, 4)] == [
+        timedelta(seconds=30), timedelta(seconds=60), timedelta(seconds=120), timedelta(seconds=200)
+    ]
+    assert worker.retry_at(5, now) is None
+
+
+def test_미팅_요청_메일은_보낸_사람과_본문을_담은_MIME_메시지로_만들어진다():
+    from src.email_service import EmailService
+
+    conf = ConnectionConfig(
+        MAIL_USERNAME="", MAIL_PASSWORD="", MAIL_FROM="schedulia@example.com",
+        MAIL_PORT=25, MAIL_SERVER="127.0.0.1", MAIL_FROM_NAME="Schedulia",
+        MAIL_STARTTLS=False, MAIL_SSL_TLS=False, USE_CREDENTIALS=False
+    )
+    service = EmailService(conf)
+    sender = User(id=1, name="Sender", email="sender@example.com")
+
+    email = service.build(service.meeting_request_message(make_request(sender, "guest@example.com")))
+
+    assert email["From"] == "Schedulia <schedulia@example.com>"
+    assert email["To"] == "guest@example.com"
+    assert email["Subject"] == "[Schedulia]<Meeting Request> Sync"
+    assert email["Message-ID"] and email["Date"]
+    assert email.get_content_type() == "text/plain"
+    assert "2025-05-01 09:00 - 10:00" in email.get_content()
@@ -0,0 +1,87 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+# main을 import 할 때 기본 DB(asyncpg)를 만들지 않도록 한다
+os.environ.setdefault("DB_TYPE", "memory")
+
+import main  # noqa: E402
+from src.cache import TTLCache  # noqa: E402
+from src.db.memory_db import MemoryDatabase  # noqa: E402
+from src.db.proxy import ThreadPoolDatabase  # noqa: E402
+from src.etag import etag_matches  # noqa: E402
+from src.models import MeetingRequest, MeetingSchedule, RequestStatus, Time  # noqa: E402
+
+START = datetime(2030, 1, 1, 9)
+SLOT = Time(start_time=START, end_time=START + timedelta(hours=1))
+
+
+@pytest.fixture(params=["postgres", "memory"])
+def db(request):
+    if request.param == "postgres":
+        return request.getfixturevalue("postgres_db")
+    return MemoryDatabase()
+
+
+def test_목록을_바꾸는_쓰기와_키_변경이_관련된_사용자의_버전을_올린다(db):
+    host = db.create_user(name="Host", email="host@example.com")
+    guest = db.create_user(name="Guest", email="guest@example.com")
+    other = db.create_user(name="Other", email="other@example.com")
+    versions = lambda: [db.get_data_version(u.id) for u in (host, guest, other)]  # noqa: E731
+
+    db.create_schedule(MeetingSchedule(id=0, host=host, participants=[host, guest], time=SLOT, title="Sync"))
+    assert versions() == [1, 1, 0]
+
+    request = db.create_request(MeetingRequest(
+        request_id=0, sender=host, receiver_email=other.email, available_times=[SLOT], title="Intro"
+    ))
+    db.update_request_status(request.request_id, RequestStatus.DECLINED)
+    assert versions() == [1, 1, 2]
+
+    # host의 api_keys는 guest의 스케줄 목록과 other의 받은 요청 목록에도 들어 있다
+    key = db.create_api_key(host.id)
+    db.deactivate_api_key(key.key)
+    assert versions() == [3, 3, 4]
+    assert db.get_data_version(999) == 0
+
+
+def test_etag_비교는_여러_값과_약한_etag를_허용한다():
+    assert etag_matches('"1-a", W/"2-b"', '"2-b"')
+    assert etag_matches("*", '"2-b"')
+    assert not etag_matches('"1-a"', '"2-b"')
+    assert not etag_matches(None, '"2-b"')
+
+
+def test_etag는_목록이_바뀔_때만_달라지고_응답_캐시는_버전별로_본문을_재사용한다(monkeypatch):
+    memory = MemoryDatabase()
+    owner = memory.create_user(name="Owner", email="owner@example.com")
+    sender = memory.create_user(name="Sender", email="sender@example.com")
+    api_key = memory.create_api_key(owner.id).key
+    monkeypatch.setattr(main, "db", ThreadPoolDatabase(memory))
+    monkeypatch.setattr(main, "listing_cache", TTLCache(max_size=10, ttl=60))
+    loads = []
+    original = memory.get_user_received_requests
+    monkeypatch.setattr(memory, "get_user_received_requests", lambda *a: loads.append(a) or original(*a))
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            get = lambda **params: client.get("/requests/", params=params, headers={"X-API-Key": api_key})  # noqa: E731
+            first, again, paged = await get(), await get(), await get(limit=1)
+            memory.create_request(MeetingRequest(
+                request_id=0, sender=sender, receiver_email=owner.email, available_times=[SLOT], title="Intro"
+            ))
+            return first, again, paged, await get()
+
+    first, again, paged, changed = asyncio.run(scenario())
+
+    assert first.json() == [] and again.content == first.content
+    assert again.headers["ETag"] == first.headers["ETag"]
+    assert paged.headers["ETag"] != first.headers["ETag"]
+    assert changed.headers["ETag"] != first.headers["ETag"]
+    assert [r["title"] for r in changed.json()] == ["Intro"]
+    # 같은 버전·같은 쿼리의 두 번째 요청은 캐시된 본문을 돌려준다
+    assert len(loads) == 3
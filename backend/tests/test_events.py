@@ -0,0 +1,85 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+import httpx
+
+# main을 import 할 때 기본 DB(asyncpg)를 만들지 않도록 한다
+os.environ.setdefault("DB_TYPE", "memory")
+
+import main  # noqa: E402
+from src.db.memory_db import MemoryDatabase  # noqa: E402
+from src.db.proxy import ThreadPoolDatabase  # noqa: E402
+from src.events import (  # noqa: E402
+    Event, EventHub, decode_notification, encode_notifications
+)
+
+START = datetime(2030, 1, 1, 9)
+SLOT = {"start_time": START.isoformat(), "end_time": (START + timedelta(hours=1)).isoformat()}
+
+
+def test_구독자에게만_전달하고_큐가_넘치면_resync로_바꾼다():
+    async def scenario():
+        hub = EventHub(queue_size=2)
+        with hub.subscribe("a@example.com") as a, hub.subscribe("b@example.com") as b:
+            await hub.publish([(["a@example.com"], Event("request.created", {"request_id": i})) for i in range(3)])
+            await hub.publish([(["b@example.com"], Event("request.created", {"request_id": 9}))])
+            assert [a.queue.get_nowait().type] == ["resync"] and a.queue.empty()
+            assert b.queue.get_nowait().data == {"request_id": 9}
+            assert hub.subscriber_count() == 2
+        assert hub.subscriber_count() == 0
+
+    asyncio.run(scenario())
+
+
+def test_NOTIFY_페이로드는_크기_제한_안에서_묶는다():
+    messages = [([f"user{i}@example.com"], Event("request.created", {"request_id": i})) for i in range(300)]
+
+    payloads = encode_notifications(messages, limit=1000)
+
+    assert len(payloads) > 1 and all(len(p) <= 1000 for p in payloads)
+    assert [m for p in payloads for m in decode_notification(p)] == messages
+
+
+def test_받은_요청과_응답을_스트림으로_알린다(monkeypatch, open_event_stream):
+    memory = MemoryDatabase()
+    sender = memory.create_user(name="Sender", email="sender@example.com")
+    receiver = memory.create_user(name="Receiver", email="receiver@example.com")
+    keys = {u.email: memory.create_api_key(u.id).key for u in (sender, receiver)}
+    monkeypatch.setattr(main, "db", ThreadPoolDatabase(memory))
+    monkeypatch.setattr(main, "events", EventHub())
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client, \
+                open_event_stream(main.app, "/events", {"X-API-Key": keys[sender.email]}) as sender_stream, \
+                open_event_stream(main.app, "/events", {"X-API-Key": keys[receiver.email]}) as receiver_stream:
+            assert sender_stream.headers["content-type"].startswith("text/event-stream")
+            assert await sender_stream.next_event() == ("ready", {})
+            assert await receiver_stream.next_event() == ("ready", {})
+
+            created = await client.post("/requests/", headers={"X-API-Key": keys[sender.email]}, json={
+                "receiver_email": receiver.email, "title": "Intro", "available_times": [SLOT],
+            })
+            request_id = created.json()["request_id"]
+            assert await receiver_stream.next_event() == ("request.created", {"request_id": request_id, "status": "PENDING"})
+
+            await client.post(f"/requests/{request_id}/respond", headers={"X-API-Key": keys[receiver.email]}, json={
+                "accept": True, "selected_time": SLOT,
+            })
+            updated = ("request.updated", {"request_id": request_id, "status": "ACCEPTED"})
+            assert await sender_stream.next_event() == updated
+            assert await receiver_stream.next_event() == updated
+            assert main.events.subscriber_count() == 2
+
+    asyncio.run(scenario())
+    # 연결이 끊기면 구독이 해제된다
+    assert main.events.subscriber_count() == 0
+
+
+def test_인증에_실패하면_스트림을_열지_않는다(open_event_stream):
+    async def scenario():
+        async with open_event_stream(main.app, "/events", {}) as stream:
+            return stream.status
+
+    assert asyncio.run(scenario()) == 401
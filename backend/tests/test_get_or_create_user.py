@@ -0,0 +1,100 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from sqlalchemy import update
+
+from src.db.db_model import APIKeyModel
+from src.db.memory_db import MemoryDatabase
+from src.db.postgres_db import insert_user_statement
+
+
+@pytest.fixture(params=["postgres", "memory"])
+def db(request):
+    if request.param == "postgres":
+        return request.getfixturevalue("postgres_db")
+    return MemoryDatabase()
+
+
+def test_가입하거나_기존_사용자와_활성_키를_가져온다(db):
+    assert db.get_or_create_user_api_key("john@example.com") is None
+
+    user, api_key = db.get_or_create_user_api_key("john@example.com", name="John")
+    again, same_key = db.get_or_create_user_api_key("john@example.com", name="Other")
+
+    assert (again.id, again.name, same_key.key) == (user.id, "John", api_key.key)
+    assert db.get_active_api_key(user.id).key == api_key.key
+    assert db.get_user_by_api_key(api_key.key).email == "john@example.com"
+
+    # 활성 키가 없으면 새로 발급하고 목록 버전을 올린다
+    db.deactivate_api_key(api_key.key)
+    version = db.get_data_version(user.id)
+    _, issued = db.get_or_create_user_api_key("john@example.com")
+    assert issued.key != api_key.key and issued.is_active
+    assert db.get_active_api_key(user.id).key == issued.key
+    assert db.get_data_version(user.id) == version + 1
+
+
+def test_활성_키가_여러_개면_로그인과_같은_가장_오래된_키를_돌려준다(postgres_db):
+    db = postgres_db
+    user = db.create_user(name="John", email="john@example.com")
+    first, second = db.create_api_key(user.id), db.create_api_key(user.id)
+    # 나중에 넣은 키가 더 먼저 만들어진 것으로 기록되어 있으면 저장 순서가 아니라 created_at 순이다
+    with db.Session() as session:
+        session.execute(
+            update(APIKeyModel).where(APIKeyModel.key == second.key).values(created_at=first.created_at.replace(year=2000))
+        )
+        session.commit()
+
+    assert db.get_active_api_key(user.id).key == second.key
+    assert db.get_or_create_user_api_key("john@example.com")[1].key == second.key
+
+
+def test_같은_이메일의_사용자는_충돌하면_넣지_않는다(postgres_db):
+    with postgres_db.Session() as session:
+        first = session.scalar(insert_user_statement("sqlite", "John", "john@example.com"))
+        second = session.scalar(insert_user_statement("sqlite", "Johnny", "john@example.com"))
+        session.commit()
+
+    assert first is not None and second is None
+
+
+def test_동시에_가입해도_사용자와_키가_하나씩만_생긴다():
+    db = MemoryDatabase()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: db.get_or_create_user_api_key("john@example.com", name="John"), range(32)))
+
+    assert {(user.id, api_key.key) for user, api_key in results} == {(results[0][0].id, results[0][1].key)}
+    assert len(db.users) == 1 and len(db.api_keys) == 1
+
+
+@pytest.mark.postgres
+def test_활성_키가_없는_사용자가_동시에_로그인해도_키는_하나만_발급된다(migrated_postgres_db):
+    db = migrated_postgres_db
+    user = db.create_user(name="John", email="john@example.com")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: db.get_or_create_user_api_key("john@example.com"), range(32)))
+
+    assert {api_key.key for _, api_key in results} == {db.get_active_api_key(user.id).key}
+    assert len(db.get_user(user.id).api_keys) == 1
+
+
+def test_비동기_DB에서도_가입과_키_발급을_한_트랜잭션에서_처리한다():
+    from src.db.async_postgres_db import AsyncPostgresDatabase
+    from src.db.db_model import Base
+
+    async def scenario():
+        db = AsyncPostgresDatabase("sqlite+aiosqlite://")
+        async with db.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        try:
+            user, api_key = await db.get_or_create_user_api_key("john@example.com", name="John")
+            assert await db.get_or_create_user_api_key("john@example.com") == (user, api_key)
+            assert (await db.get_user_by_api_key(api_key.key)).id == user.id
+        finally:
+            await db.close()
+
+    asyncio.run(scenario())
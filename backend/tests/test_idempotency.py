@@ -0,0 +1,93 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+# main을 import 할 때 기본 DB(asyncpg)를 만들지 않도록 한다
+os.environ.setdefault("DB_TYPE", "memory")
+
+import main  # noqa: E402
+from src.db.memory_db import MemoryDatabase  # noqa: E402
+from src.db.proxy import ThreadPoolDatabase  # noqa: E402
+from src.events import EventHub  # noqa: E402
+from src.models import OutboxStatus  # noqa: E402
+
+NOW = datetime(2030, 1, 1, 9)
+LEASE = timedelta(seconds=60)
+SLOT = {"start_time": NOW.isoformat(), "end_time": (NOW + timedelta(hours=1)).isoformat()}
+
+
+@pytest.fixture(params=["postgres", "memory"])
+def db(request):
+    if request.param == "postgres":
+        return request.getfixturevalue("postgres_db")
+    return MemoryDatabase()
+
+
+def test_키를_예약하고_응답을_저장하면_재시도에_그_응답을_돌려준다(db):
+    assert db.reserve_idempotency_key("scope", "k1", "fp", NOW, LEASE) is None
+
+    in_progress = db.reserve_idempotency_key("scope", "k1", "fp", NOW, LEASE)
+    assert (in_progress.fingerprint, in_progress.status_code) == ("fp", None)
+    # 다른 범위의 같은 키는 따로 예약된다
+    assert db.reserve_idempotency_key("other", "k1", "fp", NOW, LEASE) is None
+
+    db.complete_idempotency_key("scope", "k1", 200, "application/json", b'{"id":1}', NOW + timedelta(days=1))
+    db.release_idempotency_key("scope", "k1")  # 저장한 응답은 지우지 않는다
+    stored = db.reserve_idempotency_key("scope", "k1", "other-fp", NOW + LEASE, LEASE)
+    assert (stored.fingerprint, stored.status_code, stored.content_type, stored.body) == (
+        "fp", 200, "application/json", b'{"id":1}'
+    )
+
+
+def test_실패한_예약과_만료된_키는_다시_쓸_수_있고_purge로_지운다(db):
+    db.reserve_idempotency_key("scope", "failed", "fp", NOW, LEASE)
+    db.release_idempotency_key("scope", "failed")
+    assert db.reserve_idempotency_key("scope", "failed", "fp2", NOW, LEASE) is None
+
+    # 처리하던 워커가 죽은 예약은 lease가 지나면 다시 예약할 수 있다
+    db.reserve_idempotency_key("scope", "stale", "fp", NOW, LEASE)
+    assert db.reserve_idempotency_key("scope", "stale", "fp", NOW + LEASE, LEASE) is None
+
+    assert db.purge_idempotency_keys(NOW + LEASE) == 1
+    assert db.purge_idempotency_keys(NOW + 2 * LEASE) == 1
+    assert db.reserve_idempotency_key("scope", "failed", "fp3", NOW + 2 * LEASE, LEASE) is None
+
+
+def test_같은_키로_재시도하면_요청과_초대_이메일을_다시_만들지_않는다(monkeypatch):
+    memory = MemoryDatabase()
+    sender = memory.create_user(name="Sender", email="sender@example.com")
+    api_key = memory.create_api_key(sender.id).key
+    monkeypatch.setattr(main, "db", ThreadPoolDatabase(memory))
+    monkeypatch.setattr(main, "events", EventHub())
+    body = {"receiver_email": "receiver@example.com", "title": "Intro", "available_times": [SLOT]}
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            post = lambda json, key="retry-1": client.post(  # noqa: E731
+                "/requests/", json=json, headers={"X-API-Key": api_key, "Idempotency-Key": key}
+            )
+            responses = [await post(body) for _ in range(3)]
+            mismatch = await post({**body, "title": "Changed"})
+            invalid = await client.post("/requests/", json=body, headers={"X-API-Key": "wrong", "Idempotency-Key": "k"})
+            signup = [
+                await client.post("/users/", json={"name": "New", "email": "new@example.com"},
+                                  headers={"Idempotency-Key": "signup"})
+                for _ in range(2)
+            ]
+            return responses, mismatch, invalid, signup
+
+    (first, *retries), mismatch, invalid, signup = asyncio.run(scenario())
+
+    assert first.status_code == 200 and "Idempotent-Replayed" not in first.headers
+    assert all(r.content == first.content and r.headers["Idempotent-Replayed"] == "true" for r in retries)
+    assert len(memory.requests) == 1
+    assert memory.count_outbox_messages(OutboxStatus.PENDING) == 1
+    assert mismatch.status_code == 422
+    # 실패한 요청의 예약은 남기지 않는다
+    assert invalid.status_code == 401
+    assert len(memory.idempotency_keys) == 2
+    assert signup[1].json() == signup[0].json() and signup[1].headers["Idempotent-Replayed"] == "true"
@@ -0,0 +1,91 @@
+import asyncio
+import io
+import json
+import logging
+import queue
+import random
+
+import httpx
+
+from src.log import (
+    JsonFormatter, NonBlockingQueueHandler, SamplingFilter, configure_logging, flush_logging, request_id_var
+)
+
+
+def make_record(level=logging.INFO, msg="hello", args=None, **extra):
+    record = logging.LogRecord("schedulia.test", level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_JSON으로_기록하고_비밀_값은_가린다():
+    record = make_record(
+        msg="Invalid key %s", args=("mcp_abcdefghijklmnop",), api_key="mcp_abcdefghijklmnop", user_id=3
+    )
+    record.request_id = "req-1"
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["message"] == "Invalid key mcp_***"
+    assert entry["api_key"] == "mcp_***"
+    assert entry["user_id"] == 3
+    assert entry["request_id"] == "req-1"
+    assert entry["level"] == "INFO"
+
+
+def test_레벨별_비율만큼만_남긴다():
+    sampling = SamplingFilter({logging.DEBUG: 0.1, logging.INFO: 0.0}, rng=random.Random(1))
+
+    kept_debug = sum(sampling.filter(make_record(logging.DEBUG)) for _ in range(10000))
+
+    assert 800 < kept_debug < 1200
+    assert not sampling.filter(make_record(logging.INFO))
+    assert sampling.filter(make_record(logging.WARNING))
+
+
+def test_큐가_가득_차면_기다리지_않고_버린다():
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=2))
+
+    for _ in range(5):
+        handler.handle(make_record())
+
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+
+
+def test_요청_ID와_함께_백그라운드에서_기록된다():
+    stream = io.StringIO()
+    configure_logging(level="INFO", sample_rates={"DEBUG": 0.0}, stream=stream)
+    logger = logging.getLogger("schedulia.test")
+    try:
+        token = request_id_var.set("req-42")
+        logger.info("Request handled", extra={"route": "/users/me"})
+        request_id_var.reset(token)
+        logger.warning("Outside of a request")
+    finally:
+        flush_logging()
+        configure_logging()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [(line["message"], line.get("request_id")) for line in lines] == [
+        ("Request handled", "req-42"),
+        ("Outside of a request", None),
+    ]
+    assert lines[0]["route"] == "/users/me"
+
+
+def test_응답에_요청_ID를_돌려준다(monkeypatch):
+    monkeypatch.setenv("DB_TYPE", "memory")
+    import main
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            given = await client.get("/health-check", headers={"X-Request-ID": "trace-1"})
+            generated = await client.get("/health-check")
+            return given, generated
+
+    given, generated = asyncio.run(scenario())
+
+    assert given.headers["X-Request-ID"] == "trace-1"
+    assert len(generated.headers["X-Request-ID"]) == 32
@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.db.base import ScheduleConflictError
+from src.db.memory_db import MemoryDatabase
+from src.db.pagination import schedule_cursor, request_cursor
+from src.models import MeetingRequest, MeetingSchedule, RequestStatus, Time
+
+
+def at(day, hour):
+    return datetime(2025, 5, day, hour)
+
+
+@pytest.fixture
+def db():
+    return MemoryDatabase()
+
+
+def schedule(host, participants, start, hours=1):
+    return MeetingSchedule(
+        id=0, host=host, participants=participants,
+        time=Time(start_time=start, end_time=start + timedelta(hours=hours)), title="Meeting"
+    )
+
+
+def test_사용자와_API키를_인덱스로_조회할_수_있다(db):
+    user = db.create_user(name="John", email="john@example.com")
+    first = db.create_api_key(user.id)
+    second = db.create_api_key(user.id)
+
+    assert db.get_user_by_email("john@example.com").id == user.id
+    assert db.get_user_by_email("nobody@example.com") is None
+    assert [u.email for u in db.get_users_by_emails(["john@example.com", "nobody@example.com"])] == ["john@example.com"]
+    assert [k.key for k in db.get_user_by_api_key(second.key).api_keys] == [first.key, second.key]
+    assert db.get_active_api_key(user.id).key == first.key
+
+    assert db.deactivate_api_key(first.key)
+    assert db.get_user_by_api_key(first.key) is None
+    assert db.get_active_api_key(user.id).key == second.key
+    assert not db.deactivate_api_key("mcp_unknown")
+    with pytest.raises(ValueError):
+        db.create_user(name="Again", email="john@example.com")
+
+
+def test_스케줄을_시작_시간_순으로_범위와_커서로_조회할_수_있다(db):
+    host = db.create_user(name="Host", email="host@example.com")
+    guests = [db.create_user(name=f"Guest {i}", email=f"guest{i}@example.com") for i in range(2)]
+    for day in (3, 1, 2):
+        for guest in guests:
+            # 같은 시작 시간은 id 순 (호스트는 참가자가 아니므로 겹쳐도 된다)
+            db.create_schedule(schedule(host, [guest], at(day, 9)))
+
+    assert [s.time.start_time.day for s in db.get_user_schedules(host.id, start=at(2, 0), end=at(3, 0))] == [2, 2]
+
+    seen, cursor = [], None
+    while True:
+        page = db.get_user_schedules(host.id, limit=4, cursor=cursor)
+        seen.extend(page)
+        if len(page) < 4:
+            break
+        cursor = schedule_cursor(page[-1])
+    assert [(s.time.start_time, s.id) for s in seen] == sorted((s.time.start_time, s.id) for s in seen)
+    assert len(seen) == 6
+    assert [t.start_time.day for t in db.get_busy_times([guests[0].id], at(1, 0), at(4, 0))[guests[0].id]] == [1, 2, 3]
+    assert [t.start_time.day for t in db.get_busy_times([guests[0].id], at(2, 0), at(3, 0))[guests[0].id]] == [2]
+
+
+def test_바쁜_시간은_창_앞에서_시작한_긴_스케줄까지_찾는다(db):
+    host = db.create_user(name="Host", email="host@example.com")
+    db.create_schedule(schedule(host, [host], at(1, 9), hours=72))
+    for day in range(5, 28):
+        db.create_schedule(schedule(host, [host], at(day, 9)))
+
+    busy = db.get_busy_times([host.id], at(3, 0), at(6, 0))[host.id]
+
+    assert [(t.start_time, t.end_time) for t in busy] == [(at(1, 9), at(4, 9)), (at(5, 9), at(5, 10))]
+    assert db.get_busy_times([host.id], at(4, 9), at(5, 9))[host.id] == []
+
+
+def test_참가자의_겹치는_스케줄은_거부된다(db):
+    host = db.create_user(name="Host", email="host@example.com")
+    guest = db.create_user(name="Guest", email="guest@example.com")
+    db.create_schedule(schedule(host, [host, guest], at(1, 9)))
+
+    with pytest.raises(ScheduleConflictError):
+        db.create_schedule(schedule(guest, [guest], at(1, 9) + timedelta(minutes=30)))
+    db.create_schedule(schedule(guest, [guest], at(1, 10)))
+
+    assert len(db.get_user_schedules(guest.id)) == 2
+
+
+def test_받은_요청을_커서로_조회하고_상태를_바꿀_수_있다(db):
+    sender = db.create_user(name="Sender", email="sender@example.com")
+    times = [Time(start_time=at(1, 9), end_time=at(1, 10))]
+    created = db.create_requests([
+        MeetingRequest(request_id=0, sender=sender, receiver_email=email, available_times=times, title="Sync")
+        for email in ["a@example.com", "b@example.com", "a@example.com", "a@example.com"]
+    ])
+
+    page = db.get_user_received_requests("a@example.com", limit=2)
+    rest = db.get_user_received_requests("a@example.com", cursor=request_cursor(page[-1]))
+    assert [r.request_id for r in page + rest] == [created[0].request_id, created[2].request_id, created[3].request_id]
+
+    with pytest.raises(ValueError):
+        db.update_request_status(created[0].request_id, RequestStatus.ACCEPTED, Time(start_time=at(2, 9), end_time=at(2, 10)))
+    accepted = db.update_request_status(created[0].request_id, RequestStatus.ACCEPTED, times[0])
+    assert accepted.status == RequestStatus.ACCEPTED and accepted.selected_time == times[0]
+    assert db.get_request(created[0].request_id).status == RequestStatus.ACCEPTED
+
+
+def test_초대_이메일을_outbox에서_가져가고_재시도할_수_있다(db):
+    sender = db.create_user(name="Sender", email="sender@example.com")
+    created = db.create_requests([
+        MeetingRequest(request_id=0, sender=sender, receiver_email=f"guest{i}@example.com", available_times=[], title="Sync")
+        for i in range(3)
+    ])
+    now, lease = datetime.utcnow(), timedelta(minutes=5)
+
+    claimed = db.claim_outbox_messages(now, 10, lease)
+    assert [m.reference_id for m in claimed] == [r.request_id for r in created]
+    assert db.claim_outbox_messages(now, 10, lease) == []
+
+    db.mark_outbox_sent([claimed[0].id])
+    db.mark_outbox_failed(claimed[1].id, "temporary", retry_at=now)
+    db.mark_outbox_failed(claimed[2].id, "permanent", retry_at=None)
+
+    retried = db.claim_outbox_messages(now, 10, lease)
+    assert [(m.id, m.attempts) for m in retried] == [(claimed[1].id, 2)]
+    # lease가 지나면 발송 완료로 표시되지 않은 메시지를 다시 가져간다
+    assert [m.id for m in db.claim_outbox_messages(now + lease, 10, lease)] == [claimed[1].id]
@@ -0,0 +1,57 @@
+import asyncio
+import os
+
+import httpx
+from prometheus_client import REGISTRY
+
+# main을 import 할 때 기본 DB(asyncpg)를 만들지 않도록 한다
+os.environ.setdefault("DB_TYPE", "memory")
+
+import main  # noqa: E402
+from src.db.db_model import Base  # noqa: E402
+from src.db.memory_db import MemoryDatabase  # noqa: E402
+from src.db.postgres_db import PostgresDatabase  # noqa: E402
+from src.db.proxy import ThreadPoolDatabase  # noqa: E402
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_요청_지연시간은_경로_파라미터를_치환하기_전의_라우트로_기록된다(monkeypatch):
+    monkeypatch.setattr(main, "db", ThreadPoolDatabase(MemoryDatabase()))
+    route = {"method": "POST", "route": "/users/{user_id}/api-keys", "status": "404"}
+    unmatched = {"method": "GET", "route": "<unmatched>", "status": "404"}
+    before = sample("http_request_duration_seconds_count", **route)
+    before_unmatched = sample("http_request_duration_seconds_count", **unmatched)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            await client.post("/users/1/api-keys")
+            await client.post("/users/2/api-keys")
+            await client.get("/no-such-path")
+            return await client.get("/metrics")
+
+    response = asyncio.run(scenario())
+
+    assert sample("http_request_duration_seconds_count", **route) - before == 2
+    assert sample("http_request_duration_seconds_count", **unmatched) - before_unmatched == 1
+    assert sample("http_requests_in_progress", method="POST", route="/users/{user_id}/api-keys") == 0
+    assert response.status_code == 200
+    assert 'route="/users/{user_id}/api-keys"' in response.text
+
+
+def test_커넥션_풀_대기시간과_쿼리_시간이_기록된다():
+    db = PostgresDatabase("sqlite://")
+    Base.metadata.create_all(db.engine)
+    checkouts, queries = sample("db_pool_checkout_wait_seconds_count"), sample("db_query_duration_seconds_count")
+
+    user = db.create_user(name="Owner", email="owner@example.com")
+    db.get_user(user.id)
+    db.engine.dispose()
+
+    # 세션이 연결을 얻을 때마다 기록된다 (commit 뒤 다시 읽을 때도 새로 얻는다)
+    assert sample("db_pool_checkout_wait_seconds_count") - checkouts >= 2
+    # insert + commit 뒤 다시 읽기 + 사용자 조회 + api_keys selectinload
+    assert sample("db_query_duration_seconds_count") - queries == 4
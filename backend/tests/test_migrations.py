@@ -0,0 +1,25 @@
+from pathlib import Path
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine
+
+from src.db.db_model import Base
+
+
+def test_마이그레이션을_끝까지_적용하면_모델과_스키마가_일치한다(tmp_path):
+    url = f"sqlite:///{tmp_path / 'migrations.db'}"
+    config = Config(str(Path(__file__).parent.parent / "alembic.ini"))
+    config.cmd_opts = type("Options", (), {"x": [f"url={url}"]})()
+
+    command.upgrade(config, "head")
+
+    engine = create_engine(url)
+    with engine.connect() as conn:
+        diff = compare_metadata(MigrationContext.configure(conn), Base.metadata)
+    engine.dispose()
+    assert diff == []
+
+    command.downgrade(config, "base")
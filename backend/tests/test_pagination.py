@@ -0,0 +1,97 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+# main을 import 할 때 기본 DB(asyncpg)를 만들지 않도록 한다
+os.environ.setdefault("DB_TYPE", "memory")
+
+import main  # noqa: E402
+from src.cache import TTLCache  # noqa: E402
+from src.db.memory_db import MemoryDatabase  # noqa: E402
+from src.db.pagination import schedule_cursor, request_cursor  # noqa: E402
+from src.db.proxy import ThreadPoolDatabase  # noqa: E402
+from src.models import MeetingRequest, MeetingSchedule, Time  # noqa: E402
+
+
+@pytest.fixture
+def db(postgres_db):
+    db = postgres_db
+    owner = db.create_user(name="Owner", email="owner@example.com")
+    guest = db.create_user(name="Guest", email="guest@example.com")
+    # 같은 시작 시간이 겹치도록 두 개씩 생성 (id로 순서가 갈린다)
+    for day in range(5):
+        for _ in range(2):
+            start = datetime(2025, 5, 1 + day, 9)
+            time = Time(start_time=start, end_time=start + timedelta(hours=1))
+            db.create_schedule(MeetingSchedule(
+                id=0, host=owner, participants=[owner, guest], time=time, title=f"Day {day}"
+            ))
+            db.create_request(MeetingRequest(
+                request_id=0, sender=guest, receiver_email=owner.email,
+                available_times=[time], title=f"Day {day}"
+            ))
+    return db
+
+
+def test_스케줄을_시작_시간_범위로_조회할_수_있다(db):
+    schedules = db.get_user_schedules(1, start=datetime(2025, 5, 2), end=datetime(2025, 5, 4))
+
+    assert [s.time.start_time.day for s in schedules] == [2, 2, 3, 3]
+
+
+def test_API는_타임존이_있는_from_to를_date와_함께_받을_수_있다(monkeypatch):
+    memory = MemoryDatabase()
+    owner = memory.create_user(name="Owner", email="owner@example.com")
+    api_key = memory.create_api_key(owner.id).key
+    for start in (datetime(2030, 1, 1, 3), datetime(2030, 1, 1, 9), datetime(2030, 1, 2, 9)):
+        memory.create_schedule(MeetingSchedule(
+            id=0, host=owner, participants=[owner],
+            time=Time(start_time=start, end_time=start + timedelta(hours=1)), title="Meeting"
+        ))
+    monkeypatch.setattr(main, "db", ThreadPoolDatabase(memory))
+    monkeypatch.setattr(main, "listing_cache", TTLCache(max_size=10, ttl=60))
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            get = lambda **params: client.get("/schedules/", params=params, headers={"X-API-Key": api_key})  # noqa: E731
+            return (
+                await get(date="2030-01-01", **{"from": "2030-01-01T05:00:00Z"}),
+                await get(date="2030-01-01", to="2030-01-01T14:00:00+09:00"),
+            )
+
+    after, before = asyncio.run(scenario())
+
+    assert after.status_code == 200
+    assert [s["time"]["start_time"] for s in after.json()] == ["2030-01-01T09:00:00"]
+    # +09:00의 14시는 UTC 5시
+    assert [s["time"]["start_time"] for s in before.json()] == ["2030-01-01T03:00:00"]
+
+
+def test_스케줄을_커서로_끝까지_페이지_조회할_수_있다(db):
+    seen, cursor = [], None
+    while True:
+        page = db.get_user_schedules(2, limit=3, cursor=cursor)
+        seen.extend(s.id for s in page)
+        if len(page) < 3:
+            break
+        cursor = schedule_cursor(page[-1])
+
+    assert seen == [s.id for s in db.get_user_schedules(2)]
+    assert len(seen) == 10
+
+
+def test_받은_요청을_커서로_페이지_조회할_수_있다(db):
+    first = db.get_user_received_requests("owner@example.com", limit=4)
+    second = db.get_user_received_requests("owner@example.com", limit=4, cursor=request_cursor(first[-1]))
+
+    assert [r.request_id for r in first] == [1, 2, 3, 4]
+    assert [r.request_id for r in second] == [5, 6, 7, 8]
+
+
+def test_잘못된_커서는_ValueError를_낸다(db):
+    with pytest.raises(ValueError):
+        db.get_user_schedules(1, cursor="not-a-cursor")
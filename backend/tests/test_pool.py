@@ -0,0 +1,55 @@
+import asyncio
+import os
+
+import httpx
+
+# main을 import 할 때 기본 DB(asyncpg)를 만들지 않도록 한다
+os.environ.setdefault("DB_TYPE", "memory")
+
+import main  # noqa: E402
+from src.db.db_model import Base  # noqa: E402
+from src.db.postgres_db import PostgresDatabase, engine_options  # noqa: E402
+from src.db.proxy import ThreadPoolDatabase  # noqa: E402
+
+
+def test_드라이버에_맞게_풀과_statement_timeout_인자를_만든다():
+    tuning = dict(pool_size=20, max_overflow=5, pool_timeout=2, pool_recycle=600, pool_pre_ping=True, statement_timeout=1.5)
+
+    sync = engine_options("postgresql://u:p@db/schedulia", **tuning)
+    native = engine_options("postgresql+asyncpg://u:p@db/schedulia", **tuning)
+    sqlite = engine_options("sqlite://", **tuning)
+
+    assert {k: sync[k] for k in ("pool_size", "max_overflow", "pool_timeout", "pool_recycle", "pool_pre_ping")} == {
+        "pool_size": 20, "max_overflow": 5, "pool_timeout": 2, "pool_recycle": 600, "pool_pre_ping": True
+    }
+    assert sync["connect_args"] == {"options": "-c statement_timeout=1500"}
+    assert native["connect_args"] == {"server_settings": {"statement_timeout": "1500"}}
+    # 크기 제한이 없는 풀에는 크기 인자를 넘기면 create_engine이 실패한다
+    assert not {"pool_size", "max_overflow", "pool_timeout", "connect_args"} & set(sqlite)
+
+
+def test_풀에서_연결을_얻지_못하면_기다리지_않고_503을_반환한다(tmp_path, monkeypatch):
+    db = PostgresDatabase(f"sqlite:///{tmp_path / 'test.db'}", pool_size=1, max_overflow=0, pool_timeout=0.05)
+    Base.metadata.create_all(db.engine)
+    monkeypatch.setattr(main, "db", ThreadPoolDatabase(db))
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return (
+                await client.get("/users/find", params={"email": "owner@example.com"}),
+                await client.get("/health-check"),
+            )
+
+    held = db.engine.connect()
+    try:
+        busy, health = asyncio.run(scenario())
+    finally:
+        held.close()
+
+    assert busy.status_code == 503
+    assert busy.headers["Retry-After"] == "1"
+    pool = health.json()["db_pool"]
+    assert (pool["size"], pool["checked_out"], pool["overflow"], pool["checkout_timeouts"]) == (1, 1, 0, 1)
+    assert db.pool_status()["checked_out"] == 0
+    db.engine.dispose()
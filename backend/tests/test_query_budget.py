@@ -0,0 +1,246 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from fastapi.routing import APIRoute
+from starlette.concurrency import run_in_threadpool
+
+# main을 import 할 때 기본 DB(asyncpg)를 만들지 않도록 한다. 실제 DB는 api 픽스처에서 교체한다
+os.environ.setdefault("DB_TYPE", "memory")
+
+import main  # noqa: E402
+from src.availability import AvailabilityIndex  # noqa: E402
+from src.db.async_postgres_db import AsyncPostgresDatabase  # noqa: E402
+from src.db.db_model import Base  # noqa: E402
+from src.db.postgres_db import PostgresDatabase  # noqa: E402
+from src.db.instrumentation import STATEMENTS_HEADER, QueryStatsMiddleware, track_queries  # noqa: E402
+from src.db.proxy import ThreadPoolDatabase  # noqa: E402
+from src.models import MeetingRequest, MeetingSchedule, Time  # noqa: E402
+
+# 라우트별 최대 SQL 문 수. 인증 캐시 없이 목록 API가 ROWS개 행을 돌려줄 때 기준이다.
+# 행 수에 비례해 쿼리가 늘어나면(N+1) 이 값을 넘으므로, 예산을 올리기 전에 로딩 방식을 먼저 확인한다.
+# 목록을 바꾸는 쓰기에는 users.data_version을 올리는 UPDATE가 하나씩 들어 있다.
+QUERY_BUDGETS = {
+    ("GET", "/users/find"): 1,
+    ("POST", "/users/"): 3,
+    ("POST", "/users/{user_id}/api-keys"): 3,
+    ("DELETE", "/api-keys/{api_key}"): 3,
+    ("GET", "/users/me"): 3,
+    ("GET", "/schedules/"): 8,
+    ("GET", "/requests/"): 7,
+    ("GET", "/availability"): 3,
+    ("POST", "/slots/search"): 4,
+    ("POST", "/requests/"): 10,
+    # 수신자 3명 기준. SQLite는 RETURNING이 있는 다건 insert를 행마다 나눠 실행한다 (PostgreSQL은 한 문장)
+    ("POST", "/requests/bulk"): 8,
+    # 인증 2 + 요청 로드 4 + 스케줄 생성 10(참가자 조회, insert 3, data_version, 다시 로드 5) + 상태 변경 6
+    ("POST", "/requests/{request_id}/respond"): 22,
+    ("POST", "/meetings/{meeting_id}/confirm"): 2,
+    # 연결할 때 인증만 하고 이후에는 쿼리하지 않는다
+    ("GET", "/events"): 2,
+    ("GET", "/metrics"): 0,
+    ("GET", "/health-check"): 0,
+}
+
+ROWS = 20
+START = datetime(2030, 1, 1, 9)
+
+
+def slot(hours: int) -> Time:
+    start = START + timedelta(hours=hours)
+    return Time(start_time=start, end_time=start + timedelta(minutes=30))
+
+
+async def seed(db):
+    owner = await db.create_user(name="Owner", email="owner@example.com")
+    owner_key = await db.create_api_key(owner.id)
+    guests, guest_keys = [], []
+    for i in range(ROWS):
+        guest = await db.create_user(name=f"Guest {i}", email=f"guest{i}@example.com")
+        guest_keys.append((await db.create_api_key(guest.id)).key)
+        guests.append(guest)
+        await db.create_schedule(MeetingSchedule(
+            id=0, host=guest, participants=[guest, owner], time=slot(i), title=f"Meeting {i}"
+        ))
+    requests = await db.create_requests([
+        MeetingRequest(
+            request_id=0, sender=guest, receiver_email=owner.email,
+            available_times=[slot(100 + i), slot(200 + i)], title=f"Request {i}"
+        )
+        for i, guest in enumerate(guests)
+    ])
+    return {"owner": owner, "api_key": owner_key.key, "guests": guests, "guest_keys": guest_keys, "requests": requests}
+
+
+def route_calls(data):
+    """라우트마다 대표 요청 하나"""
+    auth = {"X-API-Key": data["api_key"]}
+    window = {"start": START.isoformat(), "end": (START + timedelta(days=30)).isoformat()}
+    accepted = data["requests"][0]
+    return {
+        ("GET", "/users/find"): dict(url="/users/find", params={"email": "guest0@example.com"}),
+        ("POST", "/users/"): dict(url="/users/", json={"name": "New", "email": "new@example.com"}),
+        ("POST", "/users/{user_id}/api-keys"): dict(url=f"/users/{data['guests'][1].id}/api-keys"),
+        ("DELETE", "/api-keys/{api_key}"): dict(url=f"/api-keys/{data['guest_keys'][1]}"),
+        ("GET", "/users/me"): dict(url="/users/me", headers=auth),
+        ("GET", "/schedules/"): dict(url="/schedules/", headers=auth),
+        ("GET", "/requests/"): dict(url="/requests/", headers=auth),
+        ("GET", "/availability"): dict(url="/availability", params=window, headers=auth),
+        ("POST", "/slots/search"): dict(url="/slots/search", headers=auth, json={
+            **window, "participant_emails": [g.email for g in data["guests"]], "duration_minutes": 60,
+        }),
+        ("POST", "/requests/"): dict(url="/requests/", headers=auth, json={
+            "receiver_email": "guest0@example.com", "title": "Single",
+            "available_times": [slot(300).model_dump(mode="json")],
+        }),
+        ("POST", "/requests/bulk"): dict(url="/requests/bulk", headers=auth, json={"requests": [{
+            "receiver_emails": [g.email for g in data["guests"][:3]], "title": "Bulk",
+            "available_times": [slot(400).model_dump(mode="json"), slot(401).model_dump(mode="json")],
+        }]}),
+        ("POST", "/requests/{request_id}/respond"): dict(
+            url=f"/requests/{accepted.request_id}/respond", headers=auth,
+            json={"accept": True, "selected_time": accepted.available_times[0].model_dump(mode="json")},
+        ),
+        ("POST", "/meetings/{meeting_id}/confirm"): dict(url="/meetings/1/confirm", headers=auth),
+        ("GET", "/events"): dict(url="/events", headers=auth, stream=True),
+        ("GET", "/metrics"): dict(url="/metrics"),
+        ("GET", "/health-check"): dict(url="/health-check"),
+    }
+
+
+@pytest.fixture
+def api(monkeypatch, open_event_stream):
+    """인증 캐시 없는 AsyncPostgresDatabase(aiosqlite)로 main.app을 호출하는 클라이언트"""
+    db = AsyncPostgresDatabase("sqlite+aiosqlite://")
+
+    async def setup():
+        async with db.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        return await seed(db)
+
+    loop = asyncio.new_event_loop()
+    data = loop.run_until_complete(setup())
+    monkeypatch.setattr(main, "db", db)
+    monkeypatch.setattr(main, "availability", AvailabilityIndex())
+    transport = httpx.ASGITransport(app=QueryStatsMiddleware(main.app))
+    client = httpx.AsyncClient(transport=transport, base_url="http://test")
+
+    async def stream_headers(url: str, headers: dict) -> httpx.Response:
+        # 끝나지 않는 스트림은 응답 헤더만 받고 연결을 끊는다
+        async with open_event_stream(transport.app, url, headers) as stream:
+            return httpx.Response(stream.status, headers=stream.headers)
+
+    def call(method: str, stream: bool = False, **kwargs) -> httpx.Response:
+        if stream:
+            return loop.run_until_complete(stream_headers(kwargs["url"], kwargs["headers"]))
+        return loop.run_until_complete(client.request(method, **kwargs))
+
+    yield call, data
+    loop.run_until_complete(client.aclose())
+    loop.run_until_complete(db.close())
+    loop.close()
+
+
+@pytest.fixture
+def query_budget():
+    """응답의 X-DB-Statements가 라우트에 선언된 예산 이내인지 확인한다"""
+    def check(route, response: httpx.Response) -> int:
+        statements = int(response.headers[STATEMENTS_HEADER])
+        assert statements <= QUERY_BUDGETS[route], (
+            f"{route[0]} {route[1]} executed {statements} statements (budget {QUERY_BUDGETS[route]})"
+        )
+        return statements
+    return check
+
+
+def test_모든_라우트에_쿼리_예산이_선언되어_있다():
+    routes = {
+        (method, route.path)
+        for route in main.app.routes if isinstance(route, APIRoute)
+        for method in route.methods
+    }
+
+    assert routes == set(QUERY_BUDGETS)
+
+
+@pytest.mark.parametrize("route", list(QUERY_BUDGETS), ids=lambda r: f"{r[0]} {r[1]}")
+def test_라우트가_쿼리_예산_안에서_응답한다(api, query_budget, route):
+    call, data = api
+    spec = route_calls(data)[route]
+
+    response = call(route[0], **spec)
+
+    expected = 501 if route[1] == "/meetings/{meeting_id}/confirm" else 200
+    assert response.status_code == expected, response.text
+    query_budget(route, response)
+
+
+def test_동기_DB로도_요청_응답이_쿼리_예산_안에서_끝난다(tmp_path, monkeypatch, query_budget):
+    # 동기 세션은 커밋하면 속성이 만료되므로 커밋 뒤에 변환하면 관계를 다시 lazy load 한다
+    postgres_db = PostgresDatabase(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(postgres_db.engine)
+    db = ThreadPoolDatabase(postgres_db)
+    data = asyncio.run(seed(db))
+    monkeypatch.setattr(main, "db", db)
+    monkeypatch.setattr(main, "availability", AvailabilityIndex())
+    route = ("POST", "/requests/{request_id}/respond")
+
+    async def respond():
+        transport = httpx.ASGITransport(app=QueryStatsMiddleware(main.app))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.request(route[0], **route_calls(data)[route])
+
+    response = asyncio.run(respond())
+    postgres_db.engine.dispose()
+
+    assert response.status_code == 200, response.text
+    assert query_budget(route, response) == QUERY_BUDGETS[route]
+
+
+def test_스레드풀에서_실행된_쿼리도_요청_단위로_집계된다(tmp_path):
+    # 메모리 SQLite는 스레드마다 따로 생기므로 파일 DB를 쓴다
+    postgres_db = PostgresDatabase(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(postgres_db.engine)
+    user = postgres_db.create_user(name="Owner", email="owner@example.com")
+
+    async def handler():
+        with track_queries() as stats:
+            await run_in_threadpool(postgres_db.get_user, user.id)
+            await run_in_threadpool(postgres_db.get_user_by_email, user.email)
+        return stats
+
+    stats = asyncio.run(handler())
+    postgres_db.engine.dispose()
+
+    assert stats.statements == 3  # get_user 2 (api_keys selectinload) + get_user_by_email 1
+    assert stats.duration > 0
+
+
+@pytest.mark.parametrize("path", ["/schedules/", "/requests/"])
+def test_목록이_바뀌지_않았으면_인증과_버전_조회만_하고_304를_반환한다(api, path):
+    call, data = api
+    auth = {"X-API-Key": data["api_key"]}
+    first = call("GET", url=path, headers=auth)
+
+    response = call("GET", url=path, headers={**auth, "If-None-Match": first.headers["ETag"]})
+
+    assert response.status_code == 304 and response.content == b""
+    assert response.headers["ETag"] == first.headers["ETag"]
+    # 인증 2 (사용자 + api_keys selectinload) + data_version 1
+    assert int(response.headers[STATEMENTS_HEADER]) == 3
+
+
+def test_같은_Idempotency_Key로_재시도하면_저장한_응답만_조회한다(api):
+    call, data = api
+    spec = route_calls(data)[("POST", "/requests/")]
+    spec["headers"] = {**spec["headers"], "Idempotency-Key": "retry-1"}
+    first = call("POST", **spec)
+
+    replayed = call("POST", **spec)
+
+    assert replayed.status_code == 200 and replayed.content == first.content
+    assert replayed.headers["Idempotent-Replayed"] == "true"
+    # 예약 시도(충돌) 1 + 저장한 응답 조회 1. 인증도 요청 생성도 하지 않는다
+    assert int(replayed.headers[STATEMENTS_HEADER]) == 2
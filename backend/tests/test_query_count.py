@@ -0,0 +1,97 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from src.db.postgres_db import PostgresDatabase
+from src.models import MeetingRequest, MeetingSchedule, RequestStatus, Time
+
+
+@contextmanager
+def count_statements(engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def seed(db: PostgresDatabase, meetings: int):
+    owner = db.create_user(name="Owner", email="owner@example.com")
+    db.create_api_key(owner.id)
+    start = datetime(2025, 5, 1, 9)
+    for i in range(meetings):
+        guest = db.create_user(name=f"Guest {i}", email=f"guest{i}@example.com")
+        db.create_api_key(guest.id)
+        time = Time(start_time=start + timedelta(hours=i), end_time=start + timedelta(hours=i, minutes=30))
+        db.create_schedule(MeetingSchedule(
+            id=0, host=guest, participants=[guest, owner], time=time, title=f"Meeting {i}"
+        ))
+        db.create_request(MeetingRequest(
+            request_id=0, sender=guest, receiver_email=owner.email,
+            available_times=[time, Time(start_time=time.end_time, end_time=time.end_time + timedelta(minutes=30))],
+            title=f"Request {i}"
+        ))
+    return owner
+
+
+@pytest.mark.parametrize("meetings", [2, 30])
+def test_스케줄_목록은_행_수와_무관하게_일정한_쿼리로_조회된다(postgres_db, meetings):
+    db = postgres_db
+    owner = seed(db, meetings)
+
+    with count_statements(db.engine) as statements:
+        schedules = db.get_user_schedules(owner.id)
+        # 변환이 끝난 뒤에도 추가 쿼리가 없어야 한다
+        assert all(len(s.participants[1].api_keys) == 1 for s in schedules)
+
+    assert len(schedules) == meetings
+    # 스케줄 + host + host api_keys + participants + participant api_keys (time은 join)
+    assert len(statements) == 5
+
+
+@pytest.mark.parametrize("meetings", [2, 30])
+def test_받은_요청_목록은_행_수와_무관하게_일정한_쿼리로_조회된다(postgres_db, meetings):
+    db = postgres_db
+    owner = seed(db, meetings)
+
+    with count_statements(db.engine) as statements:
+        requests = db.get_user_received_requests(owner.email)
+
+    assert len(requests) == meetings
+    assert all(len(r.available_times) == 2 for r in requests)
+    # 요청(+selected_time join) + sender + sender api_keys + available_times
+    assert len(statements) == 4
+
+
+def test_API키_인증은_두_번의_쿼리로_끝난다(postgres_db):
+    db = postgres_db
+    user = db.create_user(name="John", email="john@example.com")
+    api_key = db.create_api_key(user.id)
+    db.create_api_key(user.id)
+
+    with count_statements(db.engine) as statements:
+        found = db.get_user_by_api_key(api_key.key)
+
+    assert len(found.api_keys) == 2
+    assert len(statements) == 2
+
+
+def test_요청_상태_변경은_커밋_후에_다시_조회하지_않는다(postgres_db):
+    db = postgres_db
+    owner = seed(db, 1)
+    request = db.get_user_received_requests(owner.email)[0]
+
+    with count_statements(db.engine) as statements:
+        updated = db.update_request_status(request.request_id, RequestStatus.ACCEPTED, request.available_times[1])
+        assert updated.sender.api_keys and updated.selected_time == request.available_times[1]
+
+    assert updated.status == RequestStatus.ACCEPTED
+    # 요청 로드 4 + 상태 UPDATE + data_version UPDATE
+    assert len(statements) == 6
@@ -0,0 +1,84 @@
+import asyncio
+import os
+
+import httpx
+import pytest
+
+# main을 import 할 때 기본 DB(asyncpg)를 만들지 않도록 한다
+os.environ.setdefault("DB_TYPE", "memory")
+
+import main  # noqa: E402
+from src.db.memory_db import MemoryDatabase  # noqa: E402
+from src.db.proxy import ThreadPoolDatabase  # noqa: E402
+from src.rate_limit import Limit, LocalBucketStore, RateLimiter, parse_limit, parse_route_limits  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_버스트를_다_쓰면_다음_토큰까지_기다려야_한다():
+    clock = FakeClock()
+    store = LocalBucketStore(clock=clock)
+    limit = Limit(rate=2, burst=3)
+
+    async def take(n):
+        return [await store.take("key", limit) for _ in range(n)]
+
+    assert asyncio.run(take(4)) == [0, 0, 0, 0.5]
+    clock.now = 0.5
+    assert asyncio.run(take(2)) == [0, 0.5]
+    # 오래 쉬어도 burst까지만 채워진다
+    clock.now = 100
+    assert asyncio.run(take(4))[-1] == 0.5
+
+
+def test_버킷_수는_max_keys를_넘지_않는다():
+    store = LocalBucketStore(max_keys=2)
+
+    async def scenario():
+        for key in ("a", "b", "c"):
+            await store.take(key, Limit(rate=1, burst=1))
+
+    asyncio.run(scenario())
+    assert list(store._buckets) == ["b", "c"]
+
+
+def test_제한_설정을_읽는다():
+    assert parse_limit("5:20") == Limit(rate=5, burst=20)
+    assert parse_limit("0") is None and parse_limit("") is None
+    assert parse_route_limits("GET  /requests/=5:20, POST /requests/bulk=0") == {
+        "GET /requests/": Limit(rate=5, burst=20), "POST /requests/bulk": None,
+    }
+    with pytest.raises(ValueError):
+        parse_limit("5:0.5")
+
+
+def test_라우트별로_키마다_제한하고_넘으면_429와_Retry_After를_반환한다(monkeypatch):
+    memory = MemoryDatabase()
+    user = memory.create_user(name="Owner", email="owner@example.com")
+    api_key, other_key = memory.create_api_key(user.id).key, memory.create_api_key(user.id).key
+    monkeypatch.setattr(main, "db", ThreadPoolDatabase(memory))
+    monkeypatch.setattr(main, "rate_limiter", RateLimiter(
+        LocalBucketStore(clock=FakeClock()),
+        default=Limit(rate=1, burst=5),
+        routes={"GET /requests/": Limit(rate=0.1, burst=2)}
+    ))
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            get = lambda url, key=api_key: client.get(url, headers={"X-API-Key": key})  # noqa: E731
+            listings = [(await get("/requests/")).status_code for _ in range(3)]
+            return listings, await get("/requests/"), await get("/users/me"), await get("/requests/", other_key)
+
+    listings, limited, other_route, other_key_response = asyncio.run(scenario())
+
+    assert listings == [200, 200, 429]
+    assert limited.status_code == 429 and limited.headers["Retry-After"] == "10"
+    assert other_route.status_code == 200
+    assert other_key_response.status_code == 200
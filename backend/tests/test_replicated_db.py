@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from src.db.factory import DatabaseFactory
+from src.db.memory_db import MemoryDatabase
+from src.db.proxy import DatabaseProxy, ThreadPoolDatabase
+from src.db.replicated_db import ReplicatedDatabase
+
+
+class RecordingDatabase(DatabaseProxy):
+    """호출된 메서드를 기록하는 MemoryDatabase. lag와 failing으로 복제본 상태를 흉내 낸다"""
+
+    def __init__(self, lag: float = 0.0):
+        super().__init__(ThreadPoolDatabase(MemoryDatabase()))
+        self.calls = []
+        self.lag = lag
+        self.failing = False
+
+    async def _call(self, name, *args, **kwargs):
+        if self.failing:
+            raise OperationalError("SELECT 1", {}, ConnectionRefusedError())
+        if name not in ("connect", "close"):
+            self.calls.append(name)
+        return await super()._call(name, *args, **kwargs)
+
+    async def replication_lag(self) -> float:
+        if self.failing:
+            raise OperationalError("SELECT 1", {}, ConnectionRefusedError())
+        return self.lag
+
+
+def run(scenario, replicas=2, **options):
+    primary = RecordingDatabase()
+    replica_dbs = [RecordingDatabase() for _ in range(replicas)]
+    db = ReplicatedDatabase(primary, replica_dbs, max_lag=1.0, check_interval=3600, **options)
+
+    async def runner():
+        await db.connect()
+        try:
+            await scenario(db, primary, replica_dbs)
+        finally:
+            await db.close()
+
+    asyncio.run(runner())
+
+
+async def in_new_request(coroutine):
+    # 다른 요청은 별도 태스크(컨텍스트 복사본)에서 처리된다
+    return await asyncio.create_task(coroutine)
+
+
+def test_읽기는_복제본에_번갈아_보내고_쓰기는_primary로_보낸다():
+    async def scenario(db, primary, replicas):
+        for _ in range(4):
+            await in_new_request(db.get_users_by_emails(["owner@example.com"]))
+        await in_new_request(db.create_user(name="Owner", email="owner@example.com"))
+
+        assert [r.calls for r in replicas] == [["get_users_by_emails"] * 2] * 2
+        assert primary.calls == ["create_user"]
+
+    run(scenario)
+
+
+def test_한_요청_안의_읽기는_같은_복제본에서_한다():
+    async def scenario(db, primary, replicas):
+        async def request():
+            await db.get_data_version(1)
+            await db.get_user_schedules(1)
+
+        await in_new_request(request())
+        await in_new_request(request())
+
+        assert [r.calls for r in replicas] == [["get_data_version", "get_user_schedules"]] * 2
+
+    run(scenario)
+
+
+def test_쓰기를_한_요청은_자신이_쓴_내용을_primary에서_읽는다():
+    async def scenario(db, primary, replicas):
+        async def request():
+            user = await db.create_user(name="Owner", email="owner@example.com")
+            return await db.get_users_by_emails([user.email])
+
+        assert len(await in_new_request(request())) == 1
+        # 다른 요청은 복제본에서 읽는다 (아직 복제되지 않아 비어 있다)
+        assert await in_new_request(db.get_users_by_emails(["owner@example.com"])) == []
+        assert primary.calls == ["create_user", "get_users_by_emails"]
+
+    run(scenario)
+
+
+def test_복제본에서_찾지_못한_단건_조회는_primary에서_다시_찾는다():
+    async def scenario(db, primary, replicas):
+        user = await in_new_request(db.create_user(name="Owner", email="owner@example.com"))
+
+        assert await in_new_request(db.get_user_by_email(user.email)) == user
+        assert primary.calls == ["create_user", "get_user_by_email"]
+
+    run(scenario, replicas=1)
+
+
+def test_지연되거나_연결이_끊긴_복제본은_건너뛴다():
+    async def scenario(db, primary, replicas):
+        lagging, broken = replicas
+        lagging.lag = 5.0
+        await db.check_replicas()
+        await in_new_request(db.get_users_by_emails([]))
+        assert (lagging.calls, broken.calls) == ([], ["get_users_by_emails"])
+
+        broken.failing = True
+        assert await in_new_request(db.get_users_by_emails([])) == []
+        # 둘 다 쓸 수 없으면 primary에서 읽는다
+        await in_new_request(db.get_users_by_emails([]))
+        assert primary.calls == ["get_users_by_emails", "get_users_by_emails"]
+
+        lagging.lag, broken.failing = 0.0, False
+        await db.check_replicas()
+        assert [r.healthy for r in db.replicas] == [True, True]
+
+    run(scenario)
+
+
+def test_factory는_복제본_접속_문자열이_있으면_읽기를_나눠_보낸다(tmp_path):
+    urls = [f"sqlite:///{tmp_path / name}" for name in ("primary.db", "replica.db")]
+
+    db = DatabaseFactory.create_async_database({
+        "type": "postgres", "connection_string": urls[0], "replica_connection_strings": urls[1:],
+    })
+
+    assert isinstance(db, ReplicatedDatabase) and len(db.replicas) == 1
+    with pytest.raises(ValueError):
+        DatabaseFactory.create_async_database({"type": "memory", "replica_connection_strings": urls[1:]})
@@ -0,0 +1,69 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event, text
+
+from src.db.base import ScheduleConflictError
+from src.db.postgres_db import EXCLUSION_VIOLATION
+from src.models import MeetingSchedule, Time
+
+
+def at(hour):
+    return datetime(2025, 5, 1, hour)
+
+
+def test_배타_제약_위반은_ScheduleConflictError로_바뀐다(postgres_db):
+    db = postgres_db
+    host = db.create_user(name="Host", email="host@example.com")
+    guest = db.create_user(name="Guest", email="guest@example.com")
+
+    # SQLite에는 배타 제약이 없으므로 트리거로 거부하고 Postgres의 SQLSTATE를 붙여 흉내 낸다
+    with db.engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TRIGGER no_double_booking BEFORE INSERT ON meeting_participants "
+            "WHEN (SELECT count(*) FROM meeting_participants) >= 2 "
+            "BEGIN SELECT RAISE(ABORT, 'conflicting key value violates exclusion constraint'); END"
+        ))
+
+    @event.listens_for(db.engine, "handle_error")
+    def as_exclusion_violation(context):
+        context.original_exception.pgcode = EXCLUSION_VIOLATION
+
+    def schedule(start, end):
+        return MeetingSchedule(
+            id=0, host=host, participants=[host, guest],
+            time=Time(start_time=start, end_time=end), title="Meeting"
+        )
+
+    db.create_schedule(schedule(at(9), at(10)))
+    with pytest.raises(ScheduleConflictError):
+        db.create_schedule(schedule(at(9), at(11)))
+
+    # 실패한 스케줄은 롤백되어 남지 않는다
+    assert [s.time.start_time for s in db.get_user_schedules(host.id)] == [at(9)]
+
+
+@pytest.mark.postgres
+def test_Postgres의_배타_제약이_같은_참가자의_겹치는_스케줄을_거부한다(migrated_postgres_db):
+    db = migrated_postgres_db
+    host = db.create_user(name="Host", email="host@example.com")
+    guest = db.create_user(name="Guest", email="guest@example.com")
+    other = db.create_user(name="Other", email="other@example.com")
+
+    def schedule(start, end, participants):
+        return MeetingSchedule(
+            id=0, host=host, participants=participants,
+            time=Time(start_time=start, end_time=end), title="Meeting"
+        )
+
+    db.create_schedule(schedule(at(9), at(10), [host, guest]))
+    with pytest.raises(ScheduleConflictError):
+        db.create_schedule(schedule(at(9), at(11), [other, guest]))
+    # 구간은 [시작, 끝)이므로 끝나는 시각에 시작하는 스케줄은 겹치지 않는다
+    db.create_schedule(schedule(at(10), at(11), [other, guest]))
+
+    assert [s.time.start_time for s in db.get_user_schedules(guest.id)] == [at(9), at(10)]
+    # times.period로 찾는 바쁜 시간 조회도 같은 구간 규칙을 따른다
+    busy_times = db.get_busy_times([guest.id, other.id], at(10), at(12))
+    assert [t.start_time for t in busy_times[guest.id]] == [at(10)]
+    assert [t.start_time for t in busy_times[other.id]] == [at(10)]
@@ -0,0 +1,55 @@
+import warnings
+from datetime import datetime, timedelta
+
+import pytest
+from pydantic import TypeAdapter
+
+from src.db.memory_db import MemoryDatabase
+from src.models import MeetingRequest, MeetingSchedule, RequestStatus, Time, User
+
+START = datetime(2030, 1, 1, 9)
+SLOT = Time(start_time=START, end_time=START + timedelta(hours=1))
+
+
+@pytest.fixture(params=["postgres", "memory"])
+def db(request):
+    if request.param == "postgres":
+        return request.getfixturevalue("postgres_db")
+    return MemoryDatabase()
+
+
+def test_검증_없이_만든_모델은_검증한_모델과_같고_경고_없이_직렬화된다(db):
+    host = db.create_user(name="Host", email="host@example.com")
+    guest = db.create_user(name="Guest", email="guest@example.com")
+    db.create_api_key(host.id)
+    db.create_schedule(MeetingSchedule(id=0, host=host, participants=[host, guest], time=SLOT, title="Sync"))
+    request = db.create_request(MeetingRequest(
+        request_id=0, sender=host, receiver_email=guest.email, available_times=[SLOT], title="Intro"
+    ))
+    db.update_request_status(request.request_id, RequestStatus.ACCEPTED, SLOT)
+
+    schedules = db.get_user_schedules(guest.id)
+    requests = db.get_user_received_requests(guest.email)
+
+    assert schedules == [MeetingSchedule.model_validate(s.model_dump()) for s in schedules]
+    assert requests == [MeetingRequest.model_validate(r.model_dump()) for r in requests]
+    assert requests[0].status is RequestStatus.ACCEPTED and requests[0].selected_time == SLOT
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        TypeAdapter(list[MeetingSchedule]).dump_json(schedules)
+        TypeAdapter(list[MeetingRequest]).dump_json(requests)
+
+
+def test_이메일로_사용자를_찾을_때도_다시_검증하지_않는다(db, monkeypatch):
+    created = db.create_user(name="Host", email="host@example.com")
+
+    def validating_init(self, **data):
+        raise AssertionError("User was validated again")
+
+    monkeypatch.setattr(User, "__init__", validating_init)
+    found = db.get_user_by_email("host@example.com")
+    found_many = db.get_users_by_emails(["host@example.com", "nobody@example.com"])
+    monkeypatch.undo()
+
+    assert found == created == User.model_validate(found.model_dump())
+    assert found_many == [created]
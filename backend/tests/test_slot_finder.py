@@ -0,0 +1,75 @@
+import random
+from datetime import datetime, timedelta
+
+from src.slot_finder import find_common_slots, rasterize
+
+
+def at(day, hour, minute=0):
+    return datetime(2025, 5, day, hour, minute)
+
+
+def test_구간에_걸치는_슬롯은_모두_바쁜_것으로_표시된다():
+    busy = rasterize([[(at(1, 9, 10), at(1, 9, 40))], []], at(1, 9), timedelta(minutes=15), 4)
+
+    assert busy.tolist() == [[True, True, True, False], [False, False, False, False]]
+
+
+def test_전원이_비어_있는_시간을_이른_순으로_찾는다():
+    busy = [
+        [(at(1, 9), at(1, 10)), (at(1, 13), at(1, 14))],
+        [(at(1, 10), at(1, 11))],
+        [(at(1, 11, 30), at(1, 12))],
+    ]
+
+    slots = find_common_slots(busy, at(1, 9), at(1, 15), timedelta(hours=1), timedelta(minutes=30), top_k=3)
+
+    assert [(s.start_time, s.end_time) for s in slots] == [
+        (at(1, 12), at(1, 13)),
+        (at(1, 14), at(1, 15)),
+    ]
+    assert all(s.available == 3 and s.unavailable == [] for s in slots)
+
+
+def test_전원이_가능한_시간이_없으면_min_available_기준으로_찾는다():
+    busy = [[(at(1, 9), at(1, 12))], [(at(1, 9), at(1, 10))], []]
+
+    slots = find_common_slots(
+        busy, at(1, 9), at(1, 12), timedelta(hours=1), timedelta(hours=1), top_k=2, min_available=2
+    )
+
+    assert [(s.start_time, s.available, s.unavailable) for s in slots] == [
+        (at(1, 10), 2, [0]),
+        (at(1, 11), 2, [0]),
+    ]
+    assert find_common_slots(busy, at(1, 9), at(1, 12), timedelta(hours=1), timedelta(hours=1), top_k=2) == []
+
+
+def test_창_안에서_번갈아_바쁜_참가자는_참석_가능_인원에_넣지_않는다():
+    # 슬롯마다는 한 명씩 비어 있지만 30분 내내 비어 있는 사람은 없다
+    busy = [[(at(1, 9), at(1, 9, 15))], [(at(1, 9, 15), at(1, 9, 30))]]
+
+    slots = find_common_slots(
+        busy, at(1, 9), at(1, 9, 45), timedelta(minutes=30), timedelta(minutes=15), top_k=3, min_available=1
+    )
+
+    # 9:00 창은 아무도 참석할 수 없으므로 후보가 아니다
+    assert [(s.start_time, s.available, s.unavailable) for s in slots] == [(at(1, 9, 15), 1, [1])]
+
+
+def test_무작위_일정에서_슬롯별_계산과_결과가_일치한다():
+    rng = random.Random(7)
+    start, granularity = at(1, 0), timedelta(minutes=15)
+    busy = []
+    for _ in range(60):
+        intervals = []
+        for _ in range(10):
+            s = start + timedelta(minutes=rng.randrange(0, 30 * 24 * 60))
+            intervals.append((s, s + timedelta(minutes=rng.randrange(15, 180))))
+        busy.append(intervals)
+
+    slots = find_common_slots(busy, start, start + timedelta(days=30), timedelta(hours=1), granularity, top_k=10)
+
+    assert len(slots) == 10
+    for slot in slots:
+        assert not any(s < slot.end_time and slot.start_time < e for intervals in busy for s, e in intervals)
+    assert [s.start_time for s in slots] == sorted(s.start_time for s in slots)